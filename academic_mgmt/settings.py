@@ -188,6 +188,12 @@ STATICFILES_DIRS = [BASE_DIR / "static"]
 # Media files (User uploaded files)
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+# Media is only served by views that check access first (see academics.serving).
+# Set to "nginx" for X-Accel-Redirect or "sendfile" for X-Sendfile so the front web
+# server sends the bytes; left empty, Django streams the file itself.
+FILE_SERVING_BACKEND = os.getenv("FILE_SERVING_BACKEND", "")
+# nginx location marked ``internal`` that aliases MEDIA_ROOT.
+PROTECTED_MEDIA_INTERNAL_URL = "/protected-media/"
 
 LOGIN_URL = "users:login"
 LOGIN_REDIRECT_URL = "dashboard:home"
@@ -1,6 +1,23 @@
 from django.contrib import admin
 
-from .models import Assignment, Attendance, Faculty, Marks, Student, Subject, Submission
+from . import audit
+from .models import (
+	ArchivedAttendance,
+	ArchivedMarks,
+	ArchivedSubmission,
+	Assignment,
+	Attendance,
+	AttendanceMonth,
+	Enrollment,
+	Faculty,
+	Marks,
+	MarksAudit,
+	Student,
+	Subject,
+	Submission,
+	Term,
+	TermResult,
+)
 
 
 @admin.register(Student)
@@ -23,19 +40,49 @@ class SubjectAdmin(admin.ModelAdmin):
 	list_filter = ("semester",)
 
 
+@admin.register(Term)
+class TermAdmin(admin.ModelAdmin):
+	list_display = ("name", "start_date", "end_date", "archived_at")
+	search_fields = ("name",)
+	readonly_fields = ("archived_at",)
+
+
+@admin.register(Enrollment)
+class EnrollmentAdmin(admin.ModelAdmin):
+	list_display = ("student", "subject", "term", "enrolled_at")
+	list_filter = ("term", "subject")
+	search_fields = ("student__registration_number", "subject__code")
+	raw_id_fields = ("student",)
+
+
 @admin.register(Attendance)
 class AttendanceAdmin(admin.ModelAdmin):
 	list_display = ("student", "subject", "date", "status", "faculty")
-	list_filter = ("status", "date", "subject")
+	list_filter = ("term", "status", "date", "subject")
 	search_fields = ("student__registration_number", "subject__code")
 
 
 @admin.register(Marks)
 class MarksAdmin(admin.ModelAdmin):
 	list_display = ("student", "subject", "assessment_type", "score", "max_score", "recorded_at")
-	list_filter = ("assessment_type", "subject")
+	list_filter = ("term", "assessment_type", "subject")
 	search_fields = ("student__registration_number", "subject__code")
 
+	def save_model(self, request, obj, form, change):
+		# The form has already applied the new values to obj; read the stored ones.
+		before = audit.snapshot(Marks.objects.get(pk=obj.pk)) if change else None
+		super().save_model(request, obj, form, change)
+		if change:
+			audit.record_update(obj, before, request.user)
+
+	def delete_model(self, request, obj):
+		audit.record_deletion(obj, request.user)
+		super().delete_model(request, obj)
+
+	def delete_queryset(self, request, queryset):
+		audit.record(audit.deletion_row(mark, request.user) for mark in queryset)
+		super().delete_queryset(request, queryset)
+
 
 @admin.register(Assignment)
 class AssignmentAdmin(admin.ModelAdmin):
@@ -47,7 +94,84 @@ class AssignmentAdmin(admin.ModelAdmin):
 @admin.register(Submission)
 class SubmissionAdmin(admin.ModelAdmin):
 	list_display = ("assignment", "student", "status", "submitted_on", "score")
-	list_filter = ("status", "assignment")
+	list_filter = ("term", "status", "assignment")
+	search_fields = ("assignment__title", "student__registration_number")
+
+
+@admin.register(TermResult)
+class TermResultAdmin(admin.ModelAdmin):
+	"""Results are cached by ``academics.grading``; deleting one just forces a recompute."""
+	list_display = ("student", "term", "sgpa", "cgpa", "credits", "credits_earned", "computed_at")
+	list_filter = ("term",)
+	search_fields = ("student__registration_number",)
+
+	def has_add_permission(self, request):
+		return False
+
+	def has_change_permission(self, request, obj=None):
+		return False
+
+
+@admin.register(MarksAudit)
+class MarksAuditAdmin(admin.ModelAdmin):
+	"""The audit log is append-only."""
+	list_display = ("mark_id", "action", "student", "subject", "assessment_type", "score", "new_score", "changed_by", "changed_at")
+	list_filter = ("action", "assessment_type")
+	search_fields = ("=mark_id", "student__registration_number", "subject__code")
+	# Joining the student or subject would drop the rows of deleted ones; prefetched, they show as empty.
+	list_select_related = ("changed_by",)
+
+	def get_queryset(self, request):
+		return super().get_queryset(request).prefetch_related("student__user", "subject")
+
+	def has_add_permission(self, request):
+		return False
+
+	def has_change_permission(self, request, obj=None):
+		return False
+
+	def has_delete_permission(self, request, obj=None):
+		return False
+
+
+class ArchiveAdmin(admin.ModelAdmin):
+	"""Archived rows are written only by ``manage.py archive_term``."""
+
+	def has_add_permission(self, request):
+		return False
+
+	def has_change_permission(self, request, obj=None):
+		return False
+
+	def has_delete_permission(self, request, obj=None):
+		return False
+
+
+@admin.register(ArchivedAttendance)
+class ArchivedAttendanceAdmin(ArchiveAdmin):
+	list_display = ("student", "subject", "date", "status", "term")
+	list_filter = ("term", "status")
+	search_fields = ("student__registration_number", "subject__code")
+
+
+@admin.register(AttendanceMonth)
+class AttendanceMonthAdmin(ArchiveAdmin):
+	list_display = ("student", "subject", "month", "term")
+	list_filter = ("term",)
+	search_fields = ("student__registration_number", "subject__code")
+
+
+@admin.register(ArchivedMarks)
+class ArchivedMarksAdmin(ArchiveAdmin):
+	list_display = ("student", "subject", "assessment_type", "score", "max_score", "term")
+	list_filter = ("term", "assessment_type")
+	search_fields = ("student__registration_number", "subject__code")
+
+
+@admin.register(ArchivedSubmission)
+class ArchivedSubmissionAdmin(ArchiveAdmin):
+	list_display = ("assignment", "student", "status", "score", "term")
+	list_filter = ("term", "status")
 	search_fields = ("assignment__title", "student__registration_number")
 
 # Register your models here.
@@ -0,0 +1,154 @@
+"""
+Class statistics for one subject's assessment: rank, percentile and spread.
+
+Each student's mark counts once, at its best, as a percentage of the
+maximum score. Ranks, percentiles and quartiles come from ``RANK``,
+``PERCENT_RANK`` and ``NTILE`` window functions over that per-student
+aggregate. Mean, standard deviation and the 10-point histogram come from a
+single aggregate over the same rows as a subquery. That makes two queries,
+no matter how large the class.
+
+Statistics are cached per subject, assessment type and term. Every mark
+written for a subject bumps that subject's version number, which retires
+all of its cached entries at once.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import Avg, Count, F, Max, Min, Q, StdDev, Value, Window
+from django.db.models.functions import Cast, NullIf, Ntile, PercentRank, Rank
+
+from .models import Marks
+
+BUCKET_WIDTH = 10
+BUCKETS = tuple(range(0, 100, BUCKET_WIDTH))
+
+
+def _version_key(subject_id):
+    return f"subject-stats-version:{subject_id}"
+
+
+def _key(subject_id, assessment_type, term_id, version):
+    return f"subject-stats:{subject_id}:{assessment_type}:{term_id or 'all'}:v{version}"
+
+
+def _percentages(subject_id, assessment_type, term_id):
+    marks = Marks.objects.filter(subject_id=subject_id, assessment_type=assessment_type)
+    if term_id:
+        marks = marks.filter(term_id=term_id)
+    return (
+        marks.order_by()
+        .values("student_id", "student__registration_number")
+        .annotate(score=Max("score"), max_score=Max("max_score"))
+        .annotate(percentage=Cast("score", models.FloatField()) * 100 / NullIf(
+            Cast("max_score", models.FloatField()), Value(0.0)
+        ))
+    )
+
+
+def _quartile(ordered, fraction):
+    """Linearly interpolated quantile of an ascending list."""
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _compute(subject_id, assessment_type, term_id):
+    percentages = _percentages(subject_id, assessment_type, term_id).filter(percentage__isnull=False)
+    ranked = percentages.annotate(
+        rank=Window(Rank(), order_by=F("percentage").desc()),
+        percent_rank=Window(PercentRank(), order_by=F("percentage").asc()),
+        # Ties split across quartiles deterministically rather than at random.
+        quartile=Window(Ntile(4), order_by=(F("percentage").desc(), F("student__registration_number").asc())),
+    ).order_by("rank", "student__registration_number")
+    standings = {
+        row["student_id"]: {
+            "registration_number": row["student__registration_number"],
+            "score": row["score"],
+            "max_score": row["max_score"],
+            "percentage": round(row["percentage"], 2),
+            "rank": row["rank"],
+            "percentile": round(row["percent_rank"] * 100, 1),
+            "quartile": row["quartile"],
+        }
+        for row in ranked
+    }
+    if not standings:
+        return None
+
+    buckets = {
+        f"bucket_{lower}": Count("student_id", filter=Q(
+            percentage__gte=lower, **({"percentage__lt": lower + BUCKET_WIDTH} if lower + BUCKET_WIDTH < 100 else {})
+        ))
+        for lower in BUCKETS
+    }
+    summary = percentages.aggregate(
+        count=Count("student_id"),
+        mean=Avg("percentage"),
+        stddev=StdDev("percentage"),
+        minimum=Min("percentage"),
+        maximum=Max("percentage"),
+        **buckets,
+    )
+    ordered = sorted(standing["percentage"] for standing in standings.values())
+    return {
+        "count": summary["count"],
+        "mean": round(summary["mean"], 2),
+        "stddev": round(summary["stddev"] or 0, 2),
+        "minimum": round(summary["minimum"], 2),
+        "maximum": round(summary["maximum"], 2),
+        "quartiles": tuple(round(_quartile(ordered, fraction), 2) for fraction in (0.25, 0.5, 0.75)),
+        "histogram": [
+            (lower, min(lower + BUCKET_WIDTH, 100), summary[f"bucket_{lower}"]) for lower in BUCKETS
+        ],
+        "standings": standings,
+    }
+
+
+def _version(subject_id):
+    key = _version_key(subject_id)
+    version = cache.get(key)
+    if version is None:
+        # Not 1: a version that was evicted must not restart at one its old entries were cached under.
+        version = time.time_ns()
+        cache.add(key, version, timeout=None)
+        version = cache.get(key, version)
+    return version
+
+
+def subject_statistics(subject_id, assessment_type, term_id=None):
+    """Cached statistics for one assessment of a subject, or ``None`` without marks.
+
+    The result holds ``count``, ``mean``, ``stddev``, ``minimum``, ``maximum``,
+    ``quartiles`` (Q1, median, Q3), ``histogram`` as ``(from, to, students)``
+    and ``standings``, a dict of each student's ``rank``, ``percentile``,
+    ``quartile`` and ``percentage`` keyed by student ID. Without a
+    ``term_id``, every mark still in the live table counts.
+    """
+    version = _version(subject_id)
+    key = _key(subject_id, assessment_type, term_id, version)
+    statistics = cache.get(key)
+    if statistics is None:
+        statistics = _compute(subject_id, assessment_type, term_id)
+        # Cache an empty result too; the next mark bumps the version anyway.
+        cache.set(key, statistics or {}, timeout=None)
+    return statistics or None
+
+
+def invalidate_subject_statistics(subject_ids):
+    """Retire every cached statistic of the given subjects, once the write commits."""
+    subject_ids = set(subject_ids)
+    if subject_ids:
+        # After the commit, so a request recomputing in between cannot cache the old marks as new.
+        transaction.on_commit(lambda: _bump(subject_ids))
+
+
+def _bump(subject_ids):
+    for subject_id in subject_ids:
+        try:
+            cache.incr(_version_key(subject_id))
+        except ValueError:
+            # Nothing is cached under a version yet; the next read starts a new one.
+            pass
@@ -0,0 +1,145 @@
+"""
+Archival of closed terms out of the hot tables.
+
+A term's attendance, marks and submissions are moved in primary-key chunks,
+each copied and deleted in its own transaction, so the move can be stopped
+and resumed at any point and never holds long locks. Rows keep their primary
+keys, which makes re-copying a chunk after an interruption a no-op.
+
+An archived term's attendance can further be compacted, one way, into
+``AttendanceMonth`` bitmaps for long-term retention.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .bitmaps import day_bit, month_of
+from .grading import invalidation_suspended
+from .models import (
+    ArchivedAttendance,
+    ArchivedMarks,
+    ArchivedSubmission,
+    Attendance,
+    AttendanceMonth,
+    Marks,
+    Submission,
+)
+from .rollups import deferred_refresh
+from .storage import references_retained
+
+CHUNK_SIZE = 1000
+# Students whose archived attendance is compacted per transaction.
+COMPACT_CHUNK_SIZE = 50
+
+# (label, live model, archive model)
+ARCHIVES = (
+    ("attendance", Attendance, ArchivedAttendance),
+    ("marks", Marks, ArchivedMarks),
+    ("submissions", Submission, ArchivedSubmission),
+)
+
+
+def archive_model(model, term=None):
+    """The archive counterpart of a live model for ``term``."""
+    if model is Attendance and term is not None and term.is_compacted:
+        return AttendanceMonth
+    return {live: archived for _, live, archived in ARCHIVES}[model]
+
+
+def _columns(archived):
+    return [field.attname for field in archived._meta.concrete_fields]
+
+
+def _move_chunk(live, archived, term, chunk_size):
+    columns = _columns(archived)
+    with transaction.atomic():
+        rows = list(live.objects.filter(term=term).order_by("pk").values(*columns)[:chunk_size])
+        if not rows:
+            return 0
+        archived.objects.bulk_create([archived(**row) for row in rows], ignore_conflicts=True)
+        # Attendance deletes refresh the rollups row by row; do it once per chunk.
+        # Archived marks still count towards cached results, and archived
+        # submissions take over their files' references, so leave those be.
+        with deferred_refresh(), invalidation_suspended(), references_retained():
+            live.objects.filter(pk__in=[row["id"] for row in rows]).delete()
+    return len(rows)
+
+
+def archive_term(term, chunk_size=CHUNK_SIZE, progress=None):
+    """Move every live row of ``term`` into the archive tables.
+
+    Returns ``{label: rows moved}``. ``progress`` is called with the label and
+    running count after each chunk. Rows recorded against the term after it
+    was archived are picked up by simply running this again.
+    """
+    moved = {}
+    for label, live, archived in ARCHIVES:
+        moved[label] = 0
+        while True:
+            count = _move_chunk(live, archived, term, chunk_size)
+            if not count:
+                break
+            moved[label] += count
+            if progress:
+                progress(label, moved[label])
+    if term.archived_at is None:
+        term.archived_at = timezone.now()
+        term.save(update_fields=["archived_at"])
+    if term.is_compacted:
+        compact_term(term)
+    return moved
+
+
+def _compact_chunk(term, chunk_size):
+    rows = ArchivedAttendance.objects.filter(term=term)
+    with transaction.atomic():
+        student_ids = list(
+            rows.order_by("student_id").values_list("student_id", flat=True).distinct()[:chunk_size]
+        )
+        if not student_ids:
+            return 0
+        rows = rows.filter(student_id__in=student_ids)
+        # Months already compacted for these students absorb rows archived since.
+        months = {
+            (month.student_id, month.subject_id, month.month): month
+            for month in AttendanceMonth.objects.filter(term=term, student_id__in=student_ids)
+        }
+        records = list(rows.order_by().values_list("student_id", "subject_id", "date", "status"))
+        for student_id, subject_id, date, status in records:
+            key = (student_id, subject_id, month_of(date))
+            month = months.get(key)
+            if month is None:
+                month = months[key] = AttendanceMonth(
+                    student_id=student_id, subject_id=subject_id, term=term, month=key[2]
+                )
+            bit = day_bit(date)
+            month.held_days |= bit
+            if status == Attendance.Status.PRESENT:
+                month.present_days |= bit
+            else:
+                month.present_days &= ~bit
+        AttendanceMonth.objects.bulk_create([month for month in months.values() if month.pk is None])
+        AttendanceMonth.objects.bulk_update(
+            [month for month in months.values() if month.pk is not None], ["held_days", "present_days"]
+        )
+        rows.delete()
+    return len(records)
+
+
+def compact_term(term, chunk_size=COMPACT_CHUNK_SIZE, progress=None):
+    """Replace an archived term's ``ArchivedAttendance`` rows with ``AttendanceMonth`` bitmaps.
+
+    Returns the number of daily records converted. The conversion is one
+    way: the per-day faculty and timestamps are not kept.
+    """
+    converted = 0
+    while True:
+        count = _compact_chunk(term, chunk_size)
+        if not count:
+            break
+        converted += count
+        if progress:
+            progress(converted)
+    if term.compacted_at is None:
+        term.compacted_at = timezone.now()
+        term.save(update_fields=["compacted_at"])
+    return converted
@@ -0,0 +1,171 @@
+"""
+Batched writes of the ``MarksAudit`` change log.
+
+Edits and deletions of marks queue an audit row in-process once their
+transaction commits, so the request never waits on an extra INSERT. A
+daemon thread writes the queue with one ``bulk_create`` when it reaches
+``FLUSH_SIZE`` rows, or ``FLUSH_INTERVAL`` seconds after the last write,
+whichever comes first. The queue is flushed once more at interpreter exit,
+and before history is read, so a process always sees its own changes.
+
+A write that fails on a lost connection or a lock timeout keeps the rows
+queued for the next attempt. Any other failure means some row can never be
+saved, so the batch is retried row by row and the rows that still fail are
+logged and dropped rather than blocking everything queued after them. Rows
+still queued when the process is killed outright are lost.
+"""
+import atexit
+import logging
+import threading
+
+from django.db import DatabaseError, InterfaceError, OperationalError, close_old_connections, transaction
+from django.utils import timezone
+
+from .models import Marks, MarksAudit
+
+FLUSH_SIZE = 200
+FLUSH_INTERVAL = 0.5
+
+logger = logging.getLogger(__name__)
+
+
+class AuditWriter:
+    """Queue of unsaved ``MarksAudit`` rows and the thread that writes them."""
+
+    def __init__(self, flush_size=FLUSH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._pending = []
+        self._lock = threading.Lock()
+        # Serialises writers so rows are saved in the order they were queued.
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def extend(self, rows):
+        with self._lock:
+            self._pending.extend(rows)
+            full = len(self._pending) >= self.flush_size
+            # Started lazily so processes forked by a preloading server get their own.
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="marks-audit-writer", daemon=True)
+                self._thread.start()
+        if full:
+            self._wake.set()
+
+    def flush(self):
+        """Write every queued row now; returns how many were written."""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._pending = self._pending, []
+            if not rows:
+                return 0
+            try:
+                MarksAudit.objects.bulk_create(rows, batch_size=500)
+            except (OperationalError, InterfaceError):
+                logger.exception("Writing %d marks audit rows failed; keeping them queued", len(rows))
+                self._requeue(rows)
+                return 0
+            except DatabaseError:
+                logger.exception("Writing %d marks audit rows failed; retrying them one by one", len(rows))
+                return self._write_each(rows)
+            return len(rows)
+
+    def _requeue(self, rows):
+        with self._lock:
+            self._pending[:0] = rows
+
+    def _write_each(self, rows):
+        written = 0
+        for index, row in enumerate(rows):
+            try:
+                with transaction.atomic():
+                    MarksAudit.objects.bulk_create([row])
+            except (OperationalError, InterfaceError):
+                logger.exception("Writing marks audit rows failed; keeping %d queued", len(rows) - index)
+                self._requeue(rows[index:])
+                break
+            except DatabaseError:
+                logger.exception("Dropping the audit row of a change to mark %s, which cannot be saved", row.mark_id)
+            else:
+                written += 1
+        return written
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+            # This thread is outside the request cycle; honour CONN_MAX_AGE here too.
+            close_old_connections()
+
+
+writer = AuditWriter()
+atexit.register(writer.flush)
+
+
+def snapshot(mark):
+    """The fields of ``mark`` an audit row keeps, to compare before and after an edit."""
+    return {
+        "student_id": mark.student_id,
+        "subject_id": mark.subject_id,
+        "assessment_type": mark.assessment_type,
+        "score": mark.score,
+        "max_score": mark.max_score,
+    }
+
+
+def _row(action, mark_id, before, user, new_score=None, new_max_score=None):
+    return MarksAudit(
+        mark_id=mark_id,
+        action=action,
+        new_score=new_score,
+        new_max_score=new_max_score,
+        changed_by=user if user is not None and user.is_authenticated else None,
+        changed_at=timezone.now(),
+        **before,
+    )
+
+
+def update_row(mark, before, user=None):
+    """An audit row for ``mark`` having been edited from the ``before`` snapshot."""
+    return _row(MarksAudit.Action.UPDATE, mark.pk, before, user, mark.score, mark.max_score)
+
+
+def deletion_row(mark, user=None):
+    """An audit row for ``mark`` being deleted."""
+    return _row(MarksAudit.Action.DELETE, mark.pk, snapshot(mark), user)
+
+
+def record(rows):
+    """Queue audit rows for writing once the current transaction commits."""
+    rows = list(rows)
+    if rows:
+        transaction.on_commit(lambda: writer.extend(rows))
+
+
+def record_update(mark, before, user=None):
+    """Queue an audit row for an edit, unless nothing it tracks changed."""
+    if snapshot(mark) != before:
+        record([update_row(mark, before, user)])
+
+
+def record_deletion(mark, user=None):
+    record([deletion_row(mark, user)])
+
+
+def mark_history(mark_id):
+    """Every version of a mark, oldest first.
+
+    Each version is a ``snapshot()`` dict plus ``replaced_by``, the
+    ``MarksAudit`` row of the change that ended it, or ``None`` for the mark
+    as it stands now. A deleted mark's last version ends with its deletion.
+    """
+    writer.flush()
+    changes = MarksAudit.objects.filter(mark_id=mark_id).select_related("changed_by").order_by("changed_at", "pk")
+    # An audit row carries the replaced values under the mark's own field names.
+    versions = [dict(snapshot(change), replaced_by=change) for change in changes]
+    current = Marks.objects.filter(pk=mark_id).first()
+    if current is not None:
+        versions.append(dict(snapshot(current), replaced_by=None))
+    return versions
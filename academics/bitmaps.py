@@ -0,0 +1,55 @@
+"""
+Bit-level helpers for the compact ``AttendanceMonth`` representation.
+
+A month of one student's attendance in one subject is two 31-bit integers:
+bit ``day - 1`` of ``held`` is set when the class met that day, and the same
+bit of ``present`` when the student attended. Counting present and held
+classes is then a popcount, which MySQL computes with ``BIT_COUNT``.
+"""
+import calendar
+import datetime
+
+from django.db import models
+
+DAYS_BITS = 31
+FULL_MONTH = (1 << DAYS_BITS) - 1
+
+
+class BitCount(models.Func):
+    """Number of set bits in an integer expression."""
+
+    function = "BIT_COUNT"
+    output_field = models.IntegerField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # SQLite has no popcount; sum the bits one shift at a time.
+        sql, params = compiler.compile(self.source_expressions[0])
+        bits = " + ".join(f"(({sql} >> {bit}) & 1)" for bit in range(DAYS_BITS))
+        return f"({bits})", tuple(params) * DAYS_BITS
+
+
+def month_of(date):
+    """First day of the month ``date`` falls in."""
+    return date.replace(day=1)
+
+
+def day_bit(date):
+    return 1 << (date.day - 1)
+
+
+def window_mask(month, start=None, end=None):
+    """Bits of ``month`` that fall inside the inclusive ``[start, end]`` window."""
+    mask = FULL_MONTH
+    if start and month_of(start) == month:
+        mask &= FULL_MONTH ^ ((1 << (start.day - 1)) - 1)
+    if end and month_of(end) == month:
+        mask &= (1 << end.day) - 1
+    return mask
+
+
+def iter_days(month, held, present):
+    """Yield ``(date, attended)`` for every held class of ``month``, latest first."""
+    for day in range(calendar.monthrange(month.year, month.month)[1], 0, -1):
+        bit = 1 << (day - 1)
+        if held & bit:
+            yield datetime.date(month.year, month.month, day), bool(present & bit)
@@ -0,0 +1,139 @@
+"""
+Streaming CSV exports of attendance, marks and submissions.
+
+Rows are read with ``values_list()`` in primary-key batches and written one
+line at a time, so no model instances are built and memory stays flat
+regardless of how many rows are exported. Batching by key rather than with
+``QuerySet.iterator()`` matters on MySQL, whose driver buffers the whole
+result set of a single query on the client. The output starts with a UTF-8 byte order mark
+so Excel opens it with the right encoding.
+"""
+import csv
+from dataclasses import dataclass
+
+from .archive import archive_model
+from .bitmaps import iter_days
+from .models import Attendance, AttendanceMonth, Marks, Submission
+from .scoping import scope_attendance, scope_marks, scope_submissions
+
+CHUNK_SIZE = 2000
+BOM = "\ufeff"
+
+# Cells starting with these are evaluated as formulas by spreadsheet apps.
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+@dataclass(frozen=True)
+class Export:
+    model: type
+    header: tuple
+    fields: tuple
+    date_field: str
+    scope: object
+
+
+EXPORTS = {
+    "attendance": Export(
+        model=Attendance,
+        header=("date", "registration_number", "subject_code", "status", "faculty_employee_number", "recorded_at"),
+        fields=("date", "student__registration_number", "subject__code", "status", "faculty__employee_number", "created_at"),
+        date_field="date",
+        scope=scope_attendance,
+    ),
+    "marks": Export(
+        model=Marks,
+        header=("registration_number", "subject_code", "assessment_type", "score", "max_score", "recorded_at"),
+        fields=("student__registration_number", "subject__code", "assessment_type", "score", "max_score", "recorded_at"),
+        date_field="recorded_at__date",
+        scope=scope_marks,
+    ),
+    "submissions": Export(
+        model=Submission,
+        header=("assignment_id", "assignment_title", "subject_code", "registration_number", "status", "submitted_on", "score"),
+        fields=("assignment_id", "assignment__title", "assignment__subject__code", "student__registration_number", "status", "submitted_on", "score"),
+        date_field="submitted_on",
+        scope=scope_submissions,
+    ),
+}
+
+
+class _Echo:
+    """File-like object whose ``write`` hands the formatted line straight back."""
+
+    def write(self, value):
+        return value
+
+
+def _safe(value):
+    if value is None:
+        return ""
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def export_queryset(kind, user=None, role=None, start=None, end=None, term=None):
+    """Build the row-scoped queryset for one export kind.
+
+    Without a ``user`` the queryset is unscoped, which is what the management
+    command uses. An archived ``term`` is read from the archive tables.
+    """
+    export = EXPORTS[kind]
+    model = export.model
+    if term is not None and term.is_archived:
+        model = archive_model(model, term)
+    queryset = model.objects.all()
+    if term is not None:
+        queryset = queryset.filter(term=term)
+    if user is not None:
+        queryset = export.scope(queryset, user, role)
+    if model is AttendanceMonth:
+        return queryset.within(start, end)
+    if start:
+        queryset = queryset.filter(**{f"{export.date_field}__gte": start})
+    if end:
+        queryset = queryset.filter(**{f"{export.date_field}__lte": end})
+    return queryset
+
+
+def _iter_batches(rows, chunk_size):
+    # Primary key order walks the clustered index instead of sorting the result.
+    rows = rows.order_by("pk")
+    last_pk = None
+    while True:
+        chunk = rows if last_pk is None else rows.filter(pk__gt=last_pk)
+        batch = list(chunk[:chunk_size])
+        yield from batch
+        if len(batch) < chunk_size:
+            return
+        last_pk = batch[-1][0]
+
+
+def _iter_month_rows(queryset, chunk_size):
+    """Expand compacted attendance months into the attendance export's columns."""
+    windowed = "window_held" in queryset.query.annotations
+    bitmaps = ("window_held", "window_present") if windowed else ("held_days", "present_days")
+    rows = queryset.values_list("pk", "month", *bitmaps, "student__registration_number", "subject__code")
+    # Months hold up to 31 records each.
+    for _, month, held, present, registration_number, subject_code in _iter_batches(rows, max(1, chunk_size // 31)):
+        for date, attended in iter_days(month, held, present):
+            status = Attendance.Status.PRESENT if attended else Attendance.Status.ABSENT
+            yield date, registration_number, subject_code, status, None, None
+
+
+def iter_rows(kind, queryset, chunk_size=CHUNK_SIZE):
+    """Yield export tuples in primary-key order, one bounded query per chunk."""
+    if queryset.model is AttendanceMonth:
+        yield from _iter_month_rows(queryset, chunk_size)
+        return
+    rows = queryset.values_list("pk", *EXPORTS[kind].fields)
+    for row in _iter_batches(rows, chunk_size):
+        yield row[1:]
+
+
+def iter_csv(kind, queryset, chunk_size=CHUNK_SIZE):
+    """Yield the CSV document for ``queryset`` one line at a time."""
+    writer = csv.writer(_Echo())
+    yield BOM + writer.writerow(EXPORTS[kind].header)
+    for row in iter_rows(kind, queryset, chunk_size):
+        yield writer.writerow([_safe(value) for value in row])
@@ -1,6 +1,10 @@
+from decimal import Decimal
+
 from django import forms
+from django.core.validators import FileExtensionValidator
+from django.utils import timezone
 
-from .models import Assignment, Attendance, Faculty, Marks, Submission
+from .models import Assignment, Attendance, Faculty, Marks, Student, Subject, Submission, Term
 
 
 class _StyledModelForm(forms.ModelForm):
@@ -11,6 +15,9 @@ class _StyledModelForm(forms.ModelForm):
         for field in self.fields.values():
             if not isinstance(field.widget, (forms.CheckboxInput, forms.RadioSelect)):
                 field.widget.attrs.setdefault("class", "form-control")
+        if "student" in self.fields:
+            # Option labels use Student.__str__, which reads the user.
+            self.fields["student"].queryset = Student.objects.select_related("user")
 
 
 class AttendanceForm(_StyledModelForm):
@@ -19,6 +26,242 @@ class AttendanceForm(_StyledModelForm):
         fields = ["student", "subject", "date", "status"]
 
 
+class AttendanceRosterForm(forms.Form):
+    """Selects the subject, date and section whose roster is marked in one go."""
+    subject = forms.ModelChoiceField(
+        queryset=Subject.objects.order_by("code"),
+        widget=forms.Select(attrs={'class': 'form-select'}),
+    )
+    date = forms.DateField(
+        initial=timezone.localdate,
+        widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
+    )
+    section = forms.CharField(
+        max_length=8,
+        widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'e.g. A'}),
+    )
+
+    def clean_section(self):
+        return self.cleaned_data["section"].strip()
+
+
+# Per-row parsers for the marks grid, matching the Marks decimal columns.
+_SCORE = forms.DecimalField(max_digits=5, decimal_places=2, min_value=0)
+_MAX_SCORE = forms.DecimalField(max_digits=5, decimal_places=2, min_value=Decimal("0.01"))
+
+
+class MarksGridForm(forms.Form):
+    """Selects the subject, assessment and optional section whose marks are entered in one grid."""
+    subject = forms.ModelChoiceField(
+        queryset=Subject.objects.order_by("code"),
+        widget=forms.Select(attrs={'class': 'form-select'}),
+    )
+    assessment_type = forms.ChoiceField(
+        choices=Marks.AssessmentType.choices,
+        widget=forms.Select(attrs={'class': 'form-select'}),
+    )
+    section = forms.CharField(
+        max_length=8,
+        required=False,
+        widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'All sections'}),
+    )
+
+    def __init__(self, *args, faculty=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if faculty is not None:
+            self.fields["subject"].queryset = self.fields["subject"].queryset.filter(faculty=faculty)
+
+    def clean_section(self):
+        return self.cleaned_data["section"].strip()
+
+    def clean_scores(self, data, students):
+        """Validate the posted ``max_score`` and one ``score_<student id>`` per student.
+
+        Returns ``(max_score, scores, errors)``. ``scores`` maps student ids to
+        the entered score, skipping blank rows; ``errors`` maps student ids,
+        or ``"max_score"``, to a message.
+        """
+        errors = {}
+        max_score = None
+        try:
+            max_score = _MAX_SCORE.clean(data.get("max_score"))
+        except forms.ValidationError as exc:
+            errors["max_score"] = exc.messages[0]
+
+        scores = {}
+        for student in students:
+            raw = (data.get(f"score_{student.pk}") or "").strip()
+            if not raw:
+                continue
+            try:
+                score = _SCORE.clean(raw)
+            except forms.ValidationError as exc:
+                errors[student.pk] = exc.messages[0]
+                continue
+            if max_score is not None and score > max_score:
+                errors[student.pk] = f"Score cannot exceed the maximum of {max_score}."
+                continue
+            scores[student.pk] = score
+        return max_score, scores, errors
+
+
+def clean_grades(data, submissions, max_score):
+    """Validate the grading grid's edited rows.
+
+    Each row posts ``score_<id>`` and ``remarks_<id>`` along with the
+    ``initial_score_<id>``, ``initial_remarks_<id>`` and ``version_<id>`` it
+    was rendered with. Rows whose values match their initial ones were not
+    touched and are skipped. Returns ``(grades, errors)``: ``grades`` maps
+    submission ids to ``(score, remarks, version)``, a blank score clearing
+    the grade; ``errors`` maps submission ids to a message.
+    """
+    def value(name):
+        # Browsers post line breaks as CRLF; store them the way Django forms do.
+        return (data.get(name) or "").strip().replace("\r\n", "\n")
+
+    grades, errors = {}, {}
+    for submission in submissions:
+        pk = submission.pk
+        raw_score, remarks = value(f"score_{pk}"), value(f"remarks_{pk}")
+        if (raw_score, remarks) == (value(f"initial_score_{pk}"), value(f"initial_remarks_{pk}")):
+            continue
+        try:
+            version = int(data.get(f"version_{pk}"))
+            score = _SCORE.clean(raw_score) if raw_score else None
+        except (TypeError, ValueError):
+            errors[pk] = "Reload the page and enter this row again."
+            continue
+        except forms.ValidationError as exc:
+            errors[pk] = exc.messages[0]
+            continue
+        if score is not None and score > max_score:
+            errors[pk] = f"Score cannot exceed the maximum of {max_score}."
+            continue
+        grades[pk] = (score, remarks, version)
+    return grades, errors
+
+
+class MarksImportForm(forms.Form):
+    """A CSV file of marks in the marks export's column layout."""
+    file = forms.FileField(
+        validators=[FileExtensionValidator(["csv"])],
+        widget=forms.ClearableFileInput(attrs={'class': 'form-control', 'accept': '.csv'}),
+    )
+
+
+class GradebookForm(forms.Form):
+    """Selects the subject, and optionally one section, shown in the gradebook."""
+    subject = forms.ModelChoiceField(
+        queryset=Subject.objects.order_by("code"),
+        widget=forms.Select(attrs={'class': 'form-select'}),
+    )
+    section = forms.CharField(
+        max_length=8,
+        required=False,
+        widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'All sections'}),
+    )
+
+    def __init__(self, *args, faculty=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if faculty is not None:
+            self.fields["subject"].queryset = self.fields["subject"].queryset.filter(faculty=faculty)
+
+    def clean_section(self):
+        return self.cleaned_data["section"].strip()
+
+
+class SubjectAnalyticsForm(forms.Form):
+    """Selects the subject, assessment and term whose class statistics are shown."""
+    subject = forms.ModelChoiceField(
+        queryset=Subject.objects.order_by("code"),
+        widget=forms.Select(attrs={'class': 'form-select'}),
+    )
+    assessment_type = forms.ChoiceField(
+        choices=Marks.AssessmentType.choices,
+        widget=forms.Select(attrs={'class': 'form-select'}),
+    )
+    # Statistics read the live marks table, so archived terms are not offered.
+    term = forms.ModelChoiceField(
+        queryset=Term.objects.open(),
+        required=False,
+        empty_label="All open terms",
+        widget=forms.Select(attrs={'class': 'form-select'}),
+    )
+
+    def __init__(self, *args, faculty=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if faculty is not None:
+            self.fields["subject"].queryset = self.fields["subject"].queryset.filter(faculty=faculty)
+
+
+class DateWindowForm(forms.Form):
+    """Optional term and inclusive date range used to narrow listings and reports.
+
+    ``default_term`` applies until the user picks another term or clears it
+    to see every term still in the live tables.
+    """
+    term = forms.ModelChoiceField(
+        queryset=Term.objects.all(),
+        required=False,
+        empty_label="All open terms",
+        widget=forms.Select(attrs={'class': 'form-select'}),
+    )
+    start = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
+    )
+    end = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
+    )
+
+    def __init__(self, data=None, *args, default_term=None, **kwargs):
+        if default_term is not None:
+            if data is None:
+                kwargs.setdefault("initial", {})["term"] = default_term
+            elif "term" not in data:
+                data = data.copy()
+                data["term"] = default_term.pk
+        super().__init__(data, *args, **kwargs)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start, end = cleaned_data.get("start"), cleaned_data.get("end")
+        if start and end and start > end:
+            raise forms.ValidationError("Start date must be on or before the end date.")
+        return cleaned_data
+
+    def window(self):
+        """Return ``(start, end)``, with ``None`` for open or invalid bounds."""
+        if not self.is_bound or not self.is_valid():
+            return None, None
+        return self.cleaned_data.get("start"), self.cleaned_data.get("end")
+
+    def selected_term(self):
+        """The chosen term, or ``None`` for all open terms."""
+        if not self.is_bound:
+            return self.initial.get("term")
+        self.is_valid()
+        return self.cleaned_data.get("term")
+
+    def apply(self, queryset, field=None):
+        """Filter ``queryset`` to the term and to the window on the date-valued lookup ``field``.
+
+        Without ``field`` the window goes through the queryset's own ``within()``.
+        """
+        term = self.selected_term()
+        if term is not None:
+            queryset = queryset.filter(term=term)
+        start, end = self.window()
+        if field is None:
+            return queryset.within(start, end)
+        if start:
+            queryset = queryset.filter(**{f"{field}__gte": start})
+        if end:
+            queryset = queryset.filter(**{f"{field}__lte": end})
+        return queryset
+
+
 class MarksForm(_StyledModelForm):
     class Meta:
         model = Marks
@@ -0,0 +1,47 @@
+"""
+Student × assessment gradebook for one subject.
+
+The whole table is one query: the class's students LEFT JOINed to their
+marks in the subject, with a conditional ``Max`` per assessment type for the
+score and the maximum score, and the total and percentage over those
+columns. A repeated mark for the same assessment counts once, at its best.
+"""
+from django.db import models
+from django.db.models import F, FilteredRelation, Max, Q, Value
+from django.db.models.functions import Cast, Coalesce, NullIf, Round
+
+from .models import Marks
+
+ASSESSMENTS = Marks.AssessmentType.choices
+
+_SCORE = models.DecimalField(max_digits=8, decimal_places=2)
+
+
+def gradebook_rows(subject, students):
+    """One dict per student in ``students`` with a ``cells`` list in ``ASSESSMENTS`` order.
+
+    Each cell is ``(score, max_score)``, both ``None`` when there is no mark.
+    Rows also carry ``total``, ``total_max`` and ``percentage``.
+    """
+    columns = {}
+    for assessment, _ in ASSESSMENTS:
+        in_column = Q(subject_marks__assessment_type=assessment)
+        columns[f"{assessment}_score"] = Max("subject_marks__score", filter=in_column)
+        columns[f"{assessment}_max"] = Max("subject_marks__max_score", filter=in_column)
+
+    zero = Value(0, output_field=_SCORE)
+    total = sum((Coalesce(F(f"{assessment}_score"), zero) for assessment, _ in ASSESSMENTS), zero)
+    total_max = sum((Coalesce(F(f"{assessment}_max"), zero) for assessment, _ in ASSESSMENTS), zero)
+    rows = (
+        students.annotate(subject_marks=FilteredRelation("marks", condition=Q(marks__subject=subject)))
+        .values("pk", "registration_number", "user__username", "user__first_name", "user__last_name")
+        .annotate(**columns)
+        .annotate(total=total, total_max=total_max)
+        .annotate(percentage=Round(
+            Cast("total", models.FloatField()) * 100 / NullIf(Cast("total_max", models.FloatField()), Value(0.0)), 2
+        ))
+        .order_by("registration_number")
+    )
+    for row in rows:
+        row["cells"] = [(row[f"{assessment}_score"], row[f"{assessment}_max"]) for assessment, _ in ASSESSMENTS]
+        yield row
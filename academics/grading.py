@@ -0,0 +1,194 @@
+"""
+Grades, SGPA and CGPA computed from marks.
+
+A subject's percentage is its best mark per assessment type, summed and
+taken over the matching maximum scores. That maps to a letter grade and
+grade points on a 10-point scale, and credit-weighted grade points give
+the SGPA for a term. The CGPA runs over the term and every earlier one.
+
+Results are computed for a whole cohort at once: one aggregate over the
+term's marks per chunk of students, then plain arithmetic in Python. They
+are cached as ``TermResult`` rows per (student, term). A change to one of
+a student's marks deletes that student's result for the term and every
+later term, which is all the change can affect. The student dashboard
+reads results through ``term_results``, which recomputes whatever was
+deleted; ``manage.py compute_results`` fills a whole batch ahead of time.
+"""
+from collections import defaultdict
+from contextlib import contextmanager
+from decimal import ROUND_HALF_UP, Decimal
+from threading import local
+
+from django.db import connection, transaction
+from django.db.models import Max, Q, Sum
+
+from .models import ArchivedMarks, Marks, Subject, Term, TermResult
+
+BATCH_SIZE = 1000
+
+# (minimum percentage, letter, grade points), highest band first.
+GRADE_SCALE = (
+    (90, "O", 10),
+    (80, "A+", 9),
+    (70, "A", 8),
+    (60, "B+", 7),
+    (50, "B", 6),
+    (40, "C", 5),
+    (0, "F", 0),
+)
+
+_TWO_PLACES = Decimal("0.01")
+_suspended = local()
+
+
+def grade_for(percentage):
+    """``(letter, grade points)`` for a subject percentage."""
+    for minimum, letter, points in GRADE_SCALE:
+        if percentage >= minimum:
+            return letter, points
+    return GRADE_SCALE[-1][1:]
+
+
+def _ratio(points, credits):
+    if not credits:
+        return None
+    return (Decimal(points) / credits).quantize(_TWO_PLACES, rounding=ROUND_HALF_UP)
+
+
+def subject_percentages(term, student_ids):
+    """``{(student_id, subject_id): percentage}`` from one aggregate over the term's marks."""
+    marks = ArchivedMarks if term.is_archived else Marks
+    rows = (
+        marks.objects.filter(term=term, student_id__in=student_ids)
+        .order_by()
+        .values("student_id", "subject_id", "assessment_type")
+        .annotate(score=Max("score"), max_score=Max("max_score"))
+    )
+    totals = defaultdict(lambda: [Decimal(0), Decimal(0)])
+    for row in rows:
+        total = totals[(row["student_id"], row["subject_id"])]
+        total[0] += row["score"]
+        total[1] += row["max_score"]
+    return {key: float(score * 100 / max_score) for key, (score, max_score) in totals.items() if max_score}
+
+
+def _compute_chunk(term, student_ids):
+    percentages = subject_percentages(term, student_ids)
+    subjects = {
+        pk: (code, credits)
+        for pk, code, credits in Subject.objects.filter(
+            pk__in={subject_id for _, subject_id in percentages}
+        ).values_list("pk", "code", "credits")
+    }
+    prior = {
+        row["student_id"]: row
+        for row in TermResult.objects.filter(student_id__in=student_ids, term__start_date__lt=term.start_date)
+        .values("student_id")
+        .annotate(points=Sum("credit_points"), credits=Sum("credits"))
+    }
+
+    per_student = defaultdict(list)
+    for (student_id, subject_id), percentage in sorted(percentages.items(), key=lambda item: subjects[item[0][1]][0]):
+        letter, points = grade_for(percentage)
+        code, credits = subjects[subject_id]
+        per_student[student_id].append({
+            "subject": code,
+            "credits": credits,
+            "percentage": round(percentage, 2),
+            "grade": letter,
+            "points": points,
+        })
+
+    results = []
+    for student_id in student_ids:
+        grades = per_student.get(student_id, [])
+        credits = sum(grade["credits"] for grade in grades)
+        credit_points = Decimal(sum(grade["credits"] * grade["points"] for grade in grades))
+        earlier = prior.get(student_id, {})
+        results.append(TermResult(
+            student_id=student_id,
+            term=term,
+            credits=credits,
+            credits_earned=sum(grade["credits"] for grade in grades if grade["points"]),
+            credit_points=credit_points,
+            sgpa=_ratio(credit_points, credits),
+            cgpa=_ratio(credit_points + (earlier.get("points") or 0), credits + (earlier.get("credits") or 0)),
+            grades=grades,
+        ))
+
+    conflict_options = {
+        "update_conflicts": True,
+        "update_fields": ["credits", "credits_earned", "credit_points", "sgpa", "cgpa", "grades", "computed_at"],
+    }
+    if connection.features.supports_update_conflicts_with_target:
+        conflict_options["unique_fields"] = ["student", "term"]
+    TermResult.objects.bulk_create(results, **conflict_options)
+    return results
+
+
+def compute_results(term, student_ids, batch_size=BATCH_SIZE):
+    """Compute and cache ``term``'s results for ``student_ids``.
+
+    The students' results for earlier terms must already be cached, since
+    the CGPA builds on them; ``term_results`` takes care of that.
+    """
+    student_ids = list(student_ids)
+    computed = []
+    for offset in range(0, len(student_ids), batch_size):
+        computed.extend(_compute_chunk(term, student_ids[offset:offset + batch_size]))
+    return computed
+
+
+def term_results(student_ids, term):
+    """``{student_id: TermResult}`` for ``term``, computing whatever is not cached.
+
+    Missing results for earlier terms are computed first, oldest first.
+    """
+    student_ids = set(student_ids)
+    terms = list(Term.objects.filter(start_date__lte=term.start_date).order_by("start_date"))
+    cached = set(
+        TermResult.objects.filter(student_id__in=student_ids, term__in=terms).values_list("student_id", "term_id")
+    )
+    for each in terms:
+        missing = sorted(student_id for student_id in student_ids if (student_id, each.pk) not in cached)
+        if missing:
+            compute_results(each, missing)
+    return {result.student_id: result for result in TermResult.objects.filter(student_id__in=student_ids, term=term)}
+
+
+@contextmanager
+def invalidation_suspended():
+    """Ignore ``invalidate_results`` inside the block.
+
+    For moves that leave every mark as it was, such as archiving a term.
+    """
+    previous = getattr(_suspended, "active", False)
+    _suspended.active = True
+    try:
+        yield
+    finally:
+        _suspended.active = previous
+
+
+def invalidate_results(keys):
+    """Drop cached results affected by changed marks, given ``(student_id, term_id)`` pairs.
+
+    The results are dropped once the write commits, so one computed from the
+    old marks in the meantime does not outlive it.
+    """
+    if getattr(_suspended, "active", False):
+        return
+    students_by_term = defaultdict(set)
+    for student_id, term_id in keys:
+        if student_id and term_id:
+            students_by_term[term_id].add(student_id)
+    if students_by_term:
+        transaction.on_commit(lambda: _drop_results(students_by_term))
+
+
+def _drop_results(students_by_term):
+    stale = Q()
+    for term_id, start_date in Term.objects.filter(pk__in=students_by_term).values_list("pk", "start_date"):
+        stale |= Q(student_id__in=students_by_term[term_id], term__start_date__gte=start_date)
+    if stale:
+        TermResult.objects.filter(stale).delete()
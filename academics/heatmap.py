@@ -0,0 +1,100 @@
+"""
+Per-day attendance counts for a student's calendar heatmap.
+
+Counts are cached per student, subject filter and month. A month that has
+ended is final and cached without expiry; the running month expires after
+``OPEN_MONTH_TIMEOUT``. Edits to attendance drop the affected month through
+``invalidate_calendar`` either way. Whatever is not cached is computed with a
+single ``GROUP BY date`` over the live table, plus the archive tables when an
+archived term overlaps the range.
+"""
+import datetime
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .bitmaps import month_of
+from .models import ArchivedAttendance, Attendance, AttendanceMonth, Term
+
+OPEN_MONTH_TIMEOUT = 300
+MAX_MONTHS = 24
+
+
+def _key(student_id, subject_id, month):
+    return f"attendance-calendar:{student_id}:{subject_id or 'all'}:{month:%Y-%m}"
+
+
+def month_end(month):
+    next_month = (month.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+    return next_month - datetime.timedelta(days=1)
+
+
+def months_between(start, end):
+    """First days of every month from ``start``'s through ``end``'s."""
+    months = []
+    month = month_of(start)
+    while month <= end:
+        months.append(month)
+        month = month_end(month) + datetime.timedelta(days=1)
+    return months
+
+
+def _sources(start, end):
+    sources = [Attendance]
+    if Term.objects.filter(archived_at__isnull=False, start_date__lte=end, end_date__gte=start).exists():
+        sources += [ArchivedAttendance, AttendanceMonth]
+    return sources
+
+
+def _compute(student_id, subject_id, months):
+    """Per-day counts for ``months``, keyed by month, from one aggregate per source table."""
+    start, end = months[0], month_end(months[-1])
+    counts = {}
+    for model in _sources(start, end):
+        records = model.objects.filter(student_id=student_id).within(start, end)
+        if subject_id:
+            records = records.filter(subject_id=subject_id)
+        for row in records.by_date():
+            present, total = counts.get(row["date"], (0, 0))
+            counts[row["date"]] = (present + row["present"], total + row["total"])
+
+    by_month = {month: [] for month in months}
+    for date in sorted(counts):
+        present, total = counts[date]
+        day = {"date": date.isoformat(), "present": present, "absent": total - present}
+        by_month.setdefault(month_of(date), []).append(day)
+    return by_month
+
+
+def calendar_days(student_id, start, end, subject_id=None):
+    """Days in ``[start, end]`` with attendance, as ``{"date", "present", "absent"}`` dicts."""
+    months = months_between(start, end)
+    keys = {month: _key(student_id, subject_id, month) for month in months}
+    cached = cache.get_many(keys.values())
+
+    missing = [month for month in months if keys[month] not in cached]
+    if missing:
+        computed = _compute(student_id, subject_id, missing)
+        today = timezone.localdate()
+        closed = {keys[month]: computed[month] for month in missing if month_end(month) < today}
+        running = {keys[month]: computed[month] for month in missing if month_end(month) >= today}
+        cache.set_many(closed, timeout=None)
+        cache.set_many(running, timeout=OPEN_MONTH_TIMEOUT)
+        cached.update(closed)
+        cached.update(running)
+
+    first, last = start.isoformat(), end.isoformat()
+    return [day for month in months for day in cached[keys[month]] if first <= day["date"] <= last]
+
+
+def invalidate_calendar(entries):
+    """Drop cached months touched by ``(student_id, subject_id, date)`` entries, once the write commits."""
+    keys = set()
+    for student_id, subject_id, date in entries:
+        month = month_of(date)
+        keys.add(_key(student_id, None, month))
+        keys.add(_key(student_id, subject_id, month))
+    if keys:
+        # A read before the commit still sees the old rows; dropping them first would let it re-cache them for good.
+        transaction.on_commit(lambda: cache.delete_many(keys))
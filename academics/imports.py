@@ -0,0 +1,189 @@
+"""
+Streaming CSV import of marks.
+
+The file is read one line at a time with ``csv.DictReader``. Registration
+numbers and subject codes resolve through dictionaries built with one query
+each. Valid rows are upserted ``BATCH_SIZE`` at a time, each batch in its own
+transaction: a student who already has a mark for the subject and
+assessment has their latest one updated, as in the marks grid, and anyone
+else gets a new mark. A bad row is reported with its line number and
+skipped; it never aborts the rest of the file. Only a line the CSV
+parser cannot split stops the import, keeping everything read before it.
+Callers should decode with ``errors="replace"`` so a stray byte spoils just
+its own row.
+
+The columns match the marks export, so an exported file can be edited and
+imported back; its ``recorded_at`` column is ignored.
+"""
+import csv
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from dashboard.stats import invalidate_dashboards
+
+from .analytics import invalidate_subject_statistics
+from .audit import record, snapshot, update_row
+from .grading import invalidate_results
+from .models import Marks, Student, Subject, Term
+
+REQUIRED_COLUMNS = ("registration_number", "subject_code", "assessment_type", "score", "max_score")
+BATCH_SIZE = 1000
+# Reports list at most this many failing rows; the rest are only counted.
+MAX_REPORTED_ERRORS = 500
+
+
+@dataclass
+class ImportReport:
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    errors: list = field(default_factory=list)
+
+    def error(self, line, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+    @property
+    def truncated(self):
+        return self.failed > len(self.errors)
+
+
+def _cell(row, column):
+    value = (row.get(column) or "").strip()
+    # Undo the formula guard the CSV export puts in front of risky cells.
+    return value[1:] if value.startswith("'") else value
+
+
+def _decimal(field_name, value):
+    # The model field enforces the column's digits and decimal places.
+    return Marks._meta.get_field(field_name).clean(value, None)
+
+
+def _parse(row, students, subjects):
+    """Return ``(key, score, max_score)`` for a CSV row, or raise ``ValueError``."""
+    registration_number = _cell(row, "registration_number")
+    student_id = students.get(registration_number.upper())
+    if student_id is None:
+        raise ValueError(f'unknown registration number "{registration_number}"')
+    subject_code = _cell(row, "subject_code")
+    subject_id = subjects.get(subject_code.upper())
+    if subject_id is None:
+        raise ValueError(f'unknown subject "{subject_code}"')
+    assessment_type = _cell(row, "assessment_type").upper()
+    if assessment_type not in Marks.AssessmentType.values:
+        raise ValueError(f'unknown assessment type "{assessment_type}"')
+    try:
+        score = _decimal("score", _cell(row, "score"))
+        max_score = _decimal("max_score", _cell(row, "max_score"))
+    except ValidationError as exc:
+        raise ValueError(f"invalid score: {' '.join(exc.messages)}")
+    if max_score <= 0:
+        raise ValueError("max_score must be greater than zero")
+    if not Decimal(0) <= score <= max_score:
+        raise ValueError(f"score {score} is outside 0-{max_score}")
+    return (student_id, subject_id, assessment_type), score, max_score
+
+
+def _upsert(batch, term, report, user):
+    """Write one batch of ``{key: (score, max_score)}`` in a single transaction."""
+    student_ids = {student_id for student_id, _, _ in batch}
+    subject_ids = {subject_id for _, subject_id, _ in batch}
+    assessment_types = {assessment_type for _, _, assessment_type in batch}
+    term_id = term.pk if term else None
+    existing = {}
+    # Marks of earlier terms not yet archived are still live; an import never rewrites them.
+    for mark in Marks.objects.filter(
+        student_id__in=student_ids, subject_id__in=subject_ids, assessment_type__in=assessment_types, term=term
+    ).order_by("recorded_at", "pk"):
+        existing[(mark.student_id, mark.subject_id, mark.assessment_type, mark.term_id)] = mark
+
+    to_create, to_update, audit_rows = [], [], []
+    for (student_id, subject_id, assessment_type), (score, max_score) in batch.items():
+        mark = existing.get((student_id, subject_id, assessment_type, term_id))
+        if mark is None:
+            to_create.append(Marks(
+                student_id=student_id,
+                subject_id=subject_id,
+                assessment_type=assessment_type,
+                score=score,
+                max_score=max_score,
+                term=term,
+            ))
+        elif (mark.score, mark.max_score) != (score, max_score):
+            before = snapshot(mark)
+            mark.score, mark.max_score = score, max_score
+            to_update.append(mark)
+            audit_rows.append(update_row(mark, before, user))
+        else:
+            report.unchanged += 1
+
+    with transaction.atomic():
+        Marks.objects.bulk_create(to_create, batch_size=500)
+        Marks.objects.bulk_update(to_update, ["score", "max_score"], batch_size=500)
+        # Bulk writes send no signals; drop the affected cached results here.
+        changed = to_create + to_update
+        invalidate_results((mark.student_id, mark.term_id) for mark in changed)
+        invalidate_subject_statistics(mark.subject_id for mark in changed)
+        invalidate_dashboards(
+            students=(mark.student_id for mark in changed),
+            subjects=(mark.subject_id for mark in changed),
+            admin=True,
+        )
+        record(audit_rows)
+    report.created += len(to_create)
+    report.updated += len(to_update)
+
+
+def import_marks(lines, faculty=None, user=None, batch_size=BATCH_SIZE):
+    """Import marks from an iterable of CSV text lines and return an ``ImportReport``.
+
+    With a ``faculty``, only that faculty member's subjects are accepted.
+    Updated marks are logged in the audit trail as changed by ``user``.
+    """
+    report = ImportReport()
+    reader = csv.DictReader(lines)
+    try:
+        # The export starts with a byte order mark for Excel.
+        reader.fieldnames = [name.strip().lstrip("\ufeff") for name in reader.fieldnames or ()]
+    except csv.Error as exc:
+        report.error(1, f"unreadable header: {exc}")
+        return report
+    missing = [column for column in REQUIRED_COLUMNS if column not in reader.fieldnames]
+    if missing:
+        report.error(1, f"missing column(s): {', '.join(missing)}")
+        return report
+
+    students = {
+        registration_number.upper(): pk
+        for registration_number, pk in Student.objects.values_list("registration_number", "pk")
+    }
+    subjects = Subject.objects.all() if faculty is None else Subject.objects.filter(faculty=faculty)
+    subjects = {code.upper(): pk for code, pk in subjects.values_list("code", "pk")}
+    # bulk_create skips the pre_save handler that files new rows under a term.
+    term = Term.objects.containing(timezone.localdate())
+
+    batch = {}
+    try:
+        for row in reader:
+            try:
+                key, score, max_score = _parse(row, students, subjects)
+            except ValueError as exc:
+                report.error(reader.line_num, str(exc))
+                continue
+            # A key repeated within the file keeps its last row.
+            batch[key] = (score, max_score)
+            if len(batch) >= batch_size:
+                _upsert(batch, term, report, user)
+                batch = {}
+    except csv.Error as exc:
+        # Keep what was read before the damage and stop there.
+        report.error(reader.line_num + 1, f"unreadable, import stopped here: {exc}")
+    if batch:
+        _upsert(batch, term, report, user)
+    return report
@@ -0,0 +1,39 @@
+"""
+Management command to move a closed term's attendance, marks and submissions
+out of the hot tables into the archive tables. Safe to interrupt and re-run.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from academics.archive import ARCHIVES, CHUNK_SIZE, archive_term
+from academics.models import Term
+
+
+class Command(BaseCommand):
+    help = 'Archive a closed term: move its attendance, marks and submissions into the archive tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('term', help='Name of the term to archive')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Rows moved per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many rows would move')
+
+    def handle(self, *args, **options):
+        try:
+            term = Term.objects.get(name=options['term'])
+        except Term.DoesNotExist:
+            raise CommandError(f'No term named "{options["term"]}"')
+        if not term.is_closed:
+            raise CommandError(f'{term} ends on {term.end_date} and is still open')
+
+        if options['dry_run']:
+            for label, live, _ in ARCHIVES:
+                self.stdout.write(f'  {label}: {live.objects.filter(term=term).count()} rows')
+            return
+
+        self.stdout.write(f'Archiving {term}...')
+        moved = archive_term(
+            term,
+            chunk_size=options['chunk_size'],
+            progress=lambda label, count: self.stdout.write(f'  {label}: {count} rows moved'),
+        )
+        summary = ', '.join(f'{count} {label}' for label, count in moved.items())
+        self.stdout.write(self.style.SUCCESS(f'✓ Archived {term}: {summary}'))
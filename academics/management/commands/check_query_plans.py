@@ -0,0 +1,67 @@
+"""
+Management command to guard the view query plans against regressions.
+Renders each hot page as an admin, a faculty member and a student, EXPLAINs
+every query it issued against the large tables and exits non-zero if any of
+them full-scans or sorts one of those tables. Run it against a database
+holding representative data; on near-empty tables the optimizer may
+legitimately prefer a scan. ``academics.tests.test_query_plans`` runs the
+same checks on generated data as part of the test suite.
+"""
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from academics.query_plans import PAGES, QueryCapture, check_queries
+from users.models import Profile
+
+
+def _sample_user(role):
+    users = User.objects.filter(is_active=True, profile__role=role, profile__is_approved=True)
+    if role == Profile.Roles.FACULTY:
+        users = users.filter(faculty_profile__isnull=False)
+    elif role == Profile.Roles.STUDENT:
+        users = users.filter(student_profile__isnull=False)
+    return users.order_by('pk').first()
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the queries issued by the main views and fail on full scans or sorts of large tables'
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('mysql', 'sqlite'):
+            raise CommandError(f'Query plan checks are not implemented for {connection.vendor}')
+
+        # Lets the test client address the site regardless of ALLOWED_HOSTS.
+        setup_test_environment()
+        try:
+            reports = []
+            checked = 0
+            # Logging in and rendering write sessions; roll all of it back afterwards.
+            with transaction.atomic():
+                for role in Profile.Roles.values:
+                    user = _sample_user(role)
+                    if user is None:
+                        self.stdout.write(self.style.WARNING(f'  ⚠ No {role.lower()} user to check pages with'))
+                        continue
+                    client = Client()
+                    client.force_login(user)
+                    for page in PAGES:
+                        capture = QueryCapture()
+                        with connection.execute_wrapper(capture):
+                            client.get(reverse(page))
+                        label = f'{page} as {role.lower()}'
+                        reports.extend(check_queries(label, capture.queries))
+                        checked += 1
+                transaction.set_rollback(True)
+        finally:
+            teardown_test_environment()
+
+        for report in reports:
+            self.stdout.write(self.style.ERROR(f'✗ {report.page}: {", ".join(report.problems)}'))
+            self.stdout.write(f'    {report.sql}')
+        if reports:
+            raise CommandError(f'{len(reports)} query plan regression(s) found')
+        self.stdout.write(self.style.SUCCESS(f'✓ Query plans for {checked} pages use indexes'))
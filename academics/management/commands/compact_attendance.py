@@ -0,0 +1,33 @@
+"""
+Management command to convert an archived term's attendance into compact
+monthly bitmaps. One way: per-day faculty and timestamps are dropped.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from academics.archive import COMPACT_CHUNK_SIZE, compact_term
+from academics.models import ArchivedAttendance, Term
+
+
+class Command(BaseCommand):
+    help = 'Compact an archived term\'s attendance into one bitmap row per student, subject and month'
+
+    def add_arguments(self, parser):
+        parser.add_argument('term', help='Name of the archived term to compact')
+        parser.add_argument('--chunk-size', type=int, default=COMPACT_CHUNK_SIZE, help='Students converted per transaction')
+
+    def handle(self, *args, **options):
+        try:
+            term = Term.objects.get(name=options['term'])
+        except Term.DoesNotExist:
+            raise CommandError(f'No term named "{options["term"]}"')
+        if not term.is_archived:
+            raise CommandError(f'{term} has not been archived; run archive_term first')
+
+        pending = ArchivedAttendance.objects.filter(term=term).count()
+        self.stdout.write(f'Compacting {pending} attendance records of {term}...')
+        converted = compact_term(
+            term,
+            chunk_size=options['chunk_size'],
+            progress=lambda count: self.stdout.write(f'  {count} records converted'),
+        )
+        self.stdout.write(self.style.SUCCESS(f'✓ Compacted {converted} attendance records of {term}'))
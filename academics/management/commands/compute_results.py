@@ -0,0 +1,67 @@
+"""
+Management command to recompute the SGPA and CGPA of a whole batch.
+Every term up to the selected one is recomputed oldest first, since each
+CGPA builds on the terms before it. Students are split into chunks that can
+be handed to several worker processes.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from academics.grading import compute_results
+from academics.models import Student, Term
+
+CHUNK_SIZE = 1000
+
+
+def _setup_worker():
+    # Spawned workers (Windows, macOS) start without Django configured.
+    django.setup()
+
+
+def _compute_chunk(student_ids, term_ids):
+    terms = Term.objects.filter(pk__in=term_ids).order_by('start_date')
+    return sum(len(compute_results(term, student_ids)) for term in terms)
+
+
+class Command(BaseCommand):
+    help = 'Recompute SGPA and CGPA for every student of a batch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('batch', help='Batch to recompute, e.g. 2022')
+        parser.add_argument('--term', help='Recompute up to this term (default: every term)')
+        parser.add_argument('--workers', type=int, default=1, help='Worker processes to spread students over')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Students per worker task')
+
+    def handle(self, *args, **options):
+        terms = Term.objects.order_by('start_date')
+        if options['term']:
+            try:
+                last = Term.objects.get(name=options['term'])
+            except Term.DoesNotExist:
+                raise CommandError(f'No term named "{options["term"]}"')
+            terms = terms.filter(start_date__lte=last.start_date)
+        term_ids = list(terms.values_list('pk', flat=True))
+        if not term_ids:
+            raise CommandError('No terms to compute results for')
+
+        student_ids = list(Student.objects.filter(batch=options['batch']).order_by('pk').values_list('pk', flat=True))
+        if not student_ids:
+            raise CommandError(f'No students in batch "{options["batch"]}"')
+        chunk_size = max(1, options['chunk_size'])
+        chunks = [student_ids[offset:offset + chunk_size] for offset in range(0, len(student_ids), chunk_size)]
+
+        self.stdout.write(
+            f'Computing results for {len(student_ids)} students over {len(term_ids)} terms '
+            f'with {options["workers"]} worker(s)...'
+        )
+        if options['workers'] <= 1:
+            computed = sum(_compute_chunk(chunk, term_ids) for chunk in chunks)
+        else:
+            # Forked workers must not share the parent's database connection.
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=options['workers'], initializer=_setup_worker) as pool:
+                computed = sum(pool.map(_compute_chunk, chunks, [term_ids] * len(chunks)))
+        self.stdout.write(self.style.SUCCESS(f'✓ Computed {computed} term results for batch {options["batch"]}'))
@@ -0,0 +1,29 @@
+"""
+Management command to create the PENDING submission rows of assignments
+published before they were created automatically, or of students enrolled
+after an assignment was published. Existing rows are left alone.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from academics.models import Assignment, Term
+from academics.submissions import create_pending_submissions
+
+
+class Command(BaseCommand):
+    help = 'Create a PENDING submission for every enrolled student of existing assignments'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--term', help='Only assignments of this term (default: every open term)')
+        parser.add_argument('--assignment', type=int, help='Only this assignment')
+
+    def handle(self, *args, **options):
+        assignments = Assignment.objects.filter(term__archived_at__isnull=True)
+        if options['term']:
+            term = Term.objects.filter(name=options['term']).first()
+            if term is None:
+                raise CommandError(f'No term named "{options["term"]}"')
+            assignments = Assignment.objects.filter(term=term)
+        if options['assignment']:
+            assignments = assignments.filter(pk=options['assignment'])
+        created = create_pending_submissions(assignments.order_by('pk').iterator())
+        self.stdout.write(self.style.SUCCESS(f'✓ Created {created} pending submissions'))
@@ -0,0 +1,108 @@
+"""
+Management command to move submission files saved under the old dated
+paths into the content-addressed blob store. Each file is hashed into the
+store, every row pointing at it is repointed at the blob, and the old file
+is removed. Safe to interrupt and re-run. --recount rebuilds the blobs'
+reference counts from the rows that point at them.
+"""
+import os
+from collections import Counter
+
+from django.core.files import File
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, Sum
+
+from academics.models import ArchivedSubmission, StoredBlob, Submission
+from academics.storage import BLOB_PREFIX, submission_storage
+
+MODELS = (Submission, ArchivedSubmission)
+
+
+def _legacy_names():
+    names = set()
+    for model in MODELS:
+        names.update(
+            model.objects.exclude(submission_file="")
+            .exclude(submission_file__isnull=True)
+            .exclude(submission_file__startswith=BLOB_PREFIX)
+            .values_list("submission_file", flat=True)
+            .distinct()
+        )
+    return sorted(names)
+
+
+def _references():
+    counts = Counter()
+    for model in MODELS:
+        rows = (
+            model.objects.filter(submission_file__startswith=BLOB_PREFIX)
+            .values("submission_file")
+            .annotate(references=Count("pk"))
+            .values_list("submission_file", "references")
+        )
+        counts.update(dict(rows))
+    return counts
+
+
+class Command(BaseCommand):
+    help = 'Move legacy submission files into the deduplicating blob store'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many files would move')
+        parser.add_argument('--recount', action='store_true', help='Rebuild blob reference counts from the rows')
+
+    def handle(self, *args, **options):
+        storage = submission_storage()
+        names = _legacy_names()
+        if options['dry_run']:
+            self.stdout.write(f'  {len(names)} legacy files to move')
+            return
+
+        moved = missing = 0
+        for name in names:
+            if not storage.exists(name):
+                missing += 1
+                self.stdout.write(self.style.WARNING(f'  ⚠ {name} is referenced but missing on disk'))
+                continue
+            with transaction.atomic():
+                with storage.open(name) as handle:
+                    blob = storage.save(name, File(handle))
+                rows = sum(model.objects.filter(submission_file=name).update(submission_file=blob) for model in MODELS)
+                # save() added one reference; every row now pointing at the blob holds one.
+                StoredBlob.objects.filter(name=blob).update(ref_count=F('ref_count') + rows - 1)
+            storage.delete(name)
+            moved += 1
+
+        if options['recount']:
+            self._recount(storage)
+
+        saved = StoredBlob.objects.filter(ref_count__gt=1).aggregate(
+            saved=Sum(F('size') * (F('ref_count') - 1))
+        )['saved'] or 0
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Moved {moved} files ({missing} missing); deduplication saves {saved / (1024 * 1024):.1f}MB'
+        ))
+
+    def _recount(self, storage):
+        references = _references()
+        fixed = 0
+        for blob in StoredBlob.objects.order_by('pk').iterator():
+            expected = references.pop(blob.name, 0)
+            # A count of 0 is a release whose file removal never ran.
+            if blob.ref_count == expected and expected:
+                continue
+            fixed += 1
+            if expected:
+                StoredBlob.objects.filter(pk=blob.pk).update(ref_count=expected)
+            else:
+                blob.delete()
+                if storage.exists(blob.name):
+                    os.remove(storage.path(blob.name))
+        for name, expected in references.items():
+            # Rows point at a blob the table lost track of; register it again.
+            if storage.exists(name):
+                digest = os.path.splitext(os.path.basename(name))[0]
+                StoredBlob.objects.create(name=name, sha256=digest, size=storage.size(name), ref_count=expected)
+                fixed += 1
+        self.stdout.write(f'  Reference counts corrected for {fixed} blobs')
@@ -0,0 +1,102 @@
+"""
+Management command to enrol students in subjects for a term.
+Students are picked by batch, section and/or semester and enrolled in the
+given subjects, or by default in every subject of their own semester.
+--from-records instead enrols every student who already has attendance or
+marks in a subject that term, which backfills terms recorded before
+enrolments existed. Enrolling twice is harmless. Newly enrolled students
+get PENDING submissions for the term's assignments already published.
+"""
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+
+from academics.models import Assignment, Attendance, Enrollment, Marks, Student, Subject, Term
+from academics.submissions import create_pending_submissions
+from dashboard.stats import invalidate_dashboards
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = 'Enrol a batch or section of students in subjects for a term'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--term', help='Term to enrol in (default: the current term)')
+        parser.add_argument('--batch', help='Only students of this batch, e.g. 2022')
+        parser.add_argument('--section', help='Only students of this section')
+        parser.add_argument('--semester', type=int, help='Only students in this semester')
+        parser.add_argument('--subject', action='append', default=[], help='Subject code; repeat for several (default: the students\' semester subjects)')
+        parser.add_argument('--from-records', action='store_true', help='Enrol from existing attendance and marks instead')
+
+    def handle(self, *args, **options):
+        if options['term']:
+            term = Term.objects.filter(name=options['term']).first()
+            if term is None:
+                raise CommandError(f'No term named "{options["term"]}"')
+        else:
+            term = Term.objects.current()
+            if term is None:
+                raise CommandError('There is no current term; pass --term')
+
+        students = Student.objects.all()
+        for field in ('batch', 'section', 'semester'):
+            if options[field] is not None:
+                students = students.filter(**{field: options[field]})
+
+        if options['from_records']:
+            pairs = self._recorded_pairs(term, students.values('pk'))
+        else:
+            if all(options[field] is None for field in ('batch', 'section', 'semester')):
+                raise CommandError('Pick students with --batch, --section and/or --semester')
+            subject_ids = None
+            if options['subject']:
+                found = dict(Subject.objects.filter(code__in=options['subject']).values_list('code', 'pk'))
+                missing = set(options['subject']) - set(found)
+                if missing:
+                    raise CommandError(f'No subjects with code {", ".join(sorted(missing))}')
+                subject_ids = list(found.values())
+            pairs = self._subject_pairs(students, subject_ids)
+
+        before = Enrollment.objects.filter(term=term).count()
+        pairs = iter(pairs)
+        while batch := list(islice(pairs, BATCH_SIZE)):
+            Enrollment.objects.bulk_create(
+                [Enrollment(student_id=student_id, subject_id=subject_id, term=term) for student_id, subject_id in batch],
+                ignore_conflicts=True,
+            )
+            # bulk_create sends no signals; retire the affected dashboards here.
+            invalidate_dashboards(
+                students={student_id for student_id, _ in batch},
+                subjects={subject_id for _, subject_id in batch},
+                admin=True,
+            )
+        created = Enrollment.objects.filter(term=term).count() - before
+        # Newly enrolled students owe the term's assignments that are already out.
+        pending = create_pending_submissions(Assignment.objects.filter(term=term).order_by('pk').iterator())
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Created {created} enrolments in {term} and {pending} pending submissions'
+        ))
+
+    def _subject_pairs(self, students, subject_ids):
+        if subject_ids:
+            for student_id in students.values_list('pk', flat=True).iterator():
+                for subject_id in subject_ids:
+                    yield student_id, subject_id
+            return
+        by_semester = {}
+        for subject_id, semester in Subject.objects.values_list('pk', 'semester'):
+            by_semester.setdefault(semester, []).append(subject_id)
+        for student_id, semester in students.values_list('pk', 'semester').iterator():
+            for subject_id in by_semester.get(semester, ()):
+                yield student_id, subject_id
+
+    def _recorded_pairs(self, term, student_ids):
+        pairs = set()
+        for model in (Attendance, Marks):
+            pairs.update(
+                model.objects.filter(term=term, student__in=student_ids)
+                .values_list('student_id', 'subject_id')
+                .distinct()
+            )
+        return sorted(pairs)
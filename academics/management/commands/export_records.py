@@ -0,0 +1,52 @@
+"""
+Management command to export attendance, marks or submissions as CSV.
+Streams rows in bounded batches, so a full-semester export keeps memory flat.
+"""
+import datetime
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from academics.exports import CHUNK_SIZE, EXPORTS, export_queryset, iter_csv
+from academics.models import Term
+
+
+def _date(value):
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f'Invalid date "{value}", expected YYYY-MM-DD')
+
+
+class Command(BaseCommand):
+    help = 'Export attendance, marks or submissions as CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(EXPORTS), help='What to export')
+        parser.add_argument('--output', '-o', help='File to write (defaults to stdout)')
+        parser.add_argument('--term', help='Only rows of this term (archived terms are read from the archive)')
+        parser.add_argument('--start', type=_date, help='First date to include (YYYY-MM-DD)')
+        parser.add_argument('--end', type=_date, help='Last date to include (YYYY-MM-DD)')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Rows fetched per query')
+
+    def handle(self, *args, **options):
+        kind = options['kind']
+        term = None
+        if options['term']:
+            term = Term.objects.filter(name=options['term']).first()
+            if term is None:
+                raise CommandError(f'No term named "{options["term"]}"')
+        queryset = export_queryset(kind, start=options['start'], end=options['end'], term=term)
+        lines = iter_csv(kind, queryset, chunk_size=options['chunk_size'])
+
+        if not options['output']:
+            for line in lines:
+                sys.stdout.write(line)
+            return
+
+        count = -1  # header line
+        with open(options['output'], 'w', encoding='utf-8', newline='') as handle:
+            for line in lines:
+                handle.write(line)
+                count += 1
+        self.stdout.write(self.style.SUCCESS(f'✓ Exported {count} {kind} rows to {options["output"]}'))
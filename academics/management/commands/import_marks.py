@@ -0,0 +1,43 @@
+"""
+Management command to import marks from a CSV file in the marks export's
+column layout. Rows are upserted in batches; failing rows are listed with
+their line numbers and do not stop the import.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from academics.imports import BATCH_SIZE, import_marks
+from academics.models import Faculty
+
+
+class Command(BaseCommand):
+    help = 'Import marks from a CSV file, updating existing marks for the same assessment'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file to import')
+        parser.add_argument('--faculty', help='Employee number; only accept this faculty member\'s subjects')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Rows upserted per transaction')
+
+    def handle(self, *args, **options):
+        faculty = None
+        if options['faculty']:
+            faculty = Faculty.objects.filter(employee_number=options['faculty']).first()
+            if faculty is None:
+                raise CommandError(f'No faculty with employee number "{options["faculty"]}"')
+
+        try:
+            handle = open(options['path'], encoding='utf-8-sig', errors='replace', newline='')
+        except OSError as exc:
+            raise CommandError(f'Cannot open {options["path"]}: {exc}')
+        with handle:
+            report = import_marks(handle, faculty=faculty, batch_size=max(1, options['batch_size']))
+
+        for line, message in report.errors:
+            self.stdout.write(self.style.ERROR(f'  ✗ line {line}: {message}'))
+        if report.truncated:
+            self.stdout.write(f'  ... and {report.failed - len(report.errors)} more failing rows')
+        summary = (
+            f'{report.created} created, {report.updated} updated, '
+            f'{report.unchanged} unchanged, {report.failed} skipped'
+        )
+        style = self.style.WARNING if report.failed else self.style.SUCCESS
+        self.stdout.write(style(f'{"⚠" if report.failed else "✓"} Imported marks: {summary}'))
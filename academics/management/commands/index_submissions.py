@@ -0,0 +1,32 @@
+"""
+Management command to fingerprint submissions for near-duplicate detection.
+Submissions are normally indexed in the background as they are saved; this
+catches up on any that were missed or whose file changed, or rebuilds the
+whole index with --rebuild.
+"""
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from academics.models import Submission
+from academics.similarity import index_submission
+
+
+class Command(BaseCommand):
+    help = 'Index submission files for near-duplicate (plagiarism) detection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--assignment', type=int, help='Only index submissions to this assignment')
+        parser.add_argument('--rebuild', action='store_true', help='Re-index submissions that are already indexed')
+
+    def handle(self, *args, **options):
+        submissions = Submission.objects.exclude(submission_file='').exclude(submission_file__isnull=True)
+        if options['assignment']:
+            submissions = submissions.filter(assignment_id=options['assignment'])
+        if not options['rebuild']:
+            submissions = submissions.exclude(fingerprint__source=F('submission_file'))
+
+        indexed = matches = 0
+        for submission_id in list(submissions.order_by('pk').values_list('pk', flat=True)):
+            matches += index_submission(submission_id, force=options['rebuild'])
+            indexed += 1
+        self.stdout.write(self.style.SUCCESS(f'✓ Indexed {indexed} submissions, {matches} near-duplicate matches recorded'))
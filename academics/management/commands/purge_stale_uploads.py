@@ -0,0 +1,27 @@
+"""
+Management command to delete chunked submission uploads that were started
+but never finished, together with their partial files under MEDIA_ROOT.
+"""
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from academics.models import UploadSession
+from academics.uploads import discard
+
+
+class Command(BaseCommand):
+    help = 'Delete unfinished submission uploads that have not received data for a while'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=24, help='Idle time after which an upload is abandoned')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - datetime.timedelta(hours=options['hours'])
+        stale = UploadSession.objects.filter(updated_at__lt=cutoff)
+        count = 0
+        for session in stale.iterator():
+            discard(session)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f'✓ Removed {count} abandoned uploads'))
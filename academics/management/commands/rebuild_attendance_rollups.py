@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from academics.rollups import rebuild_attendance_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-student, per-subject attendance rollup table from raw attendance'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding attendance rollups...')
+        count = rebuild_attendance_rollups()
+        self.stdout.write(self.style.SUCCESS(f'✓ Rebuilt {count} attendance rollups'))
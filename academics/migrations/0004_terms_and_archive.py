@@ -0,0 +1,134 @@
+# Generated by Django 5.2.11 on 2026-10-18 04:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0003_query_shape_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Term',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64, unique=True)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField()),
+                ('archived_at', models.DateTimeField(blank=True, editable=False, null=True)),
+            ],
+            options={
+                'ordering': ('-start_date',),
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedSubmission',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('submission_file', models.FileField(blank=True, null=True, upload_to='submissions/%Y/%m/%d/')),
+                ('submitted_on', models.DateField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('SUBMITTED', 'Submitted'), ('PENDING', 'Pending'), ('LATE', 'Late')], max_length=16)),
+                ('score', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('remarks', models.TextField(blank=True)),
+                ('assignment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='academics.assignment')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='academics.student')),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_submissions', to='academics.term')),
+            ],
+            options={
+                'ordering': ('assignment', 'student__registration_number'),
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedMarks',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('assessment_type', models.CharField(choices=[('IA1', 'Internal Assessment 1'), ('IA2', 'Internal Assessment 2'), ('IA3', 'Internal Assessment 3'), ('ASSIGNMENT', 'Assignment'), ('LAB', 'Lab')], max_length=16)),
+                ('score', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('max_score', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('recorded_at', models.DateTimeField()),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='academics.student')),
+                ('subject', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='academics.subject')),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_marks', to='academics.term')),
+            ],
+            options={
+                'verbose_name_plural': 'Archived marks',
+                'ordering': ('-recorded_at',),
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedAttendance',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('date', models.DateField()),
+                ('status', models.CharField(choices=[('P', 'Present'), ('A', 'Absent')], max_length=1)),
+                ('created_at', models.DateTimeField()),
+                ('faculty', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='academics.faculty')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='academics.student')),
+                ('subject', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='academics.subject')),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_attendance', to='academics.term')),
+            ],
+            options={
+                'verbose_name_plural': 'Archived attendance',
+                'ordering': ('-date', 'student__registration_number'),
+            },
+        ),
+        migrations.AddField(
+            model_name='assignment',
+            name='term',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='assignments', to='academics.term'),
+        ),
+        migrations.AddField(
+            model_name='attendance',
+            name='term',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='attendance_records', to='academics.term'),
+        ),
+        migrations.AddField(
+            model_name='marks',
+            name='term',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='marks', to='academics.term'),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='term',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='submissions', to='academics.term'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['term', 'date', 'created_at'], name='attendance_term_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='marks',
+            index=models.Index(fields=['term', 'recorded_at'], name='marks_term_recorded_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['term', 'assignment'], name='submission_term_asg_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedsubmission',
+            index=models.Index(fields=['term', 'assignment'], name='arch_submission_term_asg_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedsubmission',
+            index=models.Index(fields=['student', 'assignment'], name='arch_submission_stu_asg_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedmarks',
+            index=models.Index(fields=['term', 'recorded_at'], name='arch_marks_term_recorded_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedmarks',
+            index=models.Index(fields=['student', 'recorded_at'], name='arch_marks_stu_recorded_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedattendance',
+            index=models.Index(fields=['term', 'date', 'created_at'], name='arch_attendance_term_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedattendance',
+            index=models.Index(fields=['student', 'date'], name='arch_attendance_stu_date_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.11 on 2026-10-18 04:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0004_terms_and_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='term',
+            name='compacted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name='AttendanceMonth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month')),
+                ('held_days', models.PositiveIntegerField(default=0)),
+                ('present_days', models.PositiveIntegerField(default=0)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='academics.student')),
+                ('subject', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='academics.subject')),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='attendance_months', to='academics.term')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['term', 'month'], name='attendance_month_term_idx')],
+                'unique_together': {('student', 'subject', 'term', 'month')},
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.11 on 2026-10-18 04:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0005_attendance_months'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TermResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('credits', models.PositiveSmallIntegerField(default=0)),
+                ('credits_earned', models.PositiveSmallIntegerField(default=0)),
+                ('credit_points', models.DecimalField(decimal_places=2, default=0, max_digits=7)),
+                ('sgpa', models.DecimalField(blank=True, decimal_places=2, max_digits=4, null=True)),
+                ('cgpa', models.DecimalField(blank=True, decimal_places=2, max_digits=4, null=True)),
+                ('grades', models.JSONField(blank=True, default=list)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='term_results', to='academics.student')),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='results', to='academics.term')),
+            ],
+            options={
+                'unique_together': {('student', 'term')},
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.11 on 2026-10-18 04:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0006_term_results'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MarksAudit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mark_id', models.BigIntegerField()),
+                ('action', models.CharField(choices=[('UPDATE', 'Updated'), ('DELETE', 'Deleted')], max_length=8)),
+                ('assessment_type', models.CharField(choices=[('IA1', 'Internal Assessment 1'), ('IA2', 'Internal Assessment 2'), ('IA3', 'Internal Assessment 3'), ('ASSIGNMENT', 'Assignment'), ('LAB', 'Lab')], max_length=16)),
+                ('score', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('max_score', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('new_score', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('new_max_score', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('changed_at', models.DateTimeField()),
+                ('changed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='academics.student')),
+                ('subject', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='academics.subject')),
+            ],
+            options={
+                'verbose_name_plural': 'Marks audit',
+                'ordering': ('-changed_at',),
+                'indexes': [models.Index(fields=['mark_id', 'changed_at'], name='marks_audit_mark_changed_idx'), models.Index(fields=['student', 'changed_at'], name='marks_audit_stu_changed_idx')],
+            },
+        ),
+    ]
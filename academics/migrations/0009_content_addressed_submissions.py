@@ -0,0 +1,35 @@
+# Generated by Django 5.2.11 on 2026-10-18 04:39
+
+import academics.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0008_upload_sessions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('sha256', models.CharField(db_index=True, max_length=64)),
+                ('size', models.PositiveBigIntegerField()),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='archivedsubmission',
+            name='submission_file',
+            field=models.FileField(blank=True, null=True, storage=academics.storage.submission_storage, upload_to='submissions/%Y/%m/%d/'),
+        ),
+        migrations.AlterField(
+            model_name='submission',
+            name='submission_file',
+            field=models.FileField(blank=True, help_text='Upload your assignment file (PDF, DOC, ZIP, etc.)', null=True, storage=academics.storage.submission_storage, upload_to='submissions/%Y/%m/%d/'),
+        ),
+    ]
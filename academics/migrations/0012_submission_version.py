@@ -0,0 +1,18 @@
+# Generated by Django 5.2.11 on 2026-10-18 04:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0011_enrollment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='submission',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.11 on 2026-10-18 05:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0013_student_faculty_created_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='marksaudit',
+            name='student',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='academics.student'),
+        ),
+        migrations.AlterField(
+            model_name='marksaudit',
+            name='subject',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='academics.subject'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.11 on 2026-10-18 05:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0014_marks_audit_keep_deleted_refs'),
+    ]
+
+    operations = [
+        # Added first: on MySQL the old index may be the one backing the term foreign key.
+        migrations.AddIndex(
+            model_name='attendancemonth',
+            index=models.Index(fields=['term', '-month', 'student'], name='attendance_month_list_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='attendancemonth',
+            name='attendance_month_term_idx',
+        ),
+    ]
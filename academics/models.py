@@ -1,8 +1,17 @@
+import datetime
+import uuid
+from dataclasses import dataclass
+
 from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models.functions import Cast, Round
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from .bitmaps import BitCount, FULL_MONTH, iter_days, month_of, window_mask
+from .storage import submission_storage
+
 
 class Student(models.Model):
 	user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="student_profile")
@@ -12,6 +21,14 @@ class Student(models.Model):
 	section = models.CharField(max_length=8, blank=True)
 	created_at = models.DateTimeField(auto_now_add=True)
 
+	class Meta:
+		indexes = [
+			# Roster lookup: one section of one semester.
+			models.Index(fields=["section", "semester"], name="student_section_sem_idx"),
+			# Newest-first paging of the admin dashboard's student table.
+			models.Index(fields=["created_at"], name="student_created_idx"),
+		]
+
 	def __str__(self) -> str:
 		return f"{self.registration_number} - {self.user.get_full_name() or self.user.username}"
 
@@ -43,6 +60,10 @@ class Faculty(models.Model):
 
 	class Meta:
 		verbose_name_plural = "Faculties"
+		indexes = [
+			# Newest-first paging of the admin dashboard's faculty table.
+			models.Index(fields=["created_at"], name="faculty_created_idx"),
+		]
 
 	def __str__(self) -> str:
 		return f"{self.employee_number} - {self.user.get_full_name() or self.user.username}"
@@ -61,6 +82,145 @@ class Subject(models.Model):
 		return f"{self.code} - {self.name}"
 
 
+class TermQuerySet(models.QuerySet):
+	def open(self):
+		return self.filter(archived_at__isnull=True)
+
+	def containing(self, date):
+		"""The term whose ``[start_date, end_date]`` includes ``date``, or ``None``."""
+		return self.filter(start_date__lte=date, end_date__gte=date).order_by("-start_date").first()
+
+	def current(self):
+		"""The term running today, else the most recently started one."""
+		today = timezone.localdate()
+		return self.containing(today) or self.filter(start_date__lte=today).order_by("-start_date").first()
+
+
+class Term(models.Model):
+	"""An academic term. Attendance, marks and submissions belong to one and
+	move to the archive tables once it is closed and archived."""
+	name = models.CharField(max_length=64, unique=True)
+	start_date = models.DateField()
+	end_date = models.DateField()
+	archived_at = models.DateTimeField(null=True, blank=True, editable=False)
+	compacted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+	objects = TermQuerySet.as_manager()
+
+	class Meta:
+		ordering = ("-start_date",)
+
+	def __str__(self) -> str:
+		return self.name
+
+	def clean(self):
+		if self.start_date and self.end_date and self.start_date > self.end_date:
+			raise ValidationError({"end_date": _("A term cannot end before it starts.")})
+
+	@property
+	def is_closed(self) -> bool:
+		return self.end_date < timezone.localdate()
+
+	@property
+	def is_archived(self) -> bool:
+		return self.archived_at is not None
+
+	@property
+	def is_compacted(self) -> bool:
+		return self.compacted_at is not None
+
+
+class EnrollmentQuerySet(models.QuerySet):
+	def current(self):
+		"""Enrolments in the current term, or none when there is no term yet."""
+		term = Term.objects.current()
+		return self.filter(term=term) if term else self.none()
+
+
+class Enrollment(models.Model):
+	"""A student taking a subject in a term.
+
+	Rosters, "my subjects" and per-subject student counts read this table
+	rather than inferring enrolment from attendance or marks, so a student
+	is enrolled before their first class is recorded.
+	"""
+	student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name="enrollments")
+	subject = models.ForeignKey(Subject, on_delete=models.CASCADE, related_name="enrollments")
+	term = models.ForeignKey(Term, on_delete=models.PROTECT, related_name="enrollments")
+	enrolled_at = models.DateTimeField(auto_now_add=True)
+
+	objects = EnrollmentQuerySet.as_manager()
+
+	class Meta:
+		# Leads with the student: a student's subjects in a term.
+		unique_together = ("student", "subject", "term")
+		indexes = [
+			# A subject's roster and head count in a term, answered from the index alone.
+			models.Index(fields=["subject", "term", "student"], name="enrollment_subject_term_idx"),
+		]
+
+	def __str__(self) -> str:
+		return f"{self.student_id} in {self.subject_id} ({self.term_id})"
+
+
+def attendance_percentage(present="present", total="total"):
+	"""SQL expression for ``present / total * 100`` rounded to two places."""
+	return Round(Cast(present, models.FloatField()) * 100 / models.F(total), 2)
+
+
+class AttendanceQuerySet(models.QuerySet):
+	"""Attendance aggregations computed by the database in a single GROUP BY each."""
+
+	def within(self, start=None, end=None):
+		"""Restrict to records dated in the inclusive ``[start, end]`` window."""
+		if start:
+			self = self.filter(date__gte=start)
+		if end:
+			self = self.filter(date__lte=end)
+		return self
+
+	def taken_by(self, faculty):
+		return self.filter(faculty=faculty)
+
+	def with_related(self):
+		return self.select_related("student__user", "subject", "faculty__user")
+
+	def _counts(self, *fields):
+		return (
+			self.order_by()
+			.values(*fields)
+			.annotate(
+				present=models.Count("id", filter=models.Q(status=self.model.Status.PRESENT)),
+				total=models.Count("id"),
+			)
+		)
+
+	def by_subject(self):
+		return self._counts("subject_id", "subject__code", "subject__name").order_by("subject__code")
+
+	def by_student(self):
+		return self._counts(
+			"student_id",
+			"student__registration_number",
+			"student__user__username",
+			"student__user__first_name",
+			"student__user__last_name",
+		).order_by("student__registration_number")
+
+	def by_student_subject(self):
+		return self._counts("student_id", "subject_id").annotate(last_date=models.Max("date"))
+
+	def by_date(self):
+		return self._counts("date").order_by("date")
+
+	def with_percentages(self):
+		"""Annotate grouped rows from the ``by_*`` methods with absent count and percentage."""
+		return self.annotate(
+			absent=models.F("total") - models.F("present"),
+			percentage=attendance_percentage(),
+		)
+
+
 class Attendance(models.Model):
 	class Status(models.TextChoices):
 		PRESENT = "P", _("Present")
@@ -71,16 +231,61 @@ class Attendance(models.Model):
 	faculty = models.ForeignKey(Faculty, on_delete=models.SET_NULL, null=True, related_name="attendance_taken")
 	date = models.DateField(default=timezone.now)
 	status = models.CharField(max_length=1, choices=Status.choices, default=Status.PRESENT)
+	term = models.ForeignKey(Term, on_delete=models.PROTECT, null=True, blank=True, related_name="attendance_records")
 	created_at = models.DateTimeField(auto_now_add=True)
 
+	objects = AttendanceQuerySet.as_manager()
+
 	class Meta:
 		unique_together = ("student", "subject", "date")
 		ordering = ("-date", "student__registration_number")
+		# Listings read these newest first with a backward index scan; the
+		# primary key is the implicit last column, so "-pk" tie-breaks stay sorted.
+		indexes = [
+			models.Index(fields=["date", "created_at"], name="attendance_date_created_idx"),
+			models.Index(fields=["term", "date", "created_at"], name="attendance_term_date_idx"),
+			# Faculty-scoped listings and the faculty dashboard's recent records.
+			models.Index(fields=["faculty", "date", "created_at"], name="attendance_fac_date_idx"),
+			models.Index(fields=["faculty", "created_at"], name="attendance_fac_created_idx"),
+			# Student-scoped listings ordered by date. Nothing filters on
+			# (student, status): present counts are read from AttendanceRollup,
+			# which is refreshed over the (student, subject, date) unique index.
+			models.Index(fields=["student", "date", "created_at"], name="attendance_stu_date_idx"),
+		]
 
 	def __str__(self) -> str:
 		return f"{self.student} - {self.subject} on {self.date}: {self.status}"
 
 
+class AttendanceRollup(models.Model):
+	"""Denormalized per-student, per-subject attendance counts.
+
+	Kept current by the ``Attendance`` signal handlers in ``academics.signals``
+	and rebuilt from scratch by ``manage.py rebuild_attendance_rollups``.
+	"""
+
+	student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name="attendance_rollups")
+	subject = models.ForeignKey(Subject, on_delete=models.CASCADE, related_name="attendance_rollups")
+	present_count = models.PositiveIntegerField(default=0)
+	total_count = models.PositiveIntegerField(default=0)
+	last_date = models.DateField(null=True, blank=True)
+	updated_at = models.DateTimeField(auto_now=True)
+
+	class Meta:
+		unique_together = ("student", "subject")
+
+	def __str__(self) -> str:
+		return f"{self.student_id}/{self.subject_id}: {self.present_count}/{self.total_count}"
+
+	@property
+	def absent_count(self) -> int:
+		return self.total_count - self.present_count
+
+	@property
+	def percentage(self) -> float:
+		return (self.present_count / self.total_count * 100) if self.total_count else 0
+
+
 class Marks(models.Model):
 	class AssessmentType(models.TextChoices):
 		IA1 = "IA1", _("Internal Assessment 1")
@@ -94,15 +299,87 @@ class Marks(models.Model):
 	assessment_type = models.CharField(max_length=16, choices=AssessmentType.choices)
 	score = models.DecimalField(max_digits=5, decimal_places=2)
 	max_score = models.DecimalField(max_digits=5, decimal_places=2)
+	term = models.ForeignKey(Term, on_delete=models.PROTECT, null=True, blank=True, related_name="marks")
 	recorded_at = models.DateTimeField(auto_now_add=True)
 
 	class Meta:
 		ordering = ("-recorded_at",)
+		indexes = [
+			models.Index(fields=["recorded_at"], name="marks_recorded_idx"),
+			models.Index(fields=["term", "recorded_at"], name="marks_term_recorded_idx"),
+			# Faculty dashboard and faculty-scoped listings: marks per subject, newest first.
+			models.Index(fields=["subject", "recorded_at"], name="marks_subject_recorded_idx"),
+			# Student dashboard and student-scoped listings.
+			models.Index(fields=["student", "recorded_at"], name="marks_student_recorded_idx"),
+		]
 
 	def __str__(self) -> str:
 		return f"{self.student} - {self.subject} ({self.assessment_type})"
 
 
+class MarksAudit(models.Model):
+	"""Append-only history of edits to and deletions of marks.
+
+	Each row keeps the mark as it was before the change, plus the new score
+	for edits. It holds the mark's ID rather than a foreign key, so the
+	history outlives a deleted mark; the student and subject references are
+	left unconstrained for the same reason. Rows are queued in-process and
+	written in batches by ``academics.audit``.
+	"""
+	class Action(models.TextChoices):
+		UPDATE = "UPDATE", _("Updated")
+		DELETE = "DELETE", _("Deleted")
+
+	mark_id = models.BigIntegerField()
+	action = models.CharField(max_length=8, choices=Action.choices)
+	student = models.ForeignKey(Student, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+")
+	subject = models.ForeignKey(Subject, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+")
+	assessment_type = models.CharField(max_length=16, choices=Marks.AssessmentType.choices)
+	score = models.DecimalField(max_digits=5, decimal_places=2)
+	max_score = models.DecimalField(max_digits=5, decimal_places=2)
+	new_score = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+	new_max_score = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+	changed_by = models.ForeignKey(
+		settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+	)
+	changed_at = models.DateTimeField()
+
+	class Meta:
+		ordering = ("-changed_at",)
+		verbose_name_plural = "Marks audit"
+		indexes = [
+			models.Index(fields=["mark_id", "changed_at"], name="marks_audit_mark_changed_idx"),
+			models.Index(fields=["student", "changed_at"], name="marks_audit_stu_changed_idx"),
+		]
+
+	def __str__(self) -> str:
+		return f"{self.get_action_display()} mark {self.mark_id} at {self.changed_at:%Y-%m-%d %H:%M}"
+
+
+class TermResult(models.Model):
+	"""A student's SGPA and CGPA for one term, cached by ``academics.grading``.
+
+	Removed, together with the student's later terms, whenever one of the
+	student's marks in the term changes, and recomputed on the next read.
+	"""
+	student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name="term_results")
+	term = models.ForeignKey(Term, on_delete=models.CASCADE, related_name="results")
+	credits = models.PositiveSmallIntegerField(default=0)
+	credits_earned = models.PositiveSmallIntegerField(default=0)
+	credit_points = models.DecimalField(max_digits=7, decimal_places=2, default=0)
+	sgpa = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
+	cgpa = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
+	# [{"subject": code, "credits": n, "percentage": p, "grade": letter, "points": n}, ...]
+	grades = models.JSONField(default=list, blank=True)
+	computed_at = models.DateTimeField(auto_now=True)
+
+	class Meta:
+		unique_together = ("student", "term")
+
+	def __str__(self) -> str:
+		return f"{self.student_id} {self.term_id}: SGPA {self.sgpa} CGPA {self.cgpa}"
+
+
 class Assignment(models.Model):
 	subject = models.ForeignKey(Subject, on_delete=models.CASCADE, related_name="assignments")
 	faculty = models.ForeignKey(Faculty, on_delete=models.SET_NULL, null=True, related_name="assignments")
@@ -110,16 +387,48 @@ class Assignment(models.Model):
 	description = models.TextField(blank=True)
 	due_date = models.DateField()
 	max_score = models.DecimalField(max_digits=5, decimal_places=2)
+	term = models.ForeignKey(Term, on_delete=models.PROTECT, null=True, blank=True, related_name="assignments")
 	created_at = models.DateTimeField(auto_now_add=True)
 
 	class Meta:
 		ordering = ("-due_date",)
+		indexes = [
+			# Faculty dashboard: a faculty member's assignments, newest first.
+			models.Index(fields=["faculty", "created_at"], name="assignment_fac_created_idx"),
+			models.Index(fields=["subject", "due_date"], name="assignment_subject_due_idx"),
+		]
 
 	def __str__(self) -> str:
 		return f"{self.subject}: {self.title}"
 
 
+class StoredBlob(models.Model):
+	"""One file kept by ``ContentAddressedStorage`` and how many rows point at it."""
+	name = models.CharField(max_length=255, unique=True)
+	sha256 = models.CharField(max_length=64, db_index=True)
+	size = models.PositiveBigIntegerField()
+	ref_count = models.PositiveIntegerField(default=0)
+	created_at = models.DateTimeField(auto_now_add=True)
+
+	def __str__(self) -> str:
+		return f"{self.name} ({self.ref_count} references)"
+
+
+class SubmissionQuerySet(models.QuerySet):
+	def pending(self):
+		"""Rows created when the assignment was published and not handed in yet."""
+		return self.filter(status=Submission.SubmissionStatus.PENDING)
+
+	def handed_in(self):
+		return self.exclude(status=Submission.SubmissionStatus.PENDING)
+
+
 class Submission(models.Model):
+	"""A student's work on an assignment.
+
+	Publishing an assignment creates a ``PENDING`` row for every enrolled
+	student; handing in turns that row into ``SUBMITTED`` or ``LATE``.
+	"""
 	class SubmissionStatus(models.TextChoices):
 		SUBMITTED = "SUBMITTED", _("Submitted")
 		PENDING = "PENDING", _("Pending")
@@ -127,8 +436,10 @@ class Submission(models.Model):
 
 	assignment = models.ForeignKey(Assignment, on_delete=models.CASCADE, related_name="submissions")
 	student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name="submissions")
+	# Stored once per distinct content; see academics.storage.
 	submission_file = models.FileField(
 		upload_to="submissions/%Y/%m/%d/", 
+		storage=submission_storage,
 		null=True, 
 		blank=True,
 		help_text="Upload your assignment file (PDF, DOC, ZIP, etc.)"
@@ -137,10 +448,277 @@ class Submission(models.Model):
 	status = models.CharField(max_length=16, choices=SubmissionStatus.choices, default=SubmissionStatus.PENDING)
 	score = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
 	remarks = models.TextField(blank=True)
+	# Copied from the assignment so a term's submissions can be scoped and archived without a join.
+	term = models.ForeignKey(Term, on_delete=models.PROTECT, null=True, blank=True, related_name="submissions")
+	# Bumped by every grading save, so the grading grid can tell when a row changed under it.
+	version = models.PositiveIntegerField(default=0, editable=False)
+
+	objects = SubmissionQuerySet.as_manager()
 
 	class Meta:
 		unique_together = ("assignment", "student")
 		ordering = ("assignment", "student__registration_number")
+		indexes = [
+			# Outstanding and to-grade counts per assignment.
+			models.Index(fields=["assignment", "status"], name="submission_asg_status_idx"),
+			models.Index(fields=["term", "assignment"], name="submission_term_asg_idx"),
+			# Student-scoped listings and the student dashboard.
+			models.Index(fields=["student", "assignment"], name="submission_stu_asg_idx"),
+			models.Index(fields=["student", "submitted_on"], name="submission_stu_submitted_idx"),
+		]
+
+	def __str__(self) -> str:
+		return f"{self.assignment} - {self.student} ({self.status})"
+
+
+class UploadSession(models.Model):
+	"""A submission file arriving in chunks through ``academics.uploads``.
+
+	Bytes received so far sit in a partial file under ``MEDIA_ROOT``; this row
+	tracks how many there are and their running CRC-32, so any worker can take
+	the next chunk and a client can resume after a dropped connection.
+	"""
+	id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+	assignment = models.ForeignKey(Assignment, on_delete=models.CASCADE, related_name="upload_sessions")
+	student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name="upload_sessions")
+	filename = models.CharField(max_length=255)
+	size = models.PositiveBigIntegerField()
+	received = models.PositiveBigIntegerField(default=0)
+	crc32 = models.PositiveBigIntegerField(default=0)
+	# Optional checksum of the whole file declared by the client, verified at finalize.
+	expected_crc32 = models.PositiveBigIntegerField(null=True, blank=True)
+	created_at = models.DateTimeField(auto_now_add=True)
+	updated_at = models.DateTimeField(auto_now=True)
+
+	class Meta:
+		unique_together = ("assignment", "student")
+
+	def __str__(self) -> str:
+		return f"{self.filename} ({self.received}/{self.size} bytes) for {self.assignment_id}"
+
+
+class SubmissionFingerprint(models.Model):
+	"""MinHash signature of a submission's text, kept by ``academics.similarity``."""
+	submission = models.OneToOneField(Submission, on_delete=models.CASCADE, related_name="fingerprint")
+	# The file the signature was taken from; a different name means the content changed.
+	source = models.CharField(max_length=255)
+	# Packed unsigned 64-bit minimums, empty when no text could be extracted.
+	signature = models.BinaryField(blank=True)
+	shingles = models.PositiveIntegerField(default=0)
+	indexed_at = models.DateTimeField(auto_now=True)
+
+	def __str__(self) -> str:
+		return f"Fingerprint of {self.submission_id} ({self.shingles} shingles)"
+
+
+class SimilarityBand(models.Model):
+	"""One LSH band of a fingerprint; submissions sharing a bucket are near-duplicate candidates."""
+	submission = models.ForeignKey(Submission, on_delete=models.CASCADE, related_name="+")
+	# Hash of the band's number and values, so a lookup needs only this column.
+	bucket = models.BigIntegerField()
+
+	class Meta:
+		indexes = [
+			models.Index(fields=["bucket"], name="similarity_band_bucket_idx"),
+		]
+
+
+class SimilarityMatch(models.Model):
+	"""A likely near-duplicate of a submission, with the estimated Jaccard similarity of their text."""
+	submission = models.ForeignKey(Submission, on_delete=models.CASCADE, related_name="near_duplicates")
+	match = models.ForeignKey(Submission, on_delete=models.CASCADE, related_name="+")
+	similarity = models.FloatField()
+
+	class Meta:
+		unique_together = ("submission", "match")
+		indexes = [
+			models.Index(fields=["submission", "-similarity"], name="similarity_match_rank_idx"),
+		]
+
+	def __str__(self) -> str:
+		return f"{self.submission_id} ~ {self.match_id} ({self.similarity:.0%})"
+
+
+# Archive tables. ``archive_term`` moves a closed term's rows here with their
+# primary keys intact, keeping the tables above about one term in size. The
+# field names match the live models so the same scoping, listing and export
+# code reads either; nothing writes to these outside that command.
+
+class ArchivedAttendance(models.Model):
+	Status = Attendance.Status
+
+	id = models.BigIntegerField(primary_key=True)
+	student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name="+")
+	subject = models.ForeignKey(Subject, on_delete=models.CASCADE, related_name="+")
+	faculty = models.ForeignKey(Faculty, on_delete=models.SET_NULL, null=True, related_name="+")
+	date = models.DateField()
+	status = models.CharField(max_length=1, choices=Status.choices)
+	term = models.ForeignKey(Term, on_delete=models.PROTECT, related_name="archived_attendance")
+	created_at = models.DateTimeField()
+
+	objects = AttendanceQuerySet.as_manager()
+
+	class Meta:
+		ordering = ("-date", "student__registration_number")
+		verbose_name_plural = "Archived attendance"
+		indexes = [
+			models.Index(fields=["term", "date", "created_at"], name="arch_attendance_term_date_idx"),
+			models.Index(fields=["student", "date"], name="arch_attendance_stu_date_idx"),
+		]
+
+	def __str__(self) -> str:
+		return f"{self.student} - {self.subject} on {self.date}: {self.status}"
+
+
+class AttendanceMonthQuerySet(AttendanceQuerySet):
+	"""The ``AttendanceQuerySet`` API over compacted months, counting with popcounts."""
+
+	def within(self, start=None, end=None):
+		"""Restrict to months overlapping the window and mask out the days outside it."""
+		if not (start or end):
+			return self
+		if start:
+			self = self.filter(month__gte=month_of(start))
+		if end:
+			self = self.filter(month__lte=month_of(end))
+		boundaries = {month_of(date) for date in (start, end) if date}
+		mask = models.Case(
+			*[models.When(month=month, then=models.Value(window_mask(month, start, end))) for month in boundaries],
+			default=models.Value(FULL_MONTH),
+		)
+		return self.annotate(
+			window_held=models.F("held_days").bitand(mask),
+			window_present=models.F("present_days").bitand(mask),
+		)
+
+	def taken_by(self, faculty):
+		# Months keep no per-day faculty; attribute them to the subject's.
+		return self.filter(subject__faculty=faculty)
+
+	def with_related(self):
+		return self.select_related("student__user", "subject")
+
+	def by_date(self):
+		"""Per-day counts like ``AttendanceQuerySet.by_date()``, expanded from the bitmaps in Python."""
+		counts = {}
+		for month in self.only("month", "held_days", "present_days"):
+			held = getattr(month, "window_held", month.held_days)
+			present = getattr(month, "window_present", month.present_days)
+			for date, attended in iter_days(month.month, held, present):
+				row = counts.setdefault(date, {"date": date, "present": 0, "total": 0})
+				row["total"] += 1
+				row["present"] += attended
+		return [counts[date] for date in sorted(counts)]
+
+	def _counts(self, *fields):
+		windowed = "window_held" in self.query.annotations
+		held = models.F("window_held" if windowed else "held_days")
+		present = models.F("window_present" if windowed else "present_days")
+		return (
+			self.order_by()
+			.values(*fields)
+			.annotate(present=models.Sum(BitCount(present)), total=models.Sum(BitCount(held)))
+		)
+
+
+@dataclass(frozen=True)
+class AttendanceDay:
+	"""One logical attendance record read back from an ``AttendanceMonth``."""
+	student: Student
+	subject: Subject
+	date: datetime.date
+	status: str
+
+	# Not kept in the compact form.
+	pk = None
+	faculty = None
+	created_at = None
+
+	def get_status_display(self):
+		return Attendance.Status(self.status).label
+
+
+class AttendanceMonth(models.Model):
+	"""Compact attendance history: one row per student, subject and month.
+
+	Bit ``day - 1`` of ``held_days`` marks a class held that day and the same
+	bit of ``present_days`` the student's presence. ``manage.py
+	compact_attendance`` converts an archived term's ``ArchivedAttendance``
+	rows into these, one way, and ``days()`` reads the daily records back.
+	"""
+	student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name="+")
+	subject = models.ForeignKey(Subject, on_delete=models.CASCADE, related_name="+")
+	term = models.ForeignKey(Term, on_delete=models.PROTECT, related_name="attendance_months")
+	month = models.DateField(help_text="First day of the month")
+	held_days = models.PositiveIntegerField(default=0)
+	present_days = models.PositiveIntegerField(default=0)
+
+	objects = AttendanceMonthQuerySet.as_manager()
+
+	class Meta:
+		unique_together = ("student", "subject", "term", "month")
+		indexes = [
+			# Matches the listing's keyset order, newest month first, then student.
+			models.Index(fields=["term", "-month", "student"], name="attendance_month_list_idx"),
+		]
+
+	def __str__(self) -> str:
+		return f"{self.student_id}/{self.subject_id} {self.month:%Y-%m}: {self.present_days:b}/{self.held_days:b}"
+
+	def days(self):
+		"""``AttendanceDay`` records for the month, latest first, limited to any ``within()`` window."""
+		held = getattr(self, "window_held", self.held_days)
+		present = getattr(self, "window_present", self.present_days)
+		for date, attended in iter_days(self.month, held, present):
+			status = Attendance.Status.PRESENT if attended else Attendance.Status.ABSENT
+			yield AttendanceDay(self.student, self.subject, date, status)
+
+
+class ArchivedMarks(models.Model):
+	AssessmentType = Marks.AssessmentType
+
+	id = models.BigIntegerField(primary_key=True)
+	student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name="+")
+	subject = models.ForeignKey(Subject, on_delete=models.CASCADE, related_name="+")
+	assessment_type = models.CharField(max_length=16, choices=AssessmentType.choices)
+	score = models.DecimalField(max_digits=5, decimal_places=2)
+	max_score = models.DecimalField(max_digits=5, decimal_places=2)
+	term = models.ForeignKey(Term, on_delete=models.PROTECT, related_name="archived_marks")
+	recorded_at = models.DateTimeField()
+
+	class Meta:
+		ordering = ("-recorded_at",)
+		verbose_name_plural = "Archived marks"
+		indexes = [
+			models.Index(fields=["term", "recorded_at"], name="arch_marks_term_recorded_idx"),
+			models.Index(fields=["student", "recorded_at"], name="arch_marks_stu_recorded_idx"),
+		]
+
+	def __str__(self) -> str:
+		return f"{self.student} - {self.subject} ({self.assessment_type})"
+
+
+class ArchivedSubmission(models.Model):
+	SubmissionStatus = Submission.SubmissionStatus
+
+	id = models.BigIntegerField(primary_key=True)
+	assignment = models.ForeignKey(Assignment, on_delete=models.CASCADE, related_name="+")
+	student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name="+")
+	submission_file = models.FileField(
+		upload_to="submissions/%Y/%m/%d/", storage=submission_storage, null=True, blank=True
+	)
+	submitted_on = models.DateField(null=True, blank=True)
+	status = models.CharField(max_length=16, choices=SubmissionStatus.choices)
+	score = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+	remarks = models.TextField(blank=True)
+	term = models.ForeignKey(Term, on_delete=models.PROTECT, related_name="archived_submissions")
+
+	class Meta:
+		ordering = ("assignment", "student__registration_number")
+		indexes = [
+			models.Index(fields=["term", "assignment"], name="arch_submission_term_asg_idx"),
+			models.Index(fields=["student", "assignment"], name="arch_submission_stu_asg_idx"),
+		]
 
 	def __str__(self) -> str:
 		return f"{self.assignment} - {self.student} ({self.status})"
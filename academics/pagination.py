@@ -0,0 +1,139 @@
+"""
+Keyset (cursor) pagination for the large list views.
+
+Instead of ``OFFSET`` the next page is addressed by the ordering values of the
+last row on the current one, so fetching page 1,000 costs the same index
+range scan as page 1 and never counts the whole table.
+"""
+import base64
+import json
+from operator import attrgetter
+
+from django.db.models import Q
+from django.http import QueryDict
+
+DEFAULT_PER_PAGE = 50
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _encode(values, direction):
+    payload = json.dumps({"v": values, "d": direction}, default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return payload["v"], payload["d"]
+    except (ValueError, KeyError, TypeError) as exc:
+        raise InvalidCursor(cursor) from exc
+
+
+class KeysetPage:
+    """One page of results plus the cursors needed to move either way."""
+
+    def __init__(self, object_list, next_cursor, previous_cursor, query_params):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self._query_params = query_params
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def _querystring(self, cursor):
+        params = self._query_params.copy()
+        params.pop("cursor", None)
+        if cursor:
+            params["cursor"] = cursor
+        return params.urlencode()
+
+    @property
+    def next_querystring(self):
+        return self._querystring(self.next_cursor)
+
+    @property
+    def previous_querystring(self):
+        return self._querystring(self.previous_cursor)
+
+    @property
+    def first_querystring(self):
+        return self._querystring(None)
+
+
+class KeysetPaginator:
+    """
+    Paginate ``queryset`` by ``ordering``, which must end in a unique field
+    (normally ``pk``) so that every row has a distinct position.
+    """
+
+    def __init__(self, queryset, ordering, per_page=DEFAULT_PER_PAGE):
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        self.per_page = per_page
+
+    def _fields(self, reverse=False):
+        for field in self.ordering:
+            descending = field.startswith("-")
+            yield field.lstrip("-"), descending != reverse
+
+    def _seek(self, values, reverse=False):
+        """Q selecting rows strictly after ``values`` in (optionally reversed) ordering."""
+        condition = Q()
+        equal = Q()
+        for (name, descending), value in zip(self._fields(reverse), values):
+            lookup = "lt" if descending else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def _values_of(self, obj):
+        return [attrgetter(name.replace("__", "."))(obj) for name, _ in self._fields()]
+
+    def page(self, cursor=None, query_params=None):
+        query_params = query_params if query_params is not None else QueryDict()
+        direction = "next"
+        queryset = self.queryset
+        if cursor:
+            values, direction = _decode(cursor)
+            if not isinstance(values, list) or len(values) != len(self.ordering) or direction not in ("next", "prev"):
+                raise InvalidCursor(cursor)
+            queryset = queryset.filter(self._seek(values, reverse=direction == "prev"))
+
+        if direction == "prev":
+            reversed_ordering = [f"-{name}" if descending else name for name, descending in self._fields(reverse=True)]
+            rows = list(queryset.order_by(*reversed_ordering)[: self.per_page + 1])
+            has_more = len(rows) > self.per_page
+            rows = rows[: self.per_page][::-1]
+            has_before, has_after = has_more, True
+        else:
+            rows = list(queryset.order_by(*self.ordering)[: self.per_page + 1])
+            has_more = len(rows) > self.per_page
+            rows = rows[: self.per_page]
+            has_before, has_after = bool(cursor), has_more
+
+        next_cursor = previous_cursor = None
+        if rows and has_after:
+            next_cursor = _encode(self._values_of(rows[-1]), "next")
+        if rows and has_before:
+            previous_cursor = _encode(self._values_of(rows[0]), "prev")
+        return KeysetPage(rows, next_cursor, previous_cursor, query_params)
@@ -0,0 +1,158 @@
+"""
+EXPLAIN-based regression checks for the queries the views actually issue.
+
+Each checked page is rendered with the Django test client while every SELECT
+is captured with its parameters. The captured statements are then EXPLAINed
+and any plan that reads a large table without an index, or sorts the whole
+of one instead of reading it in index order, is reported as a violation.
+Plans name a table by the alias Django gave it in a subquery or repeated
+join, so those aliases are mapped back to their tables first.
+Sorting the bounded slice found through an index lookup is allowed.
+"""
+import json
+import re
+from dataclasses import dataclass, field
+
+from django.db import connection
+
+# Pages checked by ``manage.py check_query_plans`` and the query plan tests.
+PAGES = (
+    "dashboard:home",
+    "academics:attendance_summary",
+    "academics:attendance_list",
+    "academics:attendance_detailed",
+    "academics:marks_overview",
+    "academics:assignment_list",
+    "academics:submission_list",
+)
+
+# Tables large enough that a full scan or a sort on them is a regression.
+HOT_TABLES = (
+    "academics_attendance",
+    "academics_marks",
+    "academics_submission",
+    "academics_assignment",
+)
+
+
+@dataclass
+class CapturedQuery:
+    sql: str
+    params: tuple
+
+
+@dataclass
+class PlanReport:
+    page: str
+    sql: str
+    problems: list = field(default_factory=list)
+
+
+class QueryCapture:
+    """``connection.execute_wrapper`` hook that records SELECT statements."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if not many and sql.lstrip().upper().startswith("SELECT"):
+            self.queries.append(CapturedQuery(sql, tuple(params or ())))
+        return execute(sql, params, many, context)
+
+
+# "FROM `table` U0" / "JOIN "table" T3": the aliases Django gives subqueries and repeated joins.
+_ALIAS = re.compile(r"""(?:FROM|JOIN)\s+([`"])(\w+)\1\s+(?:AS\s+)?([A-Z]\d+)\b""")
+
+
+def _touches_hot_table(sql):
+    return any(table in sql for table in HOT_TABLES)
+
+
+def _hot_tables(sql):
+    """Map each name a plan may report for a hot table in ``sql``, aliases included, to the table.
+
+    Separate subqueries may reuse an alias for different tables; a scan of
+    such an alias is then blamed on the hot table, erring towards failing.
+    """
+    names = {table: table for table in HOT_TABLES}
+    for _, table, alias in _ALIAS.findall(sql):
+        if table in HOT_TABLES:
+            names[alias] = table
+    return names
+
+
+def _mysql_problems(sql, params):
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN FORMAT=JSON " + sql, params)
+        plan = json.loads(cursor.fetchone()[0])
+
+    hot = _hot_tables(sql)
+    problems = []
+    full_reads = []
+    sorted_plan = False
+
+    def walk(node):
+        nonlocal sorted_plan
+        if isinstance(node, dict):
+            table = hot.get(node.get("table_name"))
+            access = node.get("access_type")
+            if table and access == "ALL":
+                problems.append(f"full table scan on {table}")
+            if table and access in ("ALL", "index"):
+                full_reads.append(table)
+            if node.get("using_filesort"):
+                sorted_plan = True
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(plan)
+    if sorted_plan:
+        problems.extend(f"filesort over all of {table}" for table in full_reads)
+    return problems
+
+
+def _sqlite_problems(sql, params):
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+        details = [row[-1] for row in cursor.fetchall()]
+
+    hot = _hot_tables(sql)
+    problems = []
+    full_reads = []
+    sorted_plan = any("TEMP B-TREE FOR ORDER BY" in detail for detail in details)
+    for detail in details:
+        match = re.match(r"SCAN (\w+)", detail)
+        table = hot.get(match.group(1)) if match else None
+        if table:
+            full_reads.append(table)
+            if "INDEX" not in detail:
+                problems.append(f"full table scan on {table}")
+    if sorted_plan:
+        problems.extend(f"sort over all of {table}" for table in full_reads)
+    return problems
+
+
+def plan_problems(sql, params):
+    """Return human-readable problems in the plan for ``sql``, or ``None`` if unsupported."""
+    if connection.vendor == "mysql":
+        return _mysql_problems(sql, params)
+    if connection.vendor == "sqlite":
+        return _sqlite_problems(sql, params)
+    return None
+
+
+def check_queries(page, queries):
+    """EXPLAIN each captured query that reads a hot table and collect the failures."""
+    reports = []
+    seen = set()
+    for query in queries:
+        if not _touches_hot_table(query.sql) or query.sql in seen:
+            continue
+        seen.add(query.sql)
+        problems = plan_problems(query.sql, query.params)
+        if problems:
+            reports.append(PlanReport(page, query.sql, sorted(set(problems))))
+    return reports
@@ -0,0 +1,111 @@
+"""
+Maintenance of the ``AttendanceRollup`` table.
+
+Every refresh recomputes the affected (student, subject) pairs with one
+GROUP BY over the ``(student, subject, date)`` unique index, so a pair
+costs a handful of index rows no matter how large ``Attendance`` grows.
+"""
+from collections import defaultdict
+from contextlib import contextmanager
+from threading import local
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from .models import Attendance, AttendanceRollup
+
+BATCH_SIZE = 1000
+
+_deferred = local()
+
+
+def _upsert(rows):
+    rollups = [
+        AttendanceRollup(
+            student_id=row["student_id"],
+            subject_id=row["subject_id"],
+            present_count=row["present"],
+            total_count=row["total"],
+            last_date=row["last_date"],
+        )
+        for row in rows
+    ]
+    conflict_options = {
+        "update_conflicts": True,
+        "update_fields": ["present_count", "total_count", "last_date", "updated_at"],
+    }
+    if connection.features.supports_update_conflicts_with_target:
+        conflict_options["unique_fields"] = ["student", "subject"]
+    AttendanceRollup.objects.bulk_create(rollups, batch_size=BATCH_SIZE, **conflict_options)
+
+
+def refresh_attendance_rollups(pairs):
+    """Recompute rollups for an iterable of ``(student_id, subject_id)`` pairs.
+
+    Pairs that no longer have any attendance rows lose their rollup row.
+    Inside ``deferred_refresh()`` the pairs are only collected.
+    """
+    pending = getattr(_deferred, "pairs", None)
+    if pending is not None:
+        pending.update(pairs)
+        return
+
+    students_by_subject = defaultdict(set)
+    for student_id, subject_id in pairs:
+        if student_id and subject_id:
+            students_by_subject[subject_id].add(student_id)
+    if not students_by_subject:
+        return
+
+    pair_filter = Q()
+    for subject_id, student_ids in students_by_subject.items():
+        pair_filter |= Q(subject_id=subject_id, student_id__in=student_ids)
+
+    with transaction.atomic():
+        rows = list(Attendance.objects.filter(pair_filter).by_student_subject())
+        _upsert(rows)
+        found = {(row["student_id"], row["subject_id"]) for row in rows}
+        stale = Q()
+        for subject_id, student_ids in students_by_subject.items():
+            missing = [student_id for student_id in student_ids if (student_id, subject_id) not in found]
+            if missing:
+                stale |= Q(subject_id=subject_id, student_id__in=missing)
+        if stale:
+            AttendanceRollup.objects.filter(stale).delete()
+
+
+@contextmanager
+def deferred_refresh():
+    """Collect the refreshes requested inside the block and run them once on exit.
+
+    Bulk deletes send one ``post_delete`` per row; this turns those into a
+    single refresh of the affected pairs.
+    """
+    if getattr(_deferred, "pairs", None) is not None:
+        yield
+        return
+    _deferred.pairs = set()
+    try:
+        yield
+        pairs = _deferred.pairs
+    finally:
+        _deferred.pairs = None
+    refresh_attendance_rollups(pairs)
+
+
+def rebuild_attendance_rollups():
+    """Discard every rollup row and recompute the table from ``Attendance``."""
+    created = 0
+    with transaction.atomic():
+        AttendanceRollup.objects.all().delete()
+        batch = []
+        for row in Attendance.objects.by_student_subject().iterator(chunk_size=BATCH_SIZE):
+            batch.append(row)
+            if len(batch) >= BATCH_SIZE:
+                _upsert(batch)
+                created += len(batch)
+                batch = []
+        if batch:
+            _upsert(batch)
+            created += len(batch)
+    return created
@@ -0,0 +1,44 @@
+"""
+Role-based row scoping shared by the list views and the exports.
+
+Students see their own rows, faculty see the rows they own, admins see
+everything. Anyone else, including a student or faculty user without an
+academic profile, sees nothing rather than the unfiltered queryset.
+"""
+from users.models import Profile
+
+
+def scope_attendance(queryset, user, role):
+    if role == Profile.Roles.STUDENT:
+        student_profile = getattr(user, "student_profile", None)
+        return queryset.filter(student=student_profile) if student_profile else queryset.none()
+    if role == Profile.Roles.FACULTY:
+        faculty_profile = getattr(user, "faculty_profile", None)
+        return queryset.taken_by(faculty_profile) if faculty_profile else queryset.none()
+    if role == Profile.Roles.ADMIN:
+        return queryset
+    return queryset.none()
+
+
+def scope_marks(queryset, user, role):
+    if role == Profile.Roles.STUDENT:
+        student_profile = getattr(user, "student_profile", None)
+        return queryset.filter(student=student_profile) if student_profile else queryset.none()
+    if role == Profile.Roles.FACULTY:
+        faculty_profile = getattr(user, "faculty_profile", None)
+        return queryset.filter(subject__faculty=faculty_profile) if faculty_profile else queryset.none()
+    if role == Profile.Roles.ADMIN:
+        return queryset
+    return queryset.none()
+
+
+def scope_submissions(queryset, user, role):
+    if role == Profile.Roles.STUDENT:
+        student_profile = getattr(user, "student_profile", None)
+        return queryset.filter(student=student_profile) if student_profile else queryset.none()
+    if role == Profile.Roles.FACULTY:
+        faculty_profile = getattr(user, "faculty_profile", None)
+        return queryset.filter(assignment__faculty=faculty_profile) if faculty_profile else queryset.none()
+    if role == Profile.Roles.ADMIN:
+        return queryset
+    return queryset.none()
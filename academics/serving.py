@@ -0,0 +1,108 @@
+"""
+Serving stored files once a view has decided the user may have them.
+
+With ``FILE_SERVING_BACKEND = "nginx"`` the response is empty apart from an
+``X-Accel-Redirect`` to ``PROTECTED_MEDIA_INTERNAL_URL``. With ``"sendfile"``
+it carries an ``X-Sendfile`` path for Apache's mod_xsendfile or lighttpd. In
+both cases the front web server sends the bytes and answers range requests,
+and the worker is free as soon as the headers are out.
+
+Without a backend the file is streamed by Django. A whole file goes out as a
+``FileResponse``, which WSGI servers with ``wsgi.file_wrapper`` hand to
+``sendfile()``. A single ``Range`` is answered with a 206 and just that
+slice, so interrupted downloads resume and media players can seek.
+"""
+import mimetypes
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.http import content_disposition_header
+
+BLOCK_SIZE = 64 * 1024
+# Types a browser may show in the page instead of downloading; anything else
+# uploaded by a student, HTML above all, is only ever sent as an attachment.
+INLINE_TYPES = {"application/pdf", "image/png", "image/jpeg", "image/gif", "text/plain"}
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class _Slice:
+    """Read at most ``length`` bytes of ``handle`` from where it is positioned."""
+
+    def __init__(self, handle, length):
+        self._handle = handle
+        self._remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._handle.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def close(self):
+        self._handle.close()
+
+
+def _parse_range(header, size):
+    """The ``(start, end)`` byte span of a single-range ``Range`` header.
+
+    Returns ``None`` for a header that is absent or asks for several ranges,
+    which are answered with the whole file, and ``False`` for one that cannot
+    be satisfied.
+    """
+    match = _RANGE.match(header.replace(" ", "")) if header else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last or int(last) == 0:
+            return False
+        return max(size - int(last), 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        return False
+    return start, end
+
+
+def _stream(request, storage, name, content_type):
+    size = storage.size(name)
+    span = _parse_range(request.headers.get("Range"), size)
+    if span is False:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+    handle = storage.open(name, "rb")
+    if span is None:
+        response = FileResponse(handle, content_type=content_type)
+    else:
+        start, end = span
+        handle.seek(start)
+        response = FileResponse(_Slice(handle, end - start + 1), status=206, content_type=content_type)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = end - start + 1
+    response.block_size = BLOCK_SIZE
+    response["Accept-Ranges"] = "bytes"
+    return response
+
+
+def serve_file(request, storage, name, filename):
+    """Respond with the stored file ``name``, presented to the browser as ``filename``."""
+    content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    backend = getattr(settings, "FILE_SERVING_BACKEND", "")
+    if backend == "nginx":
+        response = HttpResponse(content_type=content_type)
+        internal_url = getattr(settings, "PROTECTED_MEDIA_INTERNAL_URL", "/protected-media/")
+        response["X-Accel-Redirect"] = quote(internal_url + name)
+    elif backend == "sendfile":
+        response = HttpResponse(content_type=content_type)
+        response["X-Sendfile"] = storage.path(name)
+    else:
+        response = _stream(request, storage, name, content_type)
+    response["Content-Disposition"] = content_disposition_header(content_type not in INLINE_TYPES, filename)
+    # Only the people allowed to see the file may have it cached.
+    response["Cache-Control"] = "private"
+    return response
@@ -0,0 +1,124 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from django.utils import timezone
+
+from academics.analytics import invalidate_subject_statistics
+from academics.grading import invalidate_results
+from academics.heatmap import invalidate_calendar
+from academics.models import ArchivedSubmission, Assignment, Attendance, Marks, Submission, Term
+from academics.rollups import refresh_attendance_rollups
+from academics.similarity import schedule_indexing
+
+
+@receiver(pre_save, sender=Attendance)
+def remember_previous_key(sender, instance, **kwargs):
+    """
+    Remember the (student, subject, date) an edited record used to have, so
+    moving a record refreshes the rollups and calendar months on both sides.
+    """
+    instance._previous_key = None
+    if instance.pk:
+        instance._previous_key = (
+            Attendance.objects.filter(pk=instance.pk).values_list("student_id", "subject_id", "date").first()
+        )
+
+
+@receiver(post_save, sender=Attendance)
+def update_rollup_on_save(sender, instance, **kwargs):
+    """Keep AttendanceRollup and the cached calendars in step with created or edited attendance."""
+    keys = {(instance.student_id, instance.subject_id, instance.date)}
+    previous = getattr(instance, "_previous_key", None)
+    if previous:
+        keys.add(previous)
+    refresh_attendance_rollups((student_id, subject_id) for student_id, subject_id, _ in keys)
+    invalidate_calendar(keys)
+
+
+@receiver(post_delete, sender=Attendance)
+def update_rollup_on_delete(sender, instance, **kwargs):
+    """Keep AttendanceRollup and the cached calendars in step with deleted attendance."""
+    refresh_attendance_rollups([(instance.student_id, instance.subject_id)])
+    invalidate_calendar([(instance.student_id, instance.subject_id, instance.date)])
+
+
+@receiver(pre_save, sender=Marks)
+def remember_previous_mark(sender, instance, **kwargs):
+    """Remember the (student, term, subject) an edited mark used to count towards."""
+    instance._previous_mark = None
+    if instance.pk:
+        instance._previous_mark = (
+            Marks.objects.filter(pk=instance.pk).values_list("student_id", "term_id", "subject_id").first()
+        )
+
+
+@receiver(post_save, sender=Marks)
+def invalidate_on_mark_save(sender, instance, **kwargs):
+    """Drop the cached results and class statistics a created or edited mark feeds into."""
+    keys = {(instance.student_id, instance.term_id, instance.subject_id)}
+    previous = getattr(instance, "_previous_mark", None)
+    if previous:
+        keys.add(previous)
+    invalidate_results((student_id, term_id) for student_id, term_id, _ in keys)
+    invalidate_subject_statistics(subject_id for _, _, subject_id in keys)
+
+
+@receiver(post_delete, sender=Marks)
+def invalidate_on_mark_delete(sender, instance, **kwargs):
+    """Drop the cached results and class statistics a deleted mark fed into."""
+    invalidate_results([(instance.student_id, instance.term_id)])
+    invalidate_subject_statistics([instance.subject_id])
+
+
+@receiver(pre_save, sender=Attendance)
+@receiver(pre_save, sender=Assignment)
+@receiver(pre_save, sender=Marks)
+def assign_term(sender, instance, **kwargs):
+    """File new rows under the term their date falls in, unless one was given."""
+    if instance.term_id is not None:
+        return
+    if sender is Attendance:
+        date = instance.date
+    elif sender is Assignment:
+        date = instance.due_date
+    else:
+        date = instance.recorded_at.date() if instance.recorded_at else timezone.localdate()
+    instance.term = Term.objects.containing(date)
+
+
+@receiver(pre_save, sender=Submission)
+def assign_submission_term(sender, instance, **kwargs):
+    """Submissions belong to their assignment's term."""
+    if instance.term_id is None and instance.assignment_id:
+        instance.term_id = (
+            Assignment.objects.filter(pk=instance.assignment_id).values_list("term_id", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Submission)
+def index_submission_file(sender, instance, update_fields=None, **kwargs):
+    """Fingerprint a saved submission's file for near-duplicate detection in the background."""
+    if update_fields is not None and "submission_file" not in update_fields:
+        return
+    if instance.submission_file:
+        schedule_indexing(instance.pk)
+
+
+@receiver(post_save, sender=Term)
+def claim_unassigned_rows(sender, instance, **kwargs):
+    """Attach rows recorded before the term existed to it by date."""
+    if instance.is_archived:
+        return
+    span = (instance.start_date, instance.end_date)
+    Attendance.objects.filter(term__isnull=True, date__range=span).update(term=instance)
+    Marks.objects.filter(term__isnull=True, recorded_at__date__range=span).update(term=instance)
+    Assignment.objects.filter(term__isnull=True, due_date__range=span).update(term=instance)
+    Submission.objects.filter(term__isnull=True, assignment__term=instance).update(term=instance)
+
+
+@receiver(post_delete, sender=Submission)
+@receiver(post_delete, sender=ArchivedSubmission)
+def release_submission_file(sender, instance, **kwargs):
+    """Drop the deleted row's reference to its stored file."""
+    if instance.submission_file:
+        instance.submission_file.delete(save=False)
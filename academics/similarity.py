@@ -0,0 +1,314 @@
+"""
+Near-duplicate detection across submissions with MinHash and LSH.
+
+When a submission's file is saved, a background thread extracts its text
+(plain text and source code, PDF text operators, Office and OpenDocument
+XML, and text files inside ZIP archives), splits it into overlapping
+``SHINGLE_SIZE``-word shingles, and keeps a ``NUM_PERM``-value MinHash
+signature of them in ``SubmissionFingerprint``. Two signatures agree in a
+given position with probability equal to the Jaccard similarity of the
+shingle sets.
+
+The signature is cut into ``BANDS`` bands of ``ROWS`` values, and each band
+is stored as one hashed ``SimilarityBand`` bucket. Submissions that share a
+bucket are candidates. Their signatures are compared, and those estimated at
+``MATCH_THRESHOLD`` or above are written to ``SimilarityMatch`` in both
+directions. Indexing therefore reads a handful of index rows instead of
+every other submission. The submission list reads the stored matches and
+never compares anything itself.
+
+Submissions queued when a process exits are picked up by
+``manage.py index_submissions``, which indexes whatever is missing or stale.
+"""
+import hashlib
+import html
+import io
+import logging
+import queue
+import random
+import re
+import struct
+import threading
+import zipfile
+import zlib
+
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Count, Q
+
+from .models import SimilarityBand, SimilarityMatch, Submission, SubmissionFingerprint
+
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+# Bands of 4 rows make a pair at Jaccard 0.5 a candidate with probability 0.87.
+MATCH_THRESHOLD = 0.5
+MAX_CANDIDATES = 200
+MAX_TEXT_CHARS = 250_000
+MAX_READ_BYTES = 4 * 1024 * 1024
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240601)
+# Fixed for good: signatures taken with different permutations are not comparable.
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+logger = logging.getLogger(__name__)
+
+
+# Text extraction
+
+_OFFICE_MEMBERS = {
+    ".docx": re.compile(r"word/(document|footnotes|endnotes)\.xml$"),
+    ".pptx": re.compile(r"ppt/slides/slide\d+\.xml$"),
+    ".xlsx": re.compile(r"xl/sharedStrings\.xml$"),
+    ".odt": re.compile(r"content\.xml$"),
+    ".odp": re.compile(r"content\.xml$"),
+    ".ods": re.compile(r"content\.xml$"),
+}
+_XML_BREAKS = re.compile(rb"</(?:w:p|a:p|si|text:p|text:h)>|<(?:w:tab|w:br|text:s|text:tab|text:line-break)\b[^>]*>")
+_XML_TAGS = re.compile(rb"<[^>]*>")
+_PDF_STREAMS = re.compile(rb"stream\r?\n(.*?)\r?\nendstream", re.S)
+_PDF_SHOWN = re.compile(rb"(\((?:\\.|[^\\)])*\))\s*(?:Tj|'|\")|\[((?:\\.|[^\\\]])*)\]\s*TJ", re.S)
+_PDF_STRINGS = re.compile(rb"\(((?:\\.|[^\\)])*)\)", re.S)
+_PDF_ESCAPES = re.compile(rb"\\([0-7]{1,3}|.)", re.S)
+_PDF_ESCAPED = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"", b"f": b""}
+
+
+def _decode(data):
+    return data.decode("utf-8", errors="replace")
+
+
+def _looks_textual(data):
+    return b"\x00" not in data[:8192]
+
+
+def _xml_text(data):
+    return html.unescape(_decode(_XML_TAGS.sub(b"", _XML_BREAKS.sub(b" ", data))))
+
+
+def _unescape_pdf(value):
+    def replace(match):
+        escaped = match.group(1)
+        if escaped[:1].isdigit():
+            return bytes([int(escaped, 8) & 0xFF])
+        return _PDF_ESCAPED.get(escaped, escaped)
+
+    return _PDF_ESCAPES.sub(replace, value)
+
+
+def _pdf_text(data):
+    """Strings shown by the text operators of every content stream.
+
+    Best effort: text drawn with fonts that remap their character codes
+    comes out as noise and only matches other copies of the same PDF.
+    """
+    words = []
+    for stream in _PDF_STREAMS.finditer(data):
+        content = stream.group(1)
+        try:
+            content = zlib.decompress(content)
+        except zlib.error:
+            pass
+        for shown in _PDF_SHOWN.finditer(content):
+            if shown.group(1):
+                words.append(_unescape_pdf(shown.group(1)[1:-1]))
+            else:
+                # Pieces of a TJ array are one run of text with kerning between them.
+                words.append(b"".join(_unescape_pdf(piece) for piece in _PDF_STRINGS.findall(shown.group(2))))
+    return b" ".join(words).decode("latin-1")
+
+
+def _zip_text(data, members=None):
+    parts = []
+    budget = MAX_READ_BYTES
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        for info in archive.infolist():
+            if info.is_dir() or budget <= 0:
+                continue
+            if members is not None and not members.search(info.filename):
+                continue
+            with archive.open(info) as member:
+                # Read no more than the budget, whatever the member claims to expand to.
+                content = member.read(budget)
+            budget -= len(content)
+            if members is not None:
+                parts.append(_xml_text(content))
+            elif _looks_textual(content):
+                parts.append(_decode(content))
+    return "\n".join(parts)
+
+
+def extract_text(field_file):
+    """The text of a submission file, or ``""`` when its format is not understood."""
+    name = field_file.name.lower()
+    extension = name[name.rfind("."):] if "." in name else ""
+    try:
+        with field_file.open("rb") as handle:
+            data = handle.read(MAX_READ_BYTES)
+    except OSError:
+        logger.warning("Submission file %s could not be read for indexing", field_file.name)
+        return ""
+    try:
+        if extension in _OFFICE_MEMBERS:
+            return _zip_text(data, _OFFICE_MEMBERS[extension])
+        if extension == ".zip":
+            return _zip_text(data)
+    except (zipfile.BadZipFile, zlib.error, EOFError, NotImplementedError):
+        return ""
+    if data.startswith(b"%PDF"):
+        return _pdf_text(data)
+    if _looks_textual(data):
+        return _decode(data)
+    return ""
+
+
+# Signatures
+
+def shingles(text):
+    """64-bit hashes of every run of ``SHINGLE_SIZE`` consecutive words in ``text``."""
+    words = re.findall(r"\w+", text[:MAX_TEXT_CHARS].lower())
+    if len(words) < SHINGLE_SIZE:
+        return set()
+    return {
+        int.from_bytes(
+            hashlib.blake2b(" ".join(words[start:start + SHINGLE_SIZE]).encode(), digest_size=8).digest(), "little"
+        )
+        for start in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def minhash(hashes):
+    """The MinHash signature of a non-empty set of shingle hashes."""
+    values = list(hashes)
+    return [min([(a * value + b) % _PRIME for value in values]) for a, b in _PERMUTATIONS]
+
+
+def pack(signature):
+    return struct.pack(f"<{NUM_PERM}Q", *signature)
+
+
+def unpack(packed):
+    return struct.unpack(f"<{NUM_PERM}Q", bytes(packed))
+
+
+def buckets(signature):
+    """One LSH bucket per band of ``signature``; the band number is part of the hash."""
+    return [
+        int.from_bytes(
+            hashlib.blake2b(
+                struct.pack(f"<H{ROWS}Q", band, *signature[band * ROWS:(band + 1) * ROWS]), digest_size=8
+            ).digest(),
+            "little",
+            signed=True,
+        )
+        for band in range(BANDS)
+    ]
+
+
+def estimate_similarity(signature, other):
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return sum(a == b for a, b in zip(signature, other)) / NUM_PERM
+
+
+# Index
+
+def _clear(submission_id):
+    SimilarityBand.objects.filter(submission_id=submission_id).delete()
+    SimilarityMatch.objects.filter(Q(submission_id=submission_id) | Q(match_id=submission_id)).delete()
+
+
+def _record_matches(submission_id, signature, keys):
+    candidates = list(
+        SimilarityBand.objects.filter(bucket__in=keys)
+        .exclude(submission_id=submission_id)
+        .values("submission_id")
+        .annotate(shared=Count("pk"))
+        .order_by("-shared")
+        .values_list("submission_id", flat=True)[:MAX_CANDIDATES]
+    )
+    matches = []
+    signatures = SubmissionFingerprint.objects.filter(submission_id__in=candidates).values_list("submission_id", "signature")
+    for other_id, packed in signatures:
+        similarity = estimate_similarity(signature, unpack(packed))
+        if similarity >= MATCH_THRESHOLD:
+            matches.append(SimilarityMatch(submission_id=submission_id, match_id=other_id, similarity=similarity))
+            matches.append(SimilarityMatch(submission_id=other_id, match_id=submission_id, similarity=similarity))
+    conflict_options = {"update_conflicts": True, "update_fields": ["similarity"]}
+    if connection.features.supports_update_conflicts_with_target:
+        conflict_options["unique_fields"] = ["submission", "match"]
+    SimilarityMatch.objects.bulk_create(matches, **conflict_options)
+    return len(matches) // 2
+
+
+def index_submission(submission_id, force=False):
+    """Fingerprint one submission and record its near-duplicates; returns how many it has.
+
+    Does nothing when the stored fingerprint was taken from the submission's
+    current file, unless ``force`` is set.
+    """
+    submission = Submission.objects.filter(pk=submission_id).only("pk", "submission_file").first()
+    if submission is None:
+        return 0
+    name = submission.submission_file.name or ""
+    if not force and SubmissionFingerprint.objects.filter(submission_id=submission_id, source=name).exists():
+        return 0
+
+    signature = keys = None
+    hashes = shingles(extract_text(submission.submission_file)) if name else set()
+    if hashes:
+        signature = minhash(hashes)
+        keys = buckets(signature)
+    with transaction.atomic():
+        _clear(submission_id)
+        SubmissionFingerprint.objects.update_or_create(
+            submission_id=submission_id,
+            defaults={"source": name, "signature": pack(signature) if signature else b"", "shingles": len(hashes)},
+        )
+        if keys:
+            SimilarityBand.objects.bulk_create(SimilarityBand(submission_id=submission_id, bucket=key) for key in keys)
+    if not signature:
+        return 0
+    # The bands are committed before looking for candidates, so of two
+    # submissions indexed at the same time at least one finds the other.
+    return _record_matches(submission_id, signature, keys)
+
+
+class SimilarityIndexer:
+    """Queue of submissions awaiting indexing and the thread that works through it."""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def schedule(self, submission_id):
+        self._queue.put(submission_id)
+        with self._lock:
+            # Started lazily so processes forked by a preloading server get their own.
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="submission-indexer", daemon=True)
+                self._thread.start()
+
+    def wait(self):
+        """Block until everything scheduled so far has been indexed."""
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            submission_id = self._queue.get()
+            try:
+                index_submission(submission_id)
+            except Exception:
+                logger.exception("Indexing submission %s for similarity failed", submission_id)
+            finally:
+                self._queue.task_done()
+                # This thread is outside the request cycle; honour CONN_MAX_AGE here too.
+                close_old_connections()
+
+
+indexer = SimilarityIndexer()
+
+
+def schedule_indexing(submission_id):
+    """Index a submission in the background once the current transaction commits."""
+    transaction.on_commit(lambda: indexer.schedule(submission_id))
@@ -0,0 +1,153 @@
+"""
+Content-addressed storage for submission files.
+
+Every file is hashed with SHA-256 while it is written and stored once under
+``submissions/blobs/<aa>/<bb>/<sha256><ext>``. Saving content that is
+already there only adds a reference, so re-uploads and shared templates
+take no extra space, and two submissions with the same file name are exact
+copies. ``StoredBlob`` counts the references, and a blob is removed when the
+last one is released. The removal holds the blob's row lock and re-checks
+the count, and a new reference takes the same lock, so an upload can never
+count on a file that is being removed: it either keeps the blob alive or
+finds it gone and writes its own copy.
+
+Files saved before this storage existed keep their dated paths and are
+deleted directly. ``manage.py dedupe_submission_files`` moves them over.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+BLOB_PREFIX = "submissions/blobs/"
+_READ_SIZE = 64 * 1024
+_retained = threading.local()
+
+
+def blob_name(digest, extension=""):
+    return f"{BLOB_PREFIX}{digest[:2]}/{digest[2:4]}/{digest}{extension.lower()}"
+
+
+def is_blob(name):
+    return bool(name) and name.startswith(BLOB_PREFIX)
+
+
+@contextmanager
+def references_retained():
+    """Keep blobs referenced while rows holding them are deleted inside the block.
+
+    For moves that hand a file over to another row, such as archiving.
+    """
+    previous = getattr(_retained, "active", False)
+    _retained.active = True
+    try:
+        yield
+    finally:
+        _retained.active = previous
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """File system storage that keeps one reference-counted copy of each distinct file."""
+
+    def get_available_name(self, name, max_length=None):
+        # The name is derived from the content in _save; the suggested one only lends its extension.
+        return name
+
+    def _hash_into(self, content, directory):
+        """Copy ``content`` into a temporary file in ``directory``; returns its path, digest and size."""
+        digest = hashlib.sha256()
+        size = 0
+        descriptor, path = tempfile.mkstemp(dir=directory, suffix=".upload")
+        with os.fdopen(descriptor, "wb") as handle:
+            for chunk in content.chunks(_READ_SIZE):
+                digest.update(chunk)
+                handle.write(chunk)
+                size += len(chunk)
+        return path, digest.hexdigest(), size
+
+    def _hash_file(self, path):
+        digest = hashlib.sha256()
+        size = 0
+        with open(path, "rb") as handle:
+            for chunk in iter(lambda: handle.read(_READ_SIZE), b""):
+                digest.update(chunk)
+                size += len(chunk)
+        return digest.hexdigest(), size
+
+    def _save(self, name, content):
+        blobs = self.path(BLOB_PREFIX)
+        os.makedirs(blobs, exist_ok=True)
+        if hasattr(content, "temporary_file_path"):
+            # Already on disk: hash it in place and move it, as FileSystemStorage would.
+            source = content.temporary_file_path()
+            digest, size = self._hash_file(source)
+        else:
+            source, digest, size = self._hash_into(content, blobs)
+
+        name = blob_name(digest, os.path.splitext(name)[1])
+        self._add_reference(name, digest, size)
+        path = self.path(name)
+        if os.path.exists(path):
+            os.remove(source)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            file_move_safe(source, path, allow_overwrite=True)
+            if self.file_permissions_mode is not None:
+                os.chmod(path, self.file_permissions_mode)
+        return name
+
+    def _add_reference(self, name, digest, size):
+        from .models import StoredBlob
+
+        if StoredBlob.objects.filter(name=name).update(ref_count=F("ref_count") + 1):
+            return
+        try:
+            with transaction.atomic():
+                StoredBlob.objects.create(name=name, sha256=digest, size=size, ref_count=1)
+        except IntegrityError:
+            # Another upload of the same content created the row first.
+            StoredBlob.objects.filter(name=name).update(ref_count=F("ref_count") + 1)
+
+    def delete(self, name):
+        """Release one reference, removing the blob once nothing refers to it."""
+        if not is_blob(name):
+            return super().delete(name)
+        if getattr(_retained, "active", False):
+            return
+        from .models import StoredBlob
+
+        with transaction.atomic():
+            blob = StoredBlob.objects.select_for_update().filter(name=name).first()
+            if blob is None:
+                return
+            if blob.ref_count > 1:
+                StoredBlob.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") - 1)
+                return
+            # The row stays until the file is gone, so a new reference meanwhile waits on its lock.
+            StoredBlob.objects.filter(pk=blob.pk).update(ref_count=0)
+            transaction.on_commit(lambda: self._remove_unreferenced(name))
+
+    def _remove_unreferenced(self, name):
+        from .models import StoredBlob
+
+        with transaction.atomic():
+            blob = StoredBlob.objects.select_for_update().filter(name=name).first()
+            # An upload of the same content may have claimed the blob again since.
+            if blob is None or blob.ref_count > 0:
+                return
+            super().delete(name)
+            blob.delete()
+
+
+_storage = ContentAddressedStorage()
+
+
+def submission_storage():
+    """Storage of ``Submission.submission_file``; a callable keeps it out of migrations."""
+    return _storage
@@ -0,0 +1,102 @@
+"""
+Publishing assignments and handing in submissions.
+
+Publishing an assignment creates one ``PENDING`` ``Submission`` per student
+enrolled in its subject that term, with a single ``bulk_create``. "Who has
+not handed in" is then a filter on the ``(assignment, status)`` index
+rather than an anti-join against the roster.
+
+Handing in saves the file first and then flips the student's row with one
+conditional ``UPDATE ... WHERE status = 'PENDING'``. Of two concurrent
+attempts exactly one updates a row; the other's file reference is released
+and it is told the work was already handed in. A student with no pending
+row, such as one enrolled after publication, gets a row created instead,
+and the ``(assignment, student)`` unique constraint settles any race there.
+"""
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from dashboard.stats import invalidate_dashboards
+
+from .models import Enrollment, Submission, Term
+from .similarity import schedule_indexing
+
+BATCH_SIZE = 1000
+
+
+def submission_status(assignment):
+    """Status of a submission handed in today."""
+    if timezone.localdate() <= assignment.due_date:
+        return Submission.SubmissionStatus.SUBMITTED
+    return Submission.SubmissionStatus.LATE
+
+
+def create_pending_submissions(assignments):
+    """Create the missing ``PENDING`` rows of ``assignments``' enrolled students.
+
+    Assignments without a term use the current term's enrolments. Rows that
+    already exist are left alone, so this can be re-run after enrolling more
+    students. Returns how many rows were created, not counting any that a
+    concurrent hand-in or run created first.
+    """
+    current = None
+    created = 0
+    for assignment in assignments:
+        term_id = assignment.term_id
+        if term_id is None:
+            current = current or Term.objects.current()
+            term_id = current.pk if current else None
+        if term_id is None:
+            continue
+        enrolled = Enrollment.objects.filter(subject_id=assignment.subject_id, term_id=term_id).values("student")
+        missing = (
+            enrolled.exclude(student__in=Submission.objects.filter(assignment=assignment).values("student"))
+            .values_list("student_id", flat=True)
+        )
+        student_ids = list(missing)
+        rows = [
+            Submission(
+                assignment=assignment,
+                student_id=student_id,
+                term_id=assignment.term_id,
+                status=Submission.SubmissionStatus.PENDING,
+            )
+            for student_id in student_ids
+        ]
+        # A concurrent hand-in may have created one of these rows since.
+        Submission.objects.bulk_create(rows, batch_size=BATCH_SIZE, ignore_conflicts=True)
+        # ignore_conflicts reports skipped rows as created. These students had no row, so their
+        # pending ones are new; a hand-in that won the race left a handed-in row instead.
+        pending = Submission.objects.pending().filter(assignment=assignment)
+        for offset in range(0, len(student_ids), BATCH_SIZE):
+            created += pending.filter(student_id__in=student_ids[offset:offset + BATCH_SIZE]).count()
+    return created
+
+
+def hand_in(assignment, student, content, filename):
+    """Hand in ``content`` as the student's work; returns the submission, or ``None`` if already handed in."""
+    field = Submission._meta.get_field("submission_file")
+    name = field.storage.save(field.generate_filename(None, filename), content, max_length=field.max_length)
+    values = {
+        "submission_file": name,
+        "submitted_on": timezone.localdate(),
+        "status": submission_status(assignment),
+    }
+    rows = Submission.objects.filter(assignment=assignment, student=student)
+    with transaction.atomic():
+        updated = rows.pending().update(**values)
+        if not updated:
+            try:
+                with transaction.atomic():
+                    # Saved normally, so the post_save handlers see it.
+                    return Submission.objects.create(assignment=assignment, student=student, **values)
+            except IntegrityError:
+                pass
+    if not updated:
+        field.storage.delete(name)
+        return None
+    submission = rows.get()
+    # update() skips post_save; do the indexing and invalidation it would have.
+    schedule_indexing(submission.pk)
+    invalidate_dashboards(students=[student.pk], faculty=[assignment.faculty_id])
+    return submission
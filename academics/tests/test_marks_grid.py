@@ -0,0 +1,108 @@
+"""Tests for entering one assessment's marks for a whole class through the marks grid."""
+import datetime
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from academics.models import Marks, Subject, Term
+from users.models import Profile
+
+
+def _user(username, role):
+    user = User.objects.create_user(username, first_name=username.title())
+    # Saving the approved profile creates the matching Student or Faculty row.
+    profile = user.profile
+    profile.role = role
+    profile.is_approved = True
+    profile.save()
+    return user
+
+
+class MarksGridTermTests(TestCase):
+    """A rolled-over term's marks stay live until archived but are not the grid's to show or copy."""
+
+    @classmethod
+    def setUpTestData(cls):
+        today = timezone.localdate()
+        cls.old = Term.objects.create(
+            name="Old", start_date=today - datetime.timedelta(days=200), end_date=today - datetime.timedelta(days=20)
+        )
+        cls.current = Term.objects.create(
+            name="Cur", start_date=today - datetime.timedelta(days=10), end_date=today + datetime.timedelta(days=100)
+        )
+        cls.teacher = _user("teacher", Profile.Roles.FACULTY)
+        cls.subject = Subject.objects.create(
+            code="CS101", name="Programming", semester=1, faculty=cls.teacher.faculty_profile
+        )
+        cls.graded, cls.ungraded = (
+            _user(username, Profile.Roles.STUDENT).student_profile for username in ("graded", "ungraded")
+        )
+        Marks.objects.create(
+            student=cls.graded,
+            subject=cls.subject,
+            assessment_type=Marks.AssessmentType.IA1,
+            score=Decimal("5.00"),
+            max_score=Decimal("10.00"),
+            term=cls.old,
+        )
+
+    def setUp(self):
+        self.client.force_login(self.teacher)
+        self.query = {"subject": self.subject.pk, "assessment_type": Marks.AssessmentType.IA1}
+
+    def test_grid_leaves_out_earlier_terms_marks(self):
+        response = self.client.get(reverse("academics:marks_grid"), self.query)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(dict((student.pk, score) for student, score, _ in response.context["grid"]), {
+            self.graded.pk: "",
+            self.ungraded.pk: "",
+        })
+        self.assertIsNone(response.context["max_score"])
+
+    def test_saving_files_new_marks_under_the_current_term(self):
+        response = self.client.post(reverse("academics:marks_grid"), {
+            **self.query,
+            "max_score": "20",
+            f"score_{self.graded.pk}": "",
+            f"score_{self.ungraded.pk}": "12",
+        })
+
+        self.assertRedirects(response, reverse("academics:marks_overview"), fetch_redirect_response=False)
+        self.assertEqual(
+            set(Marks.objects.values_list("student_id", "term__name", "score")),
+            {(self.graded.pk, "Old", Decimal("5.00")), (self.ungraded.pk, "Cur", Decimal("12.00"))},
+        )
+
+
+class MarksGridScopeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = _user("teacher", Profile.Roles.FACULTY)
+        other = _user("other", Profile.Roles.FACULTY)
+        cls.own = Subject.objects.create(code="CS101", name="Programming", semester=1, faculty=cls.teacher.faculty_profile)
+        cls.foreign = Subject.objects.create(code="CS102", name="Data Structures", semester=1, faculty=other.faculty_profile)
+        cls.student = _user("student", Profile.Roles.STUDENT).student_profile
+
+    def setUp(self):
+        self.client.force_login(self.teacher)
+
+    def test_only_own_subjects_are_offered(self):
+        response = self.client.get(reverse("academics:marks_grid"))
+
+        self.assertEqual(list(response.context["form"].fields["subject"].queryset), [self.own])
+
+    def test_marks_for_another_faculty_members_subject_are_refused(self):
+        response = self.client.post(reverse("academics:marks_grid"), {
+            "subject": self.foreign.pk,
+            "assessment_type": Marks.AssessmentType.IA1,
+            "max_score": "10",
+            f"score_{self.student.pk}": "7",
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("subject", response.context["form"].errors)
+        self.assertFalse(Marks.objects.exists())
@@ -0,0 +1,149 @@
+"""
+EXPLAIN regression tests for the queries the main pages issue.
+
+Each page is rendered as an admin, a faculty member and a student over a
+few thousand generated rows, and every query it sent to one of the large
+tables must be answered through an index rather than a full scan or sort.
+"""
+import datetime
+from decimal import Decimal
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from academics.models import Assignment, Attendance, Enrollment, Marks, Student, Subject, Submission, Term
+from academics.query_plans import HOT_TABLES, PAGES, QueryCapture, check_queries
+from academics.rollups import rebuild_attendance_rollups
+from users.models import Profile
+
+STUDENTS = 40
+SUBJECTS_PER_FACULTY = 2
+DAYS = 30
+
+
+def _user(username, role):
+    user = User.objects.create_user(username, first_name=username.title())
+    # Saving the approved profile creates the matching Student or Faculty row.
+    profile = user.profile
+    profile.role = role
+    profile.is_approved = True
+    profile.save()
+    return user
+
+
+@skipUnless(connection.vendor in ("mysql", "sqlite"), "query plans are only checked on MySQL and SQLite")
+class QueryPlanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        today = timezone.localdate()
+        term = Term.objects.create(
+            name="Current", start_date=today - datetime.timedelta(days=DAYS + 30), end_date=today + datetime.timedelta(days=60)
+        )
+        cls.users = {
+            Profile.Roles.ADMIN: _user("admin", Profile.Roles.ADMIN),
+            Profile.Roles.FACULTY: _user("faculty0", Profile.Roles.FACULTY),
+            Profile.Roles.STUDENT: _user("student0", Profile.Roles.STUDENT),
+        }
+        faculty = [cls.users[Profile.Roles.FACULTY].faculty_profile] + [
+            _user(f"faculty{index}", Profile.Roles.FACULTY).faculty_profile for index in range(1, 3)
+        ]
+        students = [cls.users[Profile.Roles.STUDENT].student_profile] + [
+            _user(f"student{index}", Profile.Roles.STUDENT).student_profile for index in range(1, STUDENTS)
+        ]
+        subjects = [
+            Subject.objects.create(code=f"CS{index:03}", name=f"Subject {index}", semester=1, faculty=teacher)
+            for index, teacher in enumerate(faculty * SUBJECTS_PER_FACULTY)
+        ]
+
+        Enrollment.objects.bulk_create(
+            Enrollment(student=student, subject=subject, term=term) for student in students for subject in subjects
+        )
+        Attendance.objects.bulk_create(
+            Attendance(
+                student=student,
+                subject=subject,
+                faculty=subject.faculty,
+                date=today - datetime.timedelta(days=day),
+                status=Attendance.Status.ABSENT if (student.pk + day) % 5 == 0 else Attendance.Status.PRESENT,
+                term=term,
+            )
+            for student in students
+            for subject in subjects
+            for day in range(DAYS)
+        )
+        rebuild_attendance_rollups()
+        Marks.objects.bulk_create(
+            Marks(
+                student=student,
+                subject=subject,
+                assessment_type=assessment_type,
+                score=Decimal(student.pk % 10),
+                max_score=Decimal(10),
+                term=term,
+            )
+            for student in students
+            for subject in subjects
+            for assessment_type in (Marks.AssessmentType.IA1, Marks.AssessmentType.IA2)
+        )
+        assignments = Assignment.objects.bulk_create(
+            Assignment(
+                subject=subject,
+                faculty=subject.faculty,
+                title=f"Assignment {number}",
+                due_date=today + datetime.timedelta(days=number),
+                max_score=Decimal(10),
+                term=term,
+            )
+            for subject in subjects
+            for number in range(3)
+        )
+        Submission.objects.bulk_create(
+            Submission(
+                assignment=assignment,
+                student=student,
+                submitted_on=today,
+                status=Submission.SubmissionStatus.SUBMITTED,
+                term=term,
+            )
+            for assignment in assignments
+            for student in students
+        )
+
+        # Give the optimizer row counts to plan with, as a populated database would have.
+        with connection.cursor() as cursor:
+            if connection.vendor == "mysql":
+                cursor.execute("ANALYZE TABLE " + ", ".join(HOT_TABLES))
+            else:
+                cursor.execute("ANALYZE")
+
+    def test_pages_read_large_tables_through_indexes(self):
+        for role, user in self.users.items():
+            self.client.force_login(user)
+            for page in PAGES:
+                with self.subTest(page=page, role=role):
+                    capture = QueryCapture()
+                    with connection.execute_wrapper(capture):
+                        response = self.client.get(reverse(page))
+                    self.assertEqual(response.status_code, 200)
+                    reports = check_queries(f"{page} as {role.lower()}", capture.queries)
+                    self.assertEqual(
+                        [], [f"{report.sql}: {', '.join(report.problems)}" for report in reports]
+                    )
+
+    def test_full_scan_inside_a_subquery_is_caught(self):
+        # No index leads with status, so the subquery reads all of Attendance under Django's alias.
+        absentees = Student.objects.filter(
+            pk__in=Attendance.objects.filter(status=Attendance.Status.ABSENT).values("student")
+        )
+        capture = QueryCapture()
+        with connection.execute_wrapper(capture):
+            list(absentees)
+
+        reports = check_queries("absentees", capture.queries)
+        self.assertEqual(
+            ["full table scan on academics_attendance"], [problem for report in reports for problem in report.problems]
+        )
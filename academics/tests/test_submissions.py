@@ -0,0 +1,64 @@
+"""Tests for publishing assignments as one pending submission per enrolled student."""
+import datetime
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from academics.models import Assignment, Enrollment, Subject, Submission, Term
+from academics.submissions import create_pending_submissions
+from users.models import Profile
+
+
+def _user(username, role):
+    user = User.objects.create_user(username, first_name=username.title())
+    # Saving the approved profile creates the matching Student or Faculty row.
+    profile = user.profile
+    profile.role = role
+    profile.is_approved = True
+    profile.save()
+    return user
+
+
+class CreatePendingSubmissionsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        today = timezone.localdate()
+        cls.term = Term.objects.create(
+            name="Cur", start_date=today - datetime.timedelta(days=10), end_date=today + datetime.timedelta(days=100)
+        )
+        teacher = _user("teacher", Profile.Roles.FACULTY).faculty_profile
+        subject = Subject.objects.create(code="CS101", name="Programming", semester=1, faculty=teacher)
+        cls.students = [_user(f"student{index}", Profile.Roles.STUDENT).student_profile for index in range(3)]
+        Enrollment.objects.bulk_create(Enrollment(student=student, subject=subject, term=cls.term) for student in cls.students)
+        cls.assignment = Assignment.objects.create(
+            subject=subject, faculty=teacher, title="Essay", due_date=today, max_score=Decimal(10), term=cls.term
+        )
+
+    def setUp(self):
+        Submission.objects.filter(assignment=self.assignment).delete()
+
+    def test_rerun_creates_nothing(self):
+        self.assertEqual(create_pending_submissions([self.assignment]), 3)
+        self.assertEqual(create_pending_submissions([self.assignment]), 0)
+
+    def test_rows_created_concurrently_are_not_counted(self):
+        bulk_create = Submission.objects.bulk_create
+
+        def hand_in_first(rows, **kwargs):
+            # A student hands in between the missing rows being found and inserted.
+            Submission.objects.create(
+                assignment=self.assignment,
+                student=self.students[0],
+                status=Submission.SubmissionStatus.SUBMITTED,
+                term=self.term,
+            )
+            return bulk_create(rows, **kwargs)
+
+        with mock.patch.object(Submission.objects, "bulk_create", side_effect=hand_in_first):
+            created = create_pending_submissions([self.assignment])
+
+        self.assertEqual(created, 2)
+        self.assertEqual(Submission.objects.filter(assignment=self.assignment).count(), 3)
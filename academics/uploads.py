@@ -0,0 +1,178 @@
+"""
+Chunked, resumable uploads of assignment submissions.
+
+A client starts an upload by declaring the file's name and size, then PUTs
+the bytes in chunks of at most ``MAX_CHUNK_SIZE`` at increasing offsets,
+and finally asks for the submission to be created. Every limit is checked
+against the declared sizes and ``Content-Length`` before any data is read.
+A chunk is streamed into a file of its own under ``MEDIA_ROOT`` with no
+transaction open, since a slow client can take seconds to send it. Only
+then is the session locked again to append it to the partial file and
+extend the CRC-32 of everything received, kept on the ``UploadSession``
+row. The CRC-32 can be carried from one chunk to the next, unlike a SHA
+digest, so any worker process can accept the next chunk.
+
+A chunk must start where the last one ended; a client that lost track asks
+for the session and resumes from its ``received`` offset. Starting again
+with the same file name and size returns the session in progress. At
+finalize the partial file is moved, not copied, into the submission's
+``submission_file``.
+"""
+import glob
+import os
+import shutil
+import uuid
+import zlib
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils.text import get_valid_filename
+
+from .models import Submission, UploadSession
+from .submissions import hand_in
+
+MAX_SUBMISSION_SIZE = 10 * 1024 * 1024
+# Chunk size suggested to clients, and the most a single PUT may carry.
+CHUNK_SIZE = 1024 * 1024
+MAX_CHUNK_SIZE = 2 * CHUNK_SIZE
+_READ_SIZE = 64 * 1024
+
+
+class UploadError(ValueError):
+    """A rejected upload step; ``status`` is the HTTP status to answer with."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def partial_path(session):
+    return os.path.join(settings.MEDIA_ROOT, "uploads", "partial", f"{session.pk}.part")
+
+
+def discard(session):
+    """Delete an upload session and whatever it received."""
+    # Chunk files are normally removed as they are appended; these are left by killed workers.
+    for path in [partial_path(session)] + glob.glob(glob.escape(partial_path(session)) + ".*.chunk"):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    session.delete()
+
+
+def start_upload(assignment, student, filename, size, crc32=None):
+    """Start, or pick up again, the student's upload for ``assignment``."""
+    filename = get_valid_filename(os.path.basename(filename or ""))
+    if not filename:
+        raise UploadError("A file name is required.")
+    if size < 1:
+        raise UploadError("The file is empty.")
+    if size > MAX_SUBMISSION_SIZE:
+        raise UploadError(f"File size must be at most {MAX_SUBMISSION_SIZE // (1024 * 1024)}MB.", status=413)
+    if Submission.objects.handed_in().filter(assignment=assignment, student=student).exists():
+        raise UploadError("You have already submitted this assignment.", status=409)
+
+    session = UploadSession.objects.filter(assignment=assignment, student=student).first()
+    if session is not None:
+        if (session.filename, session.size, session.expected_crc32) == (filename, size, crc32):
+            return session
+        discard(session)
+    session = UploadSession.objects.create(
+        assignment=assignment, student=student, filename=filename, size=size, expected_crc32=crc32
+    )
+    os.makedirs(os.path.dirname(partial_path(session)), exist_ok=True)
+    open(partial_path(session), "wb").close()
+    return session
+
+
+def _check_chunk(session_id, student, offset, length):
+    """The session locked for update, if a chunk of ``length`` bytes may be written at ``offset``."""
+    session = UploadSession.objects.select_for_update().filter(pk=session_id, student=student).first()
+    if session is None:
+        raise UploadError("Upload not found.", status=404)
+    if offset != session.received:
+        raise UploadError(f"Expected a chunk at offset {session.received}.", status=409)
+    if offset + length > session.size:
+        raise UploadError("Chunk runs past the declared file size.", status=413)
+    return session
+
+
+def write_chunk(session_id, student, offset, length, stream):
+    """Append ``length`` bytes read from ``stream`` at ``offset``; returns the session.
+
+    Nothing is read from ``stream`` unless the chunk fits both the per-chunk
+    limit and the declared file size.
+    """
+    if length is None:
+        raise UploadError("Content-Length is required.", status=411)
+    if length > MAX_CHUNK_SIZE:
+        raise UploadError(f"Chunks must be at most {MAX_CHUNK_SIZE} bytes.", status=413)
+    with transaction.atomic():
+        session = _check_chunk(session_id, student, offset, length)
+
+    # Read from the client with no lock held; a concurrent PUT writes its own chunk file.
+    chunk_path = f"{partial_path(session)}.{uuid.uuid4().hex}.chunk"
+    try:
+        crc = session.crc32
+        remaining = length
+        with open(chunk_path, "wb") as chunk:
+            while remaining:
+                block = stream.read(min(_READ_SIZE, remaining))
+                if not block:
+                    break
+                chunk.write(block)
+                crc = zlib.crc32(block, crc)
+                remaining -= len(block)
+        if remaining:
+            raise UploadError("The chunk ended early; send it again.", status=400)
+
+        with transaction.atomic():
+            # Serialises concurrent PUTs to the same upload; only the first at this offset is kept.
+            session = _check_chunk(session_id, student, offset, length)
+            with open(partial_path(session), "r+b") as partial, open(chunk_path, "rb") as chunk:
+                # Drop anything a failed earlier attempt left past the last good offset.
+                partial.seek(offset)
+                partial.truncate()
+                shutil.copyfileobj(chunk, partial)
+            session.received = offset + length
+            session.crc32 = crc
+            session.save(update_fields=["received", "crc32", "updated_at"])
+    finally:
+        try:
+            os.remove(chunk_path)
+        except FileNotFoundError:
+            pass
+    return session
+
+
+class _AssembledFile(File):
+    """Lets the file system storage move the partial file into place instead of copying it."""
+
+    def temporary_file_path(self):
+        return self.name
+
+
+def finish_upload(session_id, student):
+    """Turn a complete upload into the student's ``Submission``."""
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().filter(pk=session_id, student=student).first()
+        if session is None:
+            raise UploadError("Upload not found.", status=404)
+        if session.received != session.size:
+            raise UploadError(f"Only {session.received} of {session.size} bytes were received.", status=409)
+
+        if session.expected_crc32 is not None and session.crc32 != session.expected_crc32:
+            problem = UploadError("The file arrived damaged (checksum mismatch); upload it again.", status=422)
+        else:
+            submission = hand_in(
+                session.assignment, student, _AssembledFile(None, partial_path(session)), session.filename
+            )
+            if submission is not None:
+                session.delete()
+                return submission
+            problem = UploadError("You have already submitted this assignment.", status=409)
+    # Outside the transaction, so raising does not bring the session back.
+    discard(session)
+    raise problem
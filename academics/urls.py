@@ -11,11 +11,18 @@ urlpatterns = [
     path("attendance/", views.attendance_summary, name="attendance_summary"),
     path("attendance/detailed/", views.attendance_detailed, name="attendance_detailed"),
     path("attendance/list/", views.attendance_list, name="attendance_list"),
+    path("attendance/calendar/", views.attendance_calendar, name="attendance_calendar"),
+    path("attendance/calendar/<int:student_id>/", views.attendance_calendar, name="student_attendance_calendar"),
     path("marks/", views.marks_overview, name="marks_overview"),
     path("attendance/new/", views.attendance_create, name="attendance_create"),
+    path("attendance/roster/", views.attendance_roster, name="attendance_roster"),
     path("attendance/<int:pk>/edit/", views.attendance_edit, name="attendance_edit"),
     path("attendance/<int:pk>/delete/", views.attendance_delete, name="attendance_delete"),
     path("marks/new/", views.marks_create, name="marks_create"),
+    path("marks/grid/", views.marks_grid, name="marks_grid"),
+    path("marks/import/", views.marks_import, name="marks_import"),
+    path("marks/gradebook/", views.gradebook, name="gradebook"),
+    path("marks/analytics/", views.subject_analytics, name="subject_analytics"),
     path("marks/<int:pk>/edit/", views.marks_edit, name="marks_edit"),
     path("marks/<int:pk>/delete/", views.marks_delete, name="marks_delete"),
     path("assignments/new/", views.assignment_create, name="assignment_create"),
@@ -24,5 +31,12 @@ urlpatterns = [
     path("submissions/new/", views.submission_create, name="submission_create"),
     path("assignments/", views.assignment_list, name="assignment_list"),
     path("assignments/<int:assignment_id>/submit/", views.student_submit_assignment, name="student_submit_assignment"),
+    path("assignments/<int:assignment_id>/uploads/", views.submission_upload_start, name="submission_upload_start"),
+    path("uploads/<uuid:upload_id>/", views.submission_upload_chunk, name="submission_upload_chunk"),
+    path("uploads/<uuid:upload_id>/finalize/", views.submission_upload_finish, name="submission_upload_finish"),
+    path("assignments/<int:assignment_id>/grade/", views.submission_grading, name="submission_grading"),
+    path("assignments/<int:assignment_id>/submissions.zip", views.submission_download_all, name="submission_download_all"),
     path("submissions/", views.submission_list, name="submission_list"),
+    path("submissions/<int:pk>/file/", views.submission_file, name="submission_file"),
+    path("export/<str:kind>/", views.export_records, name="export_records"),
 ]
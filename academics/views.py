@@ -1,11 +1,74 @@
+import io
+from itertools import groupby
+from operator import attrgetter
+
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+from django.views.decorators.http import require_http_methods
 
+from dashboard.stats import invalidate_dashboards
 from users.models import Profile
 
-from .forms import AssignmentForm, AttendanceForm, MarksForm, SubmissionForm, SubjectFacultyAssignmentForm
-from .models import Assignment, Attendance, Marks, Student, Subject, Submission
+from .analytics import invalidate_subject_statistics, subject_statistics
+from .archive import archive_model
+from .audit import mark_history, record, record_deletion, record_update, snapshot, update_row
+from .exports import EXPORTS, export_queryset, iter_csv
+from .forms import (
+    AssignmentForm,
+    AttendanceForm,
+    AttendanceRosterForm,
+    DateWindowForm,
+    GradebookForm,
+    MarksForm,
+    MarksGridForm,
+    MarksImportForm,
+    SubjectAnalyticsForm,
+    SubjectFacultyAssignmentForm,
+    SubmissionForm,
+    clean_grades,
+)
+from .gradebook import ASSESSMENTS, gradebook_rows
+from .grading import invalidate_results
+from .heatmap import MAX_MONTHS, calendar_days, invalidate_calendar, month_end, months_between
+from .imports import REQUIRED_COLUMNS, import_marks
+from .models import (
+    ArchivedSubmission,
+    Assignment,
+    Attendance,
+    AttendanceMonth,
+    AttendanceRollup,
+    Enrollment,
+    Marks,
+    SimilarityMatch,
+    Student,
+    Subject,
+    Submission,
+    Term,
+    UploadSession,
+    attendance_percentage,
+)
+from .pagination import DEFAULT_PER_PAGE, InvalidCursor, KeysetPaginator
+from .rollups import refresh_attendance_rollups
+from .scoping import scope_attendance, scope_marks, scope_submissions
+from .serving import serve_file
+from .storage import is_blob
+from .submissions import create_pending_submissions, hand_in
+from .uploads import (
+    CHUNK_SIZE,
+    MAX_SUBMISSION_SIZE,
+    UploadError,
+    finish_upload,
+    start_upload,
+    write_chunk,
+)
+from .zipstream import entry_name, iter_submission_zip
 
 
 @login_required
@@ -17,74 +80,196 @@ def subject_list(request):
     })
 
 
+def _student_label(row):
+    """Mirror ``Student.__str__`` for rows aggregated with ``by_student()``."""
+    full_name = f"{row['student__user__first_name']} {row['student__user__last_name']}".strip()
+    return f"{row['student__registration_number']} - {full_name or row['student__user__username']}"
+
+
 @login_required
 def attendance_summary(request):
-    summary = (
-        Attendance.objects.select_related("subject")
-        .values("subject__code", "subject__name")
-        .order_by("subject__code")
-    )
-    total_by_subject = {}
-    for record in summary:
-        key = f"{record['subject__code']} - {record['subject__name']}"
-        total_by_subject.setdefault(key, {"present": 0, "absent": 0})
+    """Attendance totals by subject and by student in a fixed number of queries.
 
-    queryset = Attendance.objects.select_related("subject", "student")
+    Without a term or date window the totals come from the attendance rollups,
+    which cover every open term; otherwise they are aggregated from the raw
+    (or, for an archived term, the archived) records instead.
+    """
+    window_form = DateWindowForm(request.GET or None)
+    start, end = window_form.window()
+    term = window_form.selected_term()
+    student_profile = None
     user_role = _get_user_role(request.user)
     if user_role == Profile.Roles.STUDENT:
         student_profile = getattr(request.user, "student_profile", None)
-        if student_profile:
-            queryset = queryset.filter(student=student_profile)
-    for att in queryset:
-        key = f"{att.subject.code} - {att.subject.name}"
-        if att.status == Attendance.Status.PRESENT:
-            total_by_subject[key]["present"] += 1
-        else:
-            total_by_subject[key]["absent"] += 1
-    
-    # Calculate percentages by student
-    student_percentages = {}
-    if user_role == Profile.Roles.STUDENT:
-        student_profile = getattr(request.user, "student_profile", None)
-        if student_profile:
-            students = [student_profile]
-        else:
-            students = []
+
+    if term or start or end:
+        records, _ = _term_records(Attendance, window_form)
+        records = window_form.apply(records)
+        if user_role == Profile.Roles.STUDENT:
+            records = records.filter(student=student_profile)
+        subject_rows = records.by_subject()
+        student_rows = records.by_student().with_percentages()
     else:
-        students = Student.objects.all()
-    
-    for student in students:
-        student_records = Attendance.objects.filter(student=student)
-        total = student_records.count()
-        if total > 0:
-            present_count = student_records.filter(status=Attendance.Status.PRESENT).count()
-            percentage = (present_count / total) * 100
-            student_percentages[student] = {
-                "total": total,
-                "present": present_count,
-                "percentage": round(percentage, 2)
-            }
-    
+        rollups = AttendanceRollup.objects.all()
+        if user_role == Profile.Roles.STUDENT:
+            rollups = rollups.filter(student=student_profile)
+        totals = {"present": Sum("present_count"), "total": Sum("total_count")}
+        subject_rows = (
+            rollups.values("subject_id", "subject__code", "subject__name")
+            .annotate(**totals)
+            .order_by("subject__code")
+        )
+        student_rows = (
+            rollups.values(
+                "student_id",
+                "student__registration_number",
+                "student__user__username",
+                "student__user__first_name",
+                "student__user__last_name",
+            )
+            .annotate(**totals)
+            .filter(total__gt=0)
+            .annotate(percentage=attendance_percentage())
+            .order_by("student__registration_number")
+        )
+
+    total_by_subject = {}
+    for row in subject_rows:
+        key = f"{row['subject__code']} - {row['subject__name']}"
+        total_by_subject[key] = {"present": row["present"], "absent": row["total"] - row["present"]}
+
+    student_percentages = {}
+    for row in student_rows:
+        student_percentages[_student_label(row)] = {
+            "total": row["total"],
+            "present": row["present"],
+            "percentage": row["percentage"],
+        }
+
     return render(
         request,
         "academics/attendance_summary.html",
-        {"summary": total_by_subject, "student_percentages": student_percentages},
+        {"summary": total_by_subject, "student_percentages": student_percentages, "window_form": window_form},
     )
 
 
+@login_required
+def attendance_calendar(request, student_id=None):
+    """Per-day present/absent counts for one student as JSON, for the calendar heatmap.
+
+    ``start``/``end`` default to the current month and ``subject`` narrows the
+    counts to one subject. Students may only fetch their own calendar.
+    """
+    role = _get_user_role(request.user)
+    if role == Profile.Roles.STUDENT:
+        student = getattr(request.user, "student_profile", None)
+        if student is None or student_id not in (None, student.pk):
+            raise Http404("Student not found.")
+    elif role in (Profile.Roles.FACULTY, Profile.Roles.ADMIN) and student_id is not None:
+        student = get_object_or_404(Student, pk=student_id)
+    else:
+        raise Http404("Student not found.")
+
+    window_form = DateWindowForm(request.GET or None)
+    if window_form.is_bound and not window_form.is_valid():
+        return JsonResponse({"errors": window_form.errors}, status=400)
+    start, end = window_form.window()
+    start = start or (end or timezone.localdate()).replace(day=1)
+    end = end or month_end(start.replace(day=1))
+    if len(months_between(start, end)) > MAX_MONTHS:
+        return JsonResponse({"errors": {"end": [f"At most {MAX_MONTHS} months at a time."]}}, status=400)
+    subject = request.GET.get("subject", "")
+    if subject and not subject.isdigit():
+        return JsonResponse({"errors": {"subject": ["Enter a subject id."]}}, status=400)
+    subject_id = int(subject) if subject else None
+
+    return JsonResponse({
+        "student": {"id": student.pk, "registration_number": student.registration_number},
+        "subject": subject_id,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "days": calendar_days(student.pk, start, end, subject_id),
+    })
+
+
 @login_required
 def marks_overview(request):
-    marks = Marks.objects.select_related("student", "subject")
-    user_role = _get_user_role(request.user)
-    if user_role == Profile.Roles.STUDENT:
-        student_profile = getattr(request.user, "student_profile", None)
-        if student_profile:
-            marks = marks.filter(student=student_profile)
-    elif user_role == Profile.Roles.FACULTY:
-        faculty_profile = getattr(request.user, "faculty_profile", None)
-        if faculty_profile:
-            marks = marks.filter(subject__faculty=faculty_profile)
-    return render(request, "academics/marks_overview.html", {"marks": marks})
+    window_form = DateWindowForm(request.GET or None, default_term=Term.objects.current())
+    marks, archived = _term_records(Marks, window_form)
+    marks = marks.select_related("student__user", "subject")
+    marks = scope_marks(marks, request.user, _get_user_role(request.user))
+    marks = window_form.apply(marks, "recorded_at__date")
+    page = _keyset_page(request, marks, MARKS_ORDERING)
+    return render(request, "academics/marks_overview.html", {
+        "marks": page,
+        "page": page,
+        "window_form": window_form,
+        "archived": archived,
+    })
+
+
+@login_required
+def gradebook(request):
+    """One subject's marks as a student × assessment table with totals, built in one query."""
+    role = _get_user_role(request.user)
+    if role not in (Profile.Roles.FACULTY, Profile.Roles.ADMIN):
+        messages.error(request, "Only faculty and admins can view the gradebook.")
+        return redirect("dashboard:home")
+    faculty = None
+    if role == Profile.Roles.FACULTY:
+        faculty = _get_faculty_for_user(request.user)
+        if faculty is None:
+            messages.error(request, "Your account has no faculty profile.")
+            return redirect("dashboard:home")
+
+    form = GradebookForm(request.GET or None, faculty=faculty)
+    rows = []
+    if form.is_valid():
+        subject = form.cleaned_data["subject"]
+        students = Student.objects.filter(semester=subject.semester)
+        if form.cleaned_data["section"]:
+            students = students.filter(section__iexact=form.cleaned_data["section"])
+        rows = list(gradebook_rows(subject, students))
+
+    return render(request, "academics/gradebook.html", {
+        "form": form,
+        "rows": rows,
+        "assessments": ASSESSMENTS,
+    })
+
+
+@login_required
+def subject_analytics(request):
+    """Class rank, percentile and score distribution for one assessment of a subject."""
+    role = _get_user_role(request.user)
+    if role not in (Profile.Roles.FACULTY, Profile.Roles.ADMIN):
+        messages.error(request, "Only faculty and admins can view subject analytics.")
+        return redirect("dashboard:home")
+    faculty = None
+    if role == Profile.Roles.FACULTY:
+        faculty = _get_faculty_for_user(request.user)
+        if faculty is None:
+            messages.error(request, "Your account has no faculty profile.")
+            return redirect("dashboard:home")
+
+    form = SubjectAnalyticsForm(request.GET or None, faculty=faculty)
+    statistics = None
+    if form.is_valid():
+        term = form.cleaned_data["term"]
+        statistics = subject_statistics(
+            form.cleaned_data["subject"].pk, form.cleaned_data["assessment_type"], term.pk if term else None
+        )
+
+    peak = max((students for _, _, students in statistics["histogram"]), default=0) if statistics else 0
+    return render(request, "academics/subject_analytics.html", {
+        "form": form,
+        "statistics": statistics,
+        "standings": sorted(statistics["standings"].values(), key=lambda row: row["rank"]) if statistics else [],
+        "histogram": [
+            (lower, upper, students, students * 100 // peak if peak else 0)
+            for lower, upper, students in (statistics["histogram"] if statistics else [])
+        ],
+    })
 
 
 def _get_faculty_for_user(user):
@@ -101,6 +286,54 @@ def _get_user_role(user):
     return None
 
 
+# Keyset orderings for the paginated list views. Each ends in a unique column
+# so every row has a stable position between requests, and each uses only
+# columns of the listed table so a composite index can serve it without a sort.
+ATTENDANCE_ORDERING = ("-date", "-created_at", "-pk")
+ATTENDANCE_MONTH_ORDERING = ("-month", "student_id", "pk")
+MARKS_ORDERING = ("-recorded_at", "-pk")
+SUBMISSION_ORDERING = ("-assignment_id", "-pk")
+
+
+def _term_records(model, window_form):
+    """All rows of ``model`` for the form's term, and whether they come from the archive.
+
+    Archived terms live in the read-only archive tables.
+    """
+    term = window_form.selected_term()
+    if term is not None and term.is_archived:
+        return archive_model(model, term).objects.all(), True
+    return model.objects.all(), False
+
+
+def _keyset_page(request, queryset, ordering, per_page=DEFAULT_PER_PAGE):
+    """Return the page addressed by ``?cursor=``, restarting from the top if it is malformed."""
+    paginator = KeysetPaginator(queryset, ordering, per_page=per_page)
+    try:
+        return paginator.page(request.GET.get("cursor"), request.GET)
+    except InvalidCursor:
+        return paginator.page(None, request.GET)
+
+
+def _attendance_page(request, attendances, per_page=DEFAULT_PER_PAGE):
+    """Keyset page of daily attendance records.
+
+    Compacted history is paged by month rows, each expanded into its daily
+    records, so a page holds roughly ``per_page`` records. It is listed
+    month by month, newest first, and student by student within a month, so
+    one month's records can run over several pages; each page is sorted by
+    date on its own.
+    """
+    if attendances.model is not AttendanceMonth:
+        return _keyset_page(request, attendances, ATTENDANCE_ORDERING, per_page)
+    page = _keyset_page(request, attendances, ATTENDANCE_MONTH_ORDERING, max(1, per_page // 20))
+    records = [day for month in page.object_list for day in month.days()]
+    records.sort(key=lambda day: day.student.registration_number)
+    records.sort(key=attrgetter("date"), reverse=True)
+    page.object_list = records
+    return page
+
+
 @login_required
 def attendance_create(request):
     faculty = _get_faculty_for_user(request.user)
@@ -120,6 +353,199 @@ def attendance_create(request):
     return render(request, "academics/attendance_form.html", {"form": form})
 
 
+def _save_attendance_roster(subject, date, faculty, statuses):
+    """Upsert one attendance row per student in a single transactional bulk insert.
+
+    ``statuses`` maps student IDs to ``Attendance.Status`` values. Rows that
+    already exist for ``(student, subject, date)`` have their status and
+    faculty overwritten instead of raising an IntegrityError.
+    """
+    term = Term.objects.containing(date)
+    records = [
+        Attendance(student_id=student_id, subject=subject, faculty=faculty, date=date, status=status, term=term)
+        for student_id, status in statuses.items()
+    ]
+    conflict_options = {"update_conflicts": True, "update_fields": ["status", "faculty"]}
+    # MySQL resolves ON DUPLICATE KEY against every unique index and rejects an explicit target.
+    if connection.features.supports_update_conflicts_with_target:
+        conflict_options["unique_fields"] = ["student", "subject", "date"]
+    with transaction.atomic():
+        Attendance.objects.bulk_create(records, batch_size=500, **conflict_options)
+        # bulk_create skips the post_save handlers that maintain the rollups and calendars.
+        refresh_attendance_rollups((student_id, subject.pk) for student_id in statuses)
+        invalidate_calendar((student_id, subject.pk, date) for student_id in statuses)
+        invalidate_dashboards(students=statuses, faculty=[faculty.pk], subjects=[subject.pk], admin=True)
+    return len(records)
+
+
+@login_required
+def attendance_roster(request):
+    """Mark attendance for a whole section of a subject in one submission."""
+    faculty = _get_faculty_for_user(request.user)
+    if _get_user_role(request.user) != Profile.Roles.FACULTY:
+        messages.error(request, "Only faculty can record attendance.")
+        return redirect("dashboard:home")
+
+    form = AttendanceRosterForm(request.POST if request.method == "POST" else request.GET or None)
+    roster = []
+    if form.is_valid():
+        subject = form.cleaned_data["subject"]
+        date = form.cleaned_data["date"]
+        students = list(
+            Student.objects.filter(section__iexact=form.cleaned_data["section"], semester=subject.semester)
+            .select_related("user")
+            .order_by("registration_number")
+        )
+        if request.method == "POST":
+            valid_statuses = set(Attendance.Status.values)
+            statuses = {}
+            for student in students:
+                status = request.POST.get(f"status_{student.pk}", Attendance.Status.ABSENT)
+                statuses[student.pk] = status if status in valid_statuses else Attendance.Status.ABSENT
+            if not statuses:
+                messages.warning(request, "No students found for that section.")
+                return redirect("academics:attendance_roster")
+            saved = _save_attendance_roster(subject, date, faculty, statuses)
+            messages.success(request, f"Attendance recorded for {saved} students in {subject.code}.")
+            return redirect("academics:attendance_list")
+
+        existing = dict(
+            Attendance.objects.filter(subject=subject, date=date, student__in=students).values_list("student_id", "status")
+        )
+        roster = [(student, existing.get(student.pk, Attendance.Status.PRESENT)) for student in students]
+
+    return render(request, "academics/attendance_roster.html", {"form": form, "roster": roster})
+
+
+def _save_marks_grid(subject, assessment_type, max_score, scores, user=None):
+    """Create or update one mark per student for an assessment in a single transaction.
+
+    ``scores`` maps student IDs to scores. A student who already has a mark
+    for this subject and assessment in the current term has their latest one
+    updated, which is recorded in the audit log as ``user``'s change.
+    """
+    # bulk_create skips the pre_save handler that files new rows under a term.
+    term = Term.objects.containing(timezone.localdate())
+    existing = {}
+    # Last term's marks stay live until it is archived; they are not this term's to overwrite.
+    for mark in Marks.objects.filter(
+        subject=subject, assessment_type=assessment_type, student_id__in=scores, term=term
+    ).order_by("recorded_at", "pk"):
+        existing[mark.student_id] = mark
+
+    to_create, to_update, audit_rows = [], [], []
+    for student_id, score in scores.items():
+        mark = existing.get(student_id)
+        if mark is None:
+            to_create.append(Marks(
+                student_id=student_id,
+                subject=subject,
+                assessment_type=assessment_type,
+                score=score,
+                max_score=max_score,
+                term=term,
+            ))
+        elif (mark.score, mark.max_score) != (score, max_score):
+            before = snapshot(mark)
+            mark.score, mark.max_score = score, max_score
+            to_update.append(mark)
+            audit_rows.append(update_row(mark, before, user))
+
+    with transaction.atomic():
+        Marks.objects.bulk_create(to_create, batch_size=500)
+        Marks.objects.bulk_update(to_update, ["score", "max_score"], batch_size=500)
+        # Bulk writes send no signals; drop the affected cached results here.
+        invalidate_results((mark.student_id, mark.term_id) for mark in to_create + to_update)
+        invalidate_subject_statistics([subject.pk])
+        invalidate_dashboards(students=(mark.student_id for mark in to_create + to_update), subjects=[subject.pk], admin=True)
+        record(audit_rows)
+    return len(to_create), len(to_update)
+
+
+@login_required
+def marks_grid(request):
+    """Enter one assessment's marks for a whole class of a subject in one submission."""
+    faculty = _get_faculty_for_user(request.user)
+    if _get_user_role(request.user) != Profile.Roles.FACULTY or faculty is None:
+        messages.error(request, "Only faculty can record marks.")
+        return redirect("dashboard:home")
+
+    # Faculty enter marks only for the subjects they teach.
+    form = MarksGridForm(request.POST if request.method == "POST" else request.GET or None, faculty=faculty)
+    grid = []
+    max_score = None
+    errors = {}
+    if form.is_valid():
+        subject = form.cleaned_data["subject"]
+        assessment_type = form.cleaned_data["assessment_type"]
+        students = Student.objects.filter(semester=subject.semester)
+        if form.cleaned_data["section"]:
+            students = students.filter(section__iexact=form.cleaned_data["section"])
+        students = list(students.select_related("user").order_by("registration_number"))
+
+        # The term _save_marks_grid files marks under; last term's stay out of the grid until archived.
+        term = Term.objects.containing(timezone.localdate())
+        existing = {}
+        for student_id, score, mark_max in (
+            Marks.objects.filter(subject=subject, assessment_type=assessment_type, student__in=students, term=term)
+            .order_by("recorded_at", "pk")
+            .values_list("student_id", "score", "max_score")
+        ):
+            existing[student_id] = score
+            max_score = mark_max
+
+        if request.method == "POST":
+            max_score, scores, errors = form.clean_scores(request.POST, students)
+            if not errors:
+                created, updated = _save_marks_grid(subject, assessment_type, max_score, scores, request.user)
+                messages.success(
+                    request,
+                    f"{subject.code} {assessment_type}: {created} marks recorded, {updated} updated.",
+                )
+                return redirect("academics:marks_overview")
+            messages.error(request, "Nothing was saved; correct the highlighted rows.")
+            max_score = request.POST.get("max_score", "")
+            existing = {student.pk: request.POST.get(f"score_{student.pk}", "") for student in students}
+
+        grid = [(student, existing.get(student.pk, ""), errors.get(student.pk)) for student in students]
+
+    return render(request, "academics/marks_grid.html", {
+        "form": form,
+        "grid": grid,
+        "max_score": max_score,
+        "max_score_error": errors.get("max_score"),
+    })
+
+
+@login_required
+def marks_import(request):
+    """Upsert marks for the faculty member's subjects from an uploaded CSV and report failing rows."""
+    faculty = _get_faculty_for_user(request.user)
+    if _get_user_role(request.user) != Profile.Roles.FACULTY or faculty is None:
+        messages.error(request, "Only faculty can record marks.")
+        return redirect("dashboard:home")
+
+    report = None
+    if request.method == "POST":
+        form = MarksImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            lines = io.TextIOWrapper(form.cleaned_data["file"].file, encoding="utf-8-sig", errors="replace", newline="")
+            report = import_marks(lines, faculty=faculty, user=request.user)
+            messages.add_message(
+                request,
+                messages.WARNING if report.failed else messages.SUCCESS,
+                f"{report.created} marks recorded, {report.updated} updated, "
+                f"{report.unchanged} unchanged, {report.failed} rows skipped.",
+            )
+    else:
+        form = MarksImportForm()
+    return render(request, "academics/marks_import.html", {
+        "form": form,
+        "report": report,
+        "columns": REQUIRED_COLUMNS,
+    })
+
+
 @login_required
 def marks_create(request):
     faculty = _get_faculty_for_user(request.user)
@@ -148,7 +574,9 @@ def assignment_create(request):
         if form.is_valid():
             assignment = form.save(commit=False)
             assignment.faculty = faculty
-            assignment.save()
+            with transaction.atomic():
+                assignment.save()
+                create_pending_submissions([assignment])
             messages.success(request, "Assignment created.")
             return redirect("academics:assignment_list")
     else:
@@ -156,14 +584,25 @@ def assignment_create(request):
     return render(request, "academics/assignment_form.html", {"form": form})
 
 
+def _pending_submission(data):
+    try:
+        assignment_id, student_id = int(data.get("assignment")), int(data.get("student"))
+    except (TypeError, ValueError):
+        return None
+    return Submission.objects.pending().filter(assignment_id=assignment_id, student_id=student_id).first()
+
+
 @login_required
 def submission_create(request):
     if _get_user_role(request.user) not in (Profile.Roles.FACULTY, Profile.Roles.ADMIN):
         messages.error(request, "Only faculty can record submissions.")
         return redirect("dashboard:home")
     if request.method == "POST":
-        form = SubmissionForm(request.POST)
+        # Recording a submission fills in the student's pending row, if there is one.
+        form = SubmissionForm(request.POST, instance=_pending_submission(request.POST))
         if form.is_valid():
+            # Lets an open grading grid see that this row's score changed.
+            form.instance.version += 1
             form.save()
             messages.success(request, "Submission recorded.")
             return redirect("academics:submission_list")
@@ -175,7 +614,6 @@ def submission_create(request):
 @login_required
 def student_submit_assignment(request, assignment_id):
     """Allow students to submit assignments with file upload."""
-    from django.utils import timezone
     
     if _get_user_role(request.user) != Profile.Roles.STUDENT:
         messages.error(request, "Only students can submit assignments.")
@@ -193,7 +631,7 @@ def student_submit_assignment(request, assignment_id):
         return redirect("academics:assignment_list")
     
     # Check if already submitted
-    existing_submission = Submission.objects.filter(
+    existing_submission = Submission.objects.handed_in().filter(
         assignment=assignment,
         student=student_profile
     ).first()
@@ -215,7 +653,7 @@ def student_submit_assignment(request, assignment_id):
         uploaded_file = request.FILES['submission_file']
         
         # Validate file size (e.g., max 10MB)
-        if uploaded_file.size > 10 * 1024 * 1024:
+        if uploaded_file.size > MAX_SUBMISSION_SIZE:
             messages.error(request, "File size must be less than 10MB.")
             return render(request, "academics/student_submit_assignment.html", {
                 "assignment": assignment,
@@ -223,24 +661,105 @@ def student_submit_assignment(request, assignment_id):
                 "error": "File too large"
             })
         
-        # Create submission with file
-        submission = Submission.objects.create(
-            assignment=assignment,
-            student=student_profile,
-            submission_file=uploaded_file,
-            submitted_on=timezone.now().date(),
-            status=Submission.SubmissionStatus.SUBMITTED if timezone.now().date() <= assignment.due_date else Submission.SubmissionStatus.LATE
-        )
+        # Turn the pending submission into a handed-in one
+        if hand_in(assignment, student_profile, uploaded_file, uploaded_file.name) is None:
+            messages.warning(request, "You have already submitted this assignment.")
+            return redirect("academics:assignment_list")
         
         messages.success(request, f"Assignment '{assignment.title}' submitted successfully with file: {uploaded_file.name}")
         return redirect("academics:assignment_list")
     
     return render(request, "academics/student_submit_assignment.html", {
         "assignment": assignment,
-        "existing_submission": existing_submission
+        "existing_submission": existing_submission,
+        "chunk_size": CHUNK_SIZE,
+        "max_size": MAX_SUBMISSION_SIZE,
     })
 
 
+def _upload_json(session):
+    return {
+        "upload_id": str(session.pk),
+        "filename": session.filename,
+        "size": session.size,
+        "received": session.received,
+        "chunk_size": CHUNK_SIZE,
+    }
+
+
+def _upload_error(exc):
+    return JsonResponse({"errors": {"upload": [str(exc)]}}, status=exc.status)
+
+
+def _student_or_404(request):
+    student = getattr(request.user, "student_profile", None)
+    if _get_user_role(request.user) != Profile.Roles.STUDENT or student is None:
+        raise Http404("Student not found.")
+    return student
+
+
+@login_required
+@require_http_methods(["POST"])
+def submission_upload_start(request, assignment_id):
+    """Start a chunked upload from ``filename``, ``size`` and an optional ``crc32``."""
+    student = _student_or_404(request)
+    assignment = get_object_or_404(Assignment, pk=assignment_id)
+    try:
+        size = int(request.POST.get("size", ""))
+        crc32 = int(request.POST["crc32"]) if request.POST.get("crc32") else None
+    except ValueError:
+        return JsonResponse({"errors": {"size": ["Enter the file size and CRC-32 as integers."]}}, status=400)
+    try:
+        session = start_upload(assignment, student, request.POST.get("filename", ""), size, crc32)
+    except UploadError as exc:
+        return _upload_error(exc)
+    return JsonResponse(_upload_json(session), status=201)
+
+
+@login_required
+@require_http_methods(["GET", "PUT"])
+def submission_upload_chunk(request, upload_id):
+    """GET how much of an upload has arrived, or PUT the next chunk at ``?offset=``."""
+    student = _student_or_404(request)
+    if request.method == "GET":
+        session = get_object_or_404(UploadSession, pk=upload_id, student=student)
+        return JsonResponse(_upload_json(session))
+
+    offset = request.GET.get("offset", "")
+    if not offset.isdigit():
+        return JsonResponse({"errors": {"offset": ["Enter the chunk's byte offset."]}}, status=400)
+    length = request.META.get("CONTENT_LENGTH")
+    length = int(length) if length and length.isdigit() else None
+    try:
+        # Reads the body straight from the socket; request.body is never touched.
+        session = write_chunk(upload_id, student, int(offset), length, request)
+    except UploadError as exc:
+        response = _upload_error(exc)
+        if exc.status == 409:
+            # Tell the client where to resume from.
+            session = UploadSession.objects.get(pk=upload_id)
+            response = JsonResponse({"errors": {"offset": [str(exc)]}, **_upload_json(session)}, status=409)
+        return response
+    return JsonResponse(_upload_json(session))
+
+
+@login_required
+@require_http_methods(["POST"])
+def submission_upload_finish(request, upload_id):
+    """Create the submission from a fully received upload."""
+    student = _student_or_404(request)
+    try:
+        submission = finish_upload(upload_id, student)
+    except UploadError as exc:
+        return _upload_error(exc)
+    messages.success(request, f"Assignment '{submission.assignment.title}' submitted successfully.")
+    return JsonResponse({
+        "submission_id": submission.pk,
+        "status": submission.status,
+        "redirect": reverse("academics:assignment_list"),
+    }, status=201)
+
+
 @login_required
 def assignment_list(request):
     assignments = Assignment.objects.select_related("subject", "faculty")
@@ -254,12 +773,14 @@ def assignment_list(request):
     elif role == Profile.Roles.STUDENT:
         student_profile = getattr(request.user, "student_profile", None)
         if student_profile:
-            assignments = assignments.filter(subject__attendance_records__student=student_profile).distinct()
+            assignments = assignments.filter(
+                subject__in=Enrollment.objects.filter(student=student_profile).values("subject")
+            )
     
     # For students, annotate each assignment with their submission
     assignments_list = list(assignments)
     if role == Profile.Roles.STUDENT and student_profile:
-        submissions = Submission.objects.filter(
+        submissions = Submission.objects.handed_in().filter(
             student=student_profile,
             assignment__in=assignments_list
         ).select_related('assignment')
@@ -278,32 +799,231 @@ def assignment_list(request):
 @login_required
 def attendance_list(request):
     """Detailed attendance list for managing individual records."""
-    attendances = Attendance.objects.select_related("student", "subject", "faculty")
+    window_form = DateWindowForm(request.GET or None, default_term=Term.objects.current())
+    attendances, archived = _term_records(Attendance, window_form)
+    attendances = scope_attendance(attendances.with_related(), request.user, _get_user_role(request.user))
+    attendances = window_form.apply(attendances)
+    page = _attendance_page(request, attendances)
+    return render(request, "academics/attendance_list.html", {
+        "attendances": page,
+        "page": page,
+        "window_form": window_form,
+        "archived": archived,
+    })
+
+
+@login_required
+def export_records(request, kind):
+    """Stream a CSV export of the attendance, marks or submissions the user may see."""
+    if kind not in EXPORTS:
+        raise Http404("Unknown export.")
+    # Same default term as the listings, so the export matches what was on screen.
+    window_form = DateWindowForm(request.GET or None, default_term=Term.objects.current())
+    start, end = window_form.window()
+    queryset = export_queryset(
+        kind, request.user, _get_user_role(request.user), start, end, window_form.selected_term()
+    )
+    response = StreamingHttpResponse(iter_csv(kind, queryset), content_type="text/csv; charset=utf-8")
+    filename = f"{kind}-{timezone.localdate():%Y%m%d}.csv"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+def _managed_assignment(request, assignment_id):
+    """The assignment, if the user is its faculty or an admin; 404 otherwise."""
+    assignment = get_object_or_404(Assignment.objects.select_related("subject"), pk=assignment_id)
     role = _get_user_role(request.user)
     if role == Profile.Roles.FACULTY:
-        faculty_profile = getattr(request.user, "faculty_profile", None)
-        if faculty_profile:
-            attendances = attendances.filter(faculty=faculty_profile)
-    elif role == Profile.Roles.STUDENT:
-        student_profile = getattr(request.user, "student_profile", None)
-        if student_profile:
-            attendances = attendances.filter(student=student_profile)
-    return render(request, "academics/attendance_list.html", {"attendances": attendances})
+        if assignment.faculty_id != getattr(_get_faculty_for_user(request.user), "pk", None):
+            raise Http404("No such assignment.")
+    elif role != Profile.Roles.ADMIN:
+        raise Http404("No such assignment.")
+    return assignment
+
+
+def _save_grades(assignment, grades):
+    """Write ``{submission id: (score, remarks, version)}`` in one transaction.
+
+    A row whose version moved on since the grid was loaded is left alone and
+    reported back, so two people grading at once never overwrite each other
+    unknowingly. Returns ``(saved, conflicting ids)``.
+    """
+    with transaction.atomic():
+        current = Submission.objects.select_for_update().filter(assignment=assignment, pk__in=grades).in_bulk()
+        to_update, conflicts = [], []
+        for pk, (score, remarks, version) in grades.items():
+            submission = current.get(pk)
+            if submission is None or submission.version != version:
+                conflicts.append(pk)
+                continue
+            submission.score, submission.remarks, submission.version = score, remarks, version + 1
+            to_update.append(submission)
+        Submission.objects.bulk_update(to_update, ["score", "remarks", "version"], batch_size=500)
+    return len(to_update), conflicts
+
+
+@login_required
+def submission_grading(request, assignment_id):
+    """Grade every submission of an assignment in one grid and one save."""
+    assignment = _managed_assignment(request, assignment_id)
+    submissions = Submission.objects.filter(assignment=assignment).select_related("student__user")
+    rows = list(submissions.order_by("student__registration_number"))
+
+    posted, errors = {}, {}
+    if request.method == "POST":
+        grades, errors = clean_grades(request.POST, rows, assignment.max_score)
+        if not errors:
+            saved, conflicts = _save_grades(assignment, grades)
+            if not conflicts:
+                messages.success(request, f"Saved grades for {saved} submissions of '{assignment.title}'.")
+                return redirect("academics:submission_grading", assignment_id=assignment.pk)
+            messages.warning(
+                request,
+                f"Saved {saved} grades. {len(conflicts)} were changed by someone else after you opened "
+                "the grid and were not saved; check them and save again to overwrite.",
+            )
+            errors = {pk: "Changed by someone else since you opened the grid." for pk in conflicts}
+            # Reload; the conflicting rows keep what was typed over the new
+            # version, so saving again is a deliberate overwrite.
+            posted = dict.fromkeys(conflicts, ("score", "remarks"))
+            rows = list(submissions.order_by("student__registration_number"))
+        else:
+            messages.error(request, "Nothing was saved; correct the highlighted rows.")
+            posted = dict.fromkeys(
+                (submission.pk for submission in rows),
+                ("score", "remarks", "initial_score", "initial_remarks", "version"),
+            )
+
+    _flag_exact_copies(rows)
+    _attach_near_duplicates(rows, scope_submissions(Submission.objects.all(), request.user, _get_user_role(request.user)))
+    grid = []
+    for submission in rows:
+        initial = {
+            "score": "" if submission.score is None else submission.score,
+            "remarks": submission.remarks,
+            "initial_score": "" if submission.score is None else submission.score,
+            "initial_remarks": submission.remarks,
+            "version": submission.version,
+        }
+        for key in posted.get(submission.pk, ()):
+            initial[key] = request.POST.get(f"{key}_{submission.pk}", initial[key])
+        grid.append((submission, initial, errors.get(submission.pk)))
+
+    return render(request, "academics/submission_grading.html", {
+        "assignment": assignment,
+        "grid": grid,
+        "graded": sum(submission.score is not None for submission in rows),
+    })
+
+
+@login_required
+def submission_download_all(request, assignment_id):
+    """Stream a ZIP of every file submitted to an assignment, named by registration number."""
+    assignment = _managed_assignment(request, assignment_id)
+    response = StreamingHttpResponse(iter_submission_zip(assignment), content_type="application/zip")
+    filename = get_valid_filename(f"{assignment.subject.code}-{assignment.title}-submissions.zip")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+@login_required
+def submission_file(request, pk):
+    """Send a submission's file to its student, the assignment's faculty or an admin."""
+    submission = (
+        Submission.objects.select_related("assignment", "student").filter(pk=pk).first()
+        or ArchivedSubmission.objects.select_related("assignment", "student").filter(pk=pk).first()
+    )
+    if submission is None or not submission.submission_file:
+        raise Http404("No such file.")
+    role = _get_user_role(request.user)
+    if role == Profile.Roles.STUDENT:
+        allowed = submission.student.user_id == request.user.pk
+    elif role == Profile.Roles.FACULTY:
+        allowed = submission.assignment.faculty_id == getattr(_get_faculty_for_user(request.user), "pk", None)
+    else:
+        allowed = role == Profile.Roles.ADMIN
+    if not allowed:
+        raise Http404("No such file.")
+    field_file = submission.submission_file
+    filename = entry_name(submission.student.registration_number, field_file.name)
+    try:
+        return serve_file(request, field_file.storage, field_file.name, filename)
+    except FileNotFoundError:
+        raise Http404("No such file.")
+
+
+def _flag_exact_copies(submissions):
+    """Set ``copies`` on each submission: how many others to the same assignment share its exact file.
+
+    Stored files are named by their content hash, so this is one grouped
+    query on the file names rather than a comparison of the files.
+    """
+    submissions = list(submissions)
+    for submission in submissions:
+        submission.copies = 0
+    names = {submission.submission_file.name for submission in submissions if is_blob(submission.submission_file.name)}
+    if not names:
+        return
+    model = type(submissions[0])
+    shared = (
+        model.objects.filter(
+            assignment_id__in={submission.assignment_id for submission in submissions},
+            submission_file__in=names,
+        )
+        .values_list("assignment_id", "submission_file")
+        .annotate(count=Count("pk"))
+        .filter(count__gt=1)
+    )
+    counts = {(assignment_id, name): count for assignment_id, name, count in shared}
+    for submission in submissions:
+        submission.copies = counts.get((submission.assignment_id, submission.submission_file.name), 1) - 1
+
+
+def _attach_near_duplicates(submissions, visible):
+    """Set ``similar`` on each submission: its indexed near-duplicates, most similar first.
+
+    Only matches among ``visible``, the submissions the viewer may see, are
+    attached, so nobody learns the names of students outside their classes.
+    """
+    submissions = list(submissions)
+    matches = {}
+    # Archived submissions drop out of the similarity index.
+    if submissions and isinstance(submissions[0], Submission):
+        rows = (
+            SimilarityMatch.objects.filter(
+                submission_id__in=[submission.pk for submission in submissions],
+                match__in=visible,
+            )
+            .select_related("match__student__user")
+            .order_by("submission_id", "-similarity")
+        )
+        for row in rows:
+            matches.setdefault(row.submission_id, []).append(row)
+    for submission in submissions:
+        submission.similar = matches.get(submission.pk, [])
 
 
 @login_required
 def submission_list(request):
-    submissions = Submission.objects.select_related("assignment", "student", "assignment__subject")
+    window_form = DateWindowForm(request.GET or None, default_term=Term.objects.current())
+    submissions, archived = _term_records(Submission, window_form)
+    submissions = submissions.select_related("assignment__subject", "student__user")
     role = _get_user_role(request.user)
-    if role == Profile.Roles.FACULTY:
-        faculty_profile = getattr(request.user, "faculty_profile", None)
-        if faculty_profile:
-            submissions = submissions.filter(assignment__faculty=faculty_profile)
-    elif role == Profile.Roles.STUDENT:
-        student_profile = getattr(request.user, "student_profile", None)
-        if student_profile:
-            submissions = submissions.filter(student=student_profile)
-    return render(request, "academics/submission_list.html", {"submissions": submissions})
+    submissions = scope_submissions(submissions, request.user, role)
+    submissions = window_form.apply(submissions, "submitted_on")
+    page = _keyset_page(request, submissions, SUBMISSION_ORDERING)
+    # Copy and similarity flags name or count other students' work; they are for markers only.
+    reviewing = role in (Profile.Roles.FACULTY, Profile.Roles.ADMIN)
+    if reviewing:
+        _flag_exact_copies(page.object_list)
+        _attach_near_duplicates(page.object_list, scope_submissions(Submission.objects.all(), request.user, role))
+    return render(request, "academics/submission_list.html", {
+        "submissions": page,
+        "page": page,
+        "window_form": window_form,
+        "archived": archived,
+        "reviewing": reviewing,
+    })
 
 
 @login_required
@@ -343,14 +1063,22 @@ def marks_edit(request, pk):
         messages.error(request, "Only faculty can edit marks.")
         return redirect("dashboard:home")
     if request.method == "POST":
+        # Validation writes the posted values onto the instance; keep the originals.
+        before = snapshot(mark)
         form = MarksForm(request.POST, instance=mark)
         if form.is_valid():
-            form.save()
+            with transaction.atomic():
+                form.save()
+                record_update(mark, before, request.user)
             messages.success(request, "Marks updated.")
             return redirect("academics:marks_overview")
     else:
         form = MarksForm(instance=mark)
-    return render(request, "academics/marks_form.html", {"form": form, "edit_mode": True})
+    return render(request, "academics/marks_form.html", {
+        "form": form,
+        "edit_mode": True,
+        "history": mark_history(pk),
+    })
 
 
 @login_required
@@ -360,7 +1088,9 @@ def marks_delete(request, pk):
         messages.error(request, "Only faculty can delete marks.")
         return redirect("dashboard:home")
     if request.method == "POST":
-        mark.delete()
+        with transaction.atomic():
+            record_deletion(mark, request.user)
+            mark.delete()
         messages.success(request, "Marks deleted.")
         return redirect("academics:marks_overview")
     return render(request, "academics/marks_confirm_delete.html", {"mark": mark})
@@ -445,42 +1175,38 @@ def attendance_detailed(request):
     """Detailed attendance view showing individual records with date/time for all roles."""
     user_role = _get_user_role(request.user)
     
-    # Base queryset with all related data
-    attendances = Attendance.objects.select_related(
-        "student__user", "subject", "faculty__user"
-    ).order_by("-created_at")
-    
-    # Filter based on user role
-    if user_role == Profile.Roles.STUDENT:
-        student_profile = getattr(request.user, "student_profile", None)
-        if student_profile:
-            attendances = attendances.filter(student=student_profile)
-        else:
-            attendances = Attendance.objects.none()
-    elif user_role == Profile.Roles.FACULTY:
-        faculty_profile = getattr(request.user, "faculty_profile", None)
-        if faculty_profile:
-            attendances = attendances.filter(faculty=faculty_profile)
-        else:
-            attendances = Attendance.objects.none()
-    # Admin sees all records
-    
-    # Group by date for better organization
-    attendance_by_date = {}
-    for attendance in attendances:
-        date_key = attendance.date
-        if date_key not in attendance_by_date:
-            attendance_by_date[date_key] = []
-        attendance_by_date[date_key].append(attendance)
-    
-    # Sort dates in descending order
-    sorted_dates = sorted(attendance_by_date.keys(), reverse=True)
-    
+    window_form = DateWindowForm(request.GET or None, default_term=Term.objects.current())
+    start, end = window_form.window()
+    term = window_form.selected_term()
+
+    # Base queryset with all related data, narrowed to what the role may see
+    attendances, archived = _term_records(Attendance, window_form)
+    attendances = scope_attendance(attendances.with_related(), request.user, user_role)
+    attendances = window_form.apply(attendances)
+    page = _attendance_page(request, attendances, per_page=100)
+
+    # The page arrives ordered by date, so grouping is a single pass.
+    attendance_by_date = [
+        (date, list(records)) for date, records in groupby(page, key=attrgetter("date"))
+    ]
+
+    # The overall total comes from the rollups; it is only known across all
+    # open terms, without a date window and when the listing is not narrowed
+    # to one faculty member.
+    total_records = None
+    if not (term or start or end) and user_role != Profile.Roles.FACULTY:
+        rollups = AttendanceRollup.objects.all()
+        if user_role == Profile.Roles.STUDENT:
+            rollups = rollups.filter(student=getattr(request.user, "student_profile", None))
+        total_records = rollups.aggregate(total=Sum("total_count"))["total"] or 0
+
     context = {
         "attendance_by_date": attendance_by_date,
-        "sorted_dates": sorted_dates,
+        "page": page,
+        "window_form": window_form,
+        "archived": archived,
         "user_role": user_role,
-        "total_records": attendances.count(),
+        "total_records": total_records,
     }
     
     return render(request, "academics/attendance_detailed.html", context)
@@ -0,0 +1,85 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from academics.models import Assignment, Attendance, Enrollment, Faculty, Marks, Student, Subject, Submission
+from dashboard.stats import invalidate_dashboards
+from users.models import Profile
+
+
+@receiver(post_save, sender=Attendance)
+@receiver(post_delete, sender=Attendance)
+def invalidate_on_attendance(sender, instance, **kwargs):
+	"""Retire the dashboards of the student, the recording faculty and the subject."""
+	students, subjects = {instance.student_id}, {instance.subject_id}
+	# Set by academics.signals when an edit moved the record.
+	previous = getattr(instance, "_previous_key", None)
+	if previous:
+		students.add(previous[0])
+		subjects.add(previous[1])
+	invalidate_dashboards(students=students, faculty=[instance.faculty_id], subjects=subjects, admin=True)
+
+
+@receiver(post_save, sender=Marks)
+@receiver(post_delete, sender=Marks)
+def invalidate_on_mark(sender, instance, **kwargs):
+	"""Retire the dashboards of the student and the subject's faculty."""
+	students, subjects = {instance.student_id}, {instance.subject_id}
+	previous = getattr(instance, "_previous_mark", None)
+	if previous:
+		students.add(previous[0])
+		subjects.add(previous[2])
+	invalidate_dashboards(students=students, subjects=subjects, admin=True)
+
+
+@receiver(post_save, sender=Assignment)
+@receiver(post_delete, sender=Assignment)
+def invalidate_on_assignment(sender, instance, **kwargs):
+	"""Retire the setting faculty's dashboard and the counts of everyone taking the subject."""
+	invalidate_dashboards(
+		faculty=[instance.faculty_id],
+		subjects=[instance.subject_id],
+		assignment_subjects=[instance.subject_id],
+		admin=True,
+	)
+
+
+@receiver(post_save, sender=Submission)
+@receiver(post_delete, sender=Submission)
+def invalidate_on_submission(sender, instance, **kwargs):
+	"""Retire the dashboards of the student and the faculty who set the assignment."""
+	faculty_id = Assignment.objects.filter(pk=instance.assignment_id).values_list("faculty_id", flat=True).first()
+	invalidate_dashboards(students=[instance.student_id], faculty=[faculty_id])
+
+
+@receiver(post_save, sender=Enrollment)
+@receiver(post_delete, sender=Enrollment)
+def invalidate_on_enrollment(sender, instance, **kwargs):
+	"""Retire the dashboards of the student and the subject's faculty."""
+	invalidate_dashboards(students=[instance.student_id], subjects=[instance.subject_id], admin=True)
+
+
+@receiver(post_save, sender=Subject)
+@receiver(post_delete, sender=Subject)
+def invalidate_on_subject(sender, instance, **kwargs):
+	"""A subject changing hands changes both faculty members' dashboards."""
+	invalidate_dashboards(faculty=[instance.faculty_id], subjects=[instance.pk], admin=True)
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+@receiver(post_save, sender=Faculty)
+@receiver(post_delete, sender=Faculty)
+def invalidate_on_person(sender, instance, **kwargs):
+	"""Students and faculty are counted on the admin dashboard."""
+	invalidate_dashboards(admin=True)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_on_profile(sender, instance, **kwargs):
+	"""Retire the user's own dashboard and the admin's pending approvals count."""
+	invalidate_dashboards(
+		students=Student.objects.filter(user_id=instance.user_id).values_list("pk", flat=True),
+		faculty=Faculty.objects.filter(user_id=instance.user_id).values_list("pk", flat=True),
+		admin=True,
+	)
@@ -0,0 +1,117 @@
+"""
+Cached stats blocks of the student, faculty and admin dashboards.
+
+A student's or faculty member's block is cached under the role and their
+Student or Faculty ID. The admin block is the same for every admin and is
+cached once. Each entry records the version keys it was computed under:
+its owner's, plus one per subject it draws on. ``invalidate_dashboards``
+is called by ``dashboard.signals`` and by the bulk write paths that send
+no signals. It bumps the versions of just the students, faculty and
+subjects a write touched, once the write commits, so every other entry
+stays valid.
+
+An entry whose versions have moved on, or that is older than
+``FRESH_FOR``, is recomputed by a single request: the one that takes the
+entry's lock with ``cache.add``. Requests arriving in the meantime get the
+stale entry rather than running the same queries again. With nothing
+cached yet they wait up to ``LOCK_WAIT`` seconds for it. Besides ``get``
+and ``set`` only ``add``, ``incr`` and ``get_many`` are used, so the locmem,
+file, database, memcached and Redis caches all work.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+FRESH_FOR = 300
+ENTRY_TIMEOUT = 24 * 60 * 60
+LOCK_TIMEOUT = 30
+LOCK_WAIT = 2.0
+_POLL_INTERVAL = 0.05
+
+
+def version_key(scope, pk=None):
+	return f"dashboard-version:{scope}" if pk is None else f"dashboard-version:{scope}:{pk}"
+
+
+def _entry_key(role, owner_id):
+	return f"dashboard-stats:{role}:{owner_id}"
+
+
+def _versions(keys):
+	"""Current values of the version ``keys``, starting any that are missing."""
+	versions = cache.get_many(keys)
+	missing = [key for key in keys if key not in versions]
+	if missing:
+		# Not 1: a version that was evicted must not restart at a value an entry recorded.
+		start = time.time_ns()
+		for key in missing:
+			cache.add(key, start, timeout=None)
+		versions.update(cache.get_many(missing))
+	return [versions.get(key) for key in keys]
+
+
+def _bump(keys):
+	for key in keys:
+		try:
+			cache.incr(key)
+		except ValueError:
+			cache.set(key, time.time_ns(), timeout=None)
+
+
+def invalidate_dashboards(students=(), faculty=(), subjects=(), assignment_subjects=(), admin=False):
+	"""Retire the cached dashboard stats that depend on the given rows.
+
+	``students`` and ``faculty`` are Student and Faculty IDs, ``subjects``
+	the subjects whose faculty dashboards change, ``assignment_subjects``
+	the subjects whose assignment counts on student dashboards change, and
+	``admin`` retires the shared admin block.
+	"""
+	keys = {version_key("student", pk) for pk in students if pk is not None}
+	keys.update(version_key("faculty", pk) for pk in faculty if pk is not None)
+	keys.update(version_key("subject", pk) for pk in subjects if pk is not None)
+	keys.update(version_key("assignments", pk) for pk in assignment_subjects if pk is not None)
+	if admin:
+		keys.add(version_key("admin"))
+	if keys:
+		# After the commit, so a request recomputing in between cannot cache the old rows as new.
+		transaction.on_commit(lambda: _bump(keys))
+
+
+def _refresh(key, dependencies, compute):
+	keys = dependencies()
+	# Read before computing: a write landing meanwhile leaves the entry already stale.
+	versions = _versions(keys)
+	value = compute()
+	entry = {"value": value, "keys": keys, "versions": versions, "fresh_until": time.time() + FRESH_FOR}
+	cache.set(key, entry, timeout=ENTRY_TIMEOUT)
+	return value
+
+
+def cached_stats(role, owner_id, dependencies, compute):
+	"""One dashboard's stats block, from the cache while it is current.
+
+	``dependencies()`` returns the version keys the block draws on and
+	``compute()`` builds it. Both run only when the block is recomputed.
+	"""
+	key = _entry_key(role, owner_id)
+	entry = cache.get(key)
+	if entry is not None and entry["fresh_until"] > time.time() and _versions(entry["keys"]) == entry["versions"]:
+		return entry["value"]
+
+	lock = f"{key}:lock"
+	if cache.add(lock, True, timeout=LOCK_TIMEOUT):
+		try:
+			return _refresh(key, dependencies, compute)
+		finally:
+			cache.delete(lock)
+	if entry is not None:
+		# Someone else is recomputing it; the previous figures will do until then.
+		return entry["value"]
+	deadline = time.monotonic() + LOCK_WAIT
+	while time.monotonic() < deadline:
+		time.sleep(_POLL_INTERVAL)
+		entry = cache.get(key)
+		if entry is not None:
+			return entry["value"]
+	return _refresh(key, dependencies, compute)
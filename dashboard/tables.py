@@ -0,0 +1,125 @@
+"""
+JSON tables behind the admin dashboard's student, faculty and user lists.
+
+The dashboard page only renders empty tables; each one fetches its rows from
+``dashboard:admin_table`` when it scrolls into view. A page is one query: the
+rows are joined to their user and profile with ``select_related`` and
+addressed with the keyset cursors of ``academics.pagination``, so the first
+page and the hundredth cost the same whatever the number of users. Search is
+applied on the server, and each sort is an index-backed ordering ending in a
+unique column.
+"""
+from dataclasses import dataclass
+
+from django.db.models import Count, Q
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.formats import date_format
+
+from academics.models import Faculty, Student
+from users.models import Profile
+
+MAX_PER_PAGE = 100
+DEFAULT_PER_PAGE = 25
+
+
+@dataclass(frozen=True)
+class Table:
+	queryset: object
+	search_fields: tuple
+	orderings: dict
+	row: object
+
+
+def _joined(value):
+	return date_format(timezone.localtime(value), "M d, Y H:i")
+
+
+def _person(user):
+	return {
+		"name": user.get_full_name() or user.username,
+		"username": user.username,
+	}
+
+
+def _is_approved(user):
+	profile = getattr(user, "profile", None)
+	return bool(profile and profile.is_approved)
+
+
+def _student_row(student):
+	return {
+		**_person(student.user),
+		"registration_number": student.registration_number,
+		"batch": student.batch,
+		"semester": student.semester,
+		"joined": _joined(student.created_at),
+		"is_approved": _is_approved(student.user),
+	}
+
+
+def _faculty_row(faculty):
+	return {
+		**_person(faculty.user),
+		"employee_number": faculty.employee_number,
+		"department": faculty.department,
+		"joined": _joined(faculty.created_at),
+		"is_approved": _is_approved(faculty.user),
+		"subjects": faculty.subject_count,
+	}
+
+
+def _user_row(profile):
+	return {
+		**_person(profile.user),
+		"role": profile.role,
+		"role_display": profile.get_role_display(),
+		"joined": _joined(profile.created_at),
+		"is_approved": profile.is_approved,
+		"approve_url": reverse("users:approve_user", args=[profile.user_id]),
+		"edit_url": reverse("admin:users_profile_change", args=[profile.pk]),
+	}
+
+
+_PERSON_SEARCH = ("user__username__icontains", "user__first_name__icontains", "user__last_name__icontains", "user__email__icontains")
+
+TABLES = {
+	"students": Table(
+		queryset=lambda: Student.objects.select_related("user__profile"),
+		search_fields=("registration_number__istartswith",) + _PERSON_SEARCH,
+		orderings={
+			"joined": ("-created_at", "-pk"),
+			"registration": ("registration_number",),
+		},
+		row=_student_row,
+	),
+	"faculty": Table(
+		queryset=lambda: Faculty.objects.select_related("user__profile").annotate(subject_count=Count("subjects")),
+		search_fields=("employee_number__istartswith", "department__iexact") + _PERSON_SEARCH,
+		orderings={
+			"joined": ("-created_at", "-pk"),
+			"employee": ("employee_number",),
+		},
+		row=_faculty_row,
+	),
+	"users": Table(
+		queryset=lambda: Profile.objects.select_related("user"),
+		search_fields=("role__iexact",) + _PERSON_SEARCH,
+		orderings={
+			"joined": ("-created_at", "-pk"),
+			"role": ("role", "-created_at", "-pk"),
+		},
+		row=_user_row,
+	),
+}
+
+
+def search(table, queryset, term):
+	"""Rows of ``queryset`` with any of ``table``'s search fields matching ``term``."""
+	term = term.strip()
+	if not term:
+		return queryset
+	condition = Q()
+	for lookup in table.search_fields:
+		condition |= Q(**{lookup: term})
+	return queryset.filter(condition)
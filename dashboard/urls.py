@@ -6,4 +6,5 @@ app_name = "dashboard"
 
 urlpatterns = [
     path("", views.home, name="home"),
+    path("tables/<slug:table>/", views.admin_table, name="admin_table"),
 ]
@@ -1,10 +1,44 @@
-from django.contrib.auth.decorators import login_required
-from django.db.models import Avg, Count, Q, Sum
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.db.models import Avg, Count, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.http import Http404, JsonResponse
 from django.shortcuts import render, redirect
 from django.utils import timezone
 
-from academics.models import Assignment, Attendance, Faculty, Marks, Student, Subject, Submission
+from academics.analytics import subject_statistics
+from academics.grading import term_results
+from academics.models import (
+	Assignment,
+	Attendance,
+	AttendanceRollup,
+	Enrollment,
+	Faculty,
+	Marks,
+	Student,
+	Subject,
+	Submission,
+	Term,
+)
+from academics.pagination import InvalidCursor, KeysetPaginator
 from users.models import Profile
+from users.views import is_admin
+
+from .stats import cached_stats, version_key
+from .tables import DEFAULT_PER_PAGE, MAX_PER_PAGE, TABLES, search
+
+
+def _enrolled_count():
+	"""Subquery counting each subject's students enrolled in the current term."""
+	return Coalesce(
+		Subquery(
+			Enrollment.objects.current()
+			.filter(subject=OuterRef('pk'))
+			.values('subject')
+			.annotate(count=Count('pk'))
+			.values('count')
+		),
+		0,
+	)
 
 
 @login_required
@@ -34,6 +68,44 @@ def home(request):
 		return redirect('users:login')
 
 
+def _student_stats(student):
+	"""Headline figures and per-subject attendance of a student's dashboard."""
+	# Attendance percentage by subject, read from the per-subject rollups
+	rollups = AttendanceRollup.objects.filter(student=student).select_related('subject').order_by('subject__code')
+	attendance_by_subject = {}
+	for rollup in rollups:
+		attendance_by_subject[rollup.subject.code] = {
+			'subject': rollup.subject,
+			'total': rollup.total_count,
+			'present': rollup.present_count,
+			'percentage': rollup.percentage,
+		}
+	
+	enrolled = Enrollment.objects.current().filter(student=student).values('subject')
+	recent_marks = Marks.objects.filter(student=student).order_by('-recorded_at')[:10]
+	stats = {
+		'total_subjects': Subject.objects.filter(id__in=enrolled).count(),
+		'total_attendance': sum(data['total'] for data in attendance_by_subject.values()),
+		'present_count': sum(data['present'] for data in attendance_by_subject.values()),
+		'assignments': Assignment.objects.filter(subject__in=enrolled).count(),
+		'submissions': Submission.objects.handed_in().filter(student=student).count(),
+		'average_marks': recent_marks.aggregate(Avg('score'))['score__avg'] or 0,
+	}
+	
+	# Calculate overall attendance percentage
+	if stats['total_attendance'] > 0:
+		stats['attendance_percentage'] = (stats['present_count'] / stats['total_attendance']) * 100
+	else:
+		stats['attendance_percentage'] = 0
+	return stats, attendance_by_subject
+
+
+def _student_dependencies(student):
+	"""The student's own version key and the assignment keys of the subjects they take this term."""
+	subject_ids = Enrollment.objects.current().filter(student=student).values_list('subject_id', flat=True)
+	return [version_key('student', student.pk)] + [version_key('assignments', pk) for pk in subject_ids]
+
+
 @login_required
 def student_dashboard(request):
 	"""Dashboard for students showing their academic information."""
@@ -44,33 +116,33 @@ def student_dashboard(request):
 			'message': 'Student profile not found. Please contact administrator.'
 		})
 	
-	# Get student's attendance records
-	attendance_records = Attendance.objects.filter(student=student).select_related('subject', 'faculty')
-	
-	# Calculate attendance percentage by subject
-	attendance_by_subject = {}
-	for record in attendance_records:
-		subject_code = record.subject.code
-		if subject_code not in attendance_by_subject:
-			attendance_by_subject[subject_code] = {
-				'subject': record.subject,
-				'total': 0,
-				'present': 0
-			}
-		attendance_by_subject[subject_code]['total'] += 1
-		if record.status == Attendance.Status.PRESENT:
-			attendance_by_subject[subject_code]['present'] += 1
-	
-	# Calculate percentage
-	for data in attendance_by_subject.values():
-		data['percentage'] = (data['present'] / data['total'] * 100) if data['total'] > 0 else 0
-	
+	stats, attendance_by_subject = cached_stats(
+		Profile.Roles.STUDENT,
+		student.pk,
+		lambda: _student_dependencies(student),
+		lambda: _student_stats(student),
+	)
+
 	# Get student's marks
 	marks = Marks.objects.filter(student=student).select_related('subject').order_by('-recorded_at')[:10]
+
+	# Class rank and percentile of each recent mark, from the cached subject statistics
+	statistics = {}
+	for mark in marks:
+		key = (mark.subject_id, mark.assessment_type, mark.term_id)
+		if key not in statistics:
+			statistics[key] = subject_statistics(*key)
+		mark.standing = statistics[key]['standings'].get(student.pk) if statistics[key] else None
+		mark.class_size = statistics[key]['count'] if statistics[key] else None
 	
-	# Get enrolled subjects (subjects with attendance or marks)
-	enrolled_subject_ids = set(attendance_records.values_list('subject_id', flat=True)) | set(marks.values_list('subject_id', flat=True))
-	enrolled_subjects = Subject.objects.filter(id__in=enrolled_subject_ids).select_related('faculty')
+	# SGPA and CGPA of the current term, recomputed here once a mark change has dropped them
+	term = Term.objects.current()
+	result = term_results([student.pk], term).get(student.pk) if term else None
+
+	# Subjects the student is enrolled in this term
+	enrolled_subjects = Subject.objects.filter(
+		id__in=Enrollment.objects.current().filter(student=student).values('subject')
+	).select_related('faculty')
 	
 	# Get assignments
 	assignments = Assignment.objects.filter(
@@ -78,30 +150,16 @@ def student_dashboard(request):
 	).select_related('subject', 'faculty').order_by('-due_date')[:10]
 	
 	# Get submissions
-	submissions = Submission.objects.filter(
+	submissions = Submission.objects.handed_in().filter(
 		student=student
 	).select_related('assignment__subject').order_by('-submitted_on')[:5]
 	
-	stats = {
-		'total_subjects': enrolled_subjects.count(),
-		'total_attendance': attendance_records.count(),
-		'present_count': attendance_records.filter(status=Attendance.Status.PRESENT).count(),
-		'assignments': Assignment.objects.filter(subject__in=enrolled_subjects).count(),
-		'submissions': submissions.count(),
-		'average_marks': marks.aggregate(Avg('score'))['score__avg'] or 0,
-	}
-	
-	# Calculate overall attendance percentage
-	if stats['total_attendance'] > 0:
-		stats['attendance_percentage'] = (stats['present_count'] / stats['total_attendance']) * 100
-	else:
-		stats['attendance_percentage'] = 0
-	
 	return render(request, 'dashboard/student_dashboard.html', {
 		'student': student,
 		'stats': stats,
 		'attendance_by_subject': attendance_by_subject,
 		'recent_marks': marks,
+		'result': result,
 		'enrolled_subjects': enrolled_subjects,
 		'assignments': assignments,
 		'submissions': submissions,
@@ -109,6 +167,55 @@ def student_dashboard(request):
 	})
 
 
+def _faculty_stats(faculty):
+	"""Headline figures and per-subject attendance of a faculty member's dashboard."""
+	subjects = list(faculty.subjects.all())
+
+	# Students enrolled this term in the faculty's subjects
+	enrollments = Enrollment.objects.current().filter(subject__in=subjects)
+
+	# Statistics
+	# Note: use assignment_ids (list) to avoid MySQL LIMIT-in-subquery error
+	assignment_ids = list(faculty.assignments.values_list('id', flat=True))
+	stats = {
+		'subjects_teaching': len(subjects),
+		'total_students': Student.objects.filter(pk__in=enrollments.values('student')).count(),
+		'attendance_records': Attendance.objects.filter(faculty=faculty).count(),
+		'assignments_created': len(assignment_ids),
+		'marks_entered': Marks.objects.filter(subject__in=subjects).count(),
+		'pending_submissions': Submission.objects.filter(
+			assignment_id__in=assignment_ids,
+			status=Submission.SubmissionStatus.SUBMITTED
+		).count(),
+	}
+	
+	# Attendance by subject, read from the per-subject rollups
+	subject_totals = {
+		row['subject_id']: row
+		for row in AttendanceRollup.objects.filter(subject__in=subjects)
+		.values('subject_id')
+		.annotate(present=Sum('present_count'), total=Sum('total_count'))
+		.order_by()
+	}
+	attendance_by_subject = {}
+	for subject in subjects:
+		totals = subject_totals.get(subject.pk)
+		if totals and totals['total'] > 0:
+			attendance_by_subject[subject.code] = {
+				'subject': subject,
+				'total': totals['total'],
+				'present': totals['present'],
+				'percentage': (totals['present'] / totals['total'] * 100)
+			}
+	return stats, attendance_by_subject
+
+
+def _faculty_dependencies(faculty):
+	"""The faculty member's own version key and those of the subjects they teach."""
+	subject_ids = faculty.subjects.values_list('pk', flat=True)
+	return [version_key('faculty', faculty.pk)] + [version_key('subject', pk) for pk in subject_ids]
+
+
 @login_required
 def faculty_dashboard(request):
 	"""Dashboard for faculty showing their teaching information."""
@@ -119,16 +226,19 @@ def faculty_dashboard(request):
 			'message': 'Faculty profile not found. Please contact administrator.'
 		})
 	
+	stats, attendance_by_subject = cached_stats(
+		Profile.Roles.FACULTY,
+		faculty.pk,
+		lambda: _faculty_dependencies(faculty),
+		lambda: _faculty_stats(faculty),
+	)
+
 	# Get subjects taught by this faculty
 	subjects = faculty.subjects.all()
 	
-	# Get students enrolled in faculty's subjects
-	students_enrolled = Student.objects.filter(
-		attendance_records__subject__in=subjects
-	).distinct()
-	
-	# Get attendance records taken by this faculty
-	attendance_records = Attendance.objects.filter(faculty=faculty).select_related('student', 'subject')
+	# Students enrolled this term in the faculty's subjects
+	enrollments = Enrollment.objects.current().filter(subject__in=subjects)
+	students_enrolled = Student.objects.filter(pk__in=enrollments.values('student')).select_related('user')
 	
 	# Get assignments created by this faculty
 	assignments = faculty.assignments.all().select_related('subject').order_by('-created_at')[:10]
@@ -136,38 +246,6 @@ def faculty_dashboard(request):
 	# Get recent marks entered
 	marks = Marks.objects.filter(subject__in=subjects).select_related('student', 'subject').order_by('-recorded_at')[:10]
 	
-	# Statistics
-	# Note: use assignment_ids (list) to avoid MySQL LIMIT-in-subquery error
-	assignment_ids = list(faculty.assignments.values_list('id', flat=True))
-	stats = {
-		'subjects_teaching': subjects.count(),
-		'total_students': students_enrolled.count(),
-		'attendance_records': attendance_records.count(),
-		'assignments_created': faculty.assignments.count(),
-		'marks_entered': Marks.objects.filter(subject__in=subjects).count(),
-		'pending_submissions': Submission.objects.filter(
-			assignment_id__in=assignment_ids,
-			status=Submission.SubmissionStatus.SUBMITTED
-		).count(),
-	}
-	
-	# Attendance by subject
-	attendance_by_subject = {}
-	for subject in subjects:
-		total = Attendance.objects.filter(subject=subject, faculty=faculty).count()
-		present = Attendance.objects.filter(
-			subject=subject,
-			faculty=faculty,
-			status=Attendance.Status.PRESENT
-		).count()
-		if total > 0:
-			attendance_by_subject[subject.code] = {
-				'subject': subject,
-				'total': total,
-				'present': present,
-				'percentage': (present / total * 100)
-			}
-	
 	# Get recent attendance records taken by this faculty
 	recent_attendance = Attendance.objects.filter(faculty=faculty).select_related('student', 'subject').order_by('-created_at')[:10]
 	
@@ -183,9 +261,8 @@ def faculty_dashboard(request):
 	})
 
 
-@login_required
-def admin_dashboard(request):
-	"""Dashboard for admin showing overall system statistics."""
+def _admin_stats():
+	"""Headline figures and subject statistics of the admin dashboard, the same for every admin."""
 	stats = {
 		"students": Student.objects.count(),
 		"faculty": Faculty.objects.count(),
@@ -196,24 +273,33 @@ def admin_dashboard(request):
 		"pending_users": Profile.objects.filter(is_approved=False).count(),
 	}
 	
-	# Get ALL students and faculty for real-time display
-	all_students = Student.objects.all().select_related('user').order_by('-created_at')
-	all_faculty = Faculty.objects.all().select_related('user').order_by('-created_at')
-	
-	# Recent activities (keep for backwards compatibility)
-	recent_students = Student.objects.all().select_related('user').order_by('-created_at')[:5]
-	recent_faculty = Faculty.objects.all().select_related('user').order_by('-created_at')[:5]
-	pending_users = Profile.objects.filter(is_approved=False).select_related('user').order_by('-created_at')[:10]
-	
-	# All users for real-time display
-	all_users = Profile.objects.all().select_related('user').order_by('-created_at')
-	
-	# Subject-wise statistics
+	# Subject-wise statistics, from this term's enrolments and the attendance rollups
+	attendance_totals = (
+		AttendanceRollup.objects.filter(subject=OuterRef('pk'))
+		.values('subject')
+		.annotate(total=Sum('total_count'))
+		.values('total')
+	)
 	subject_stats = Subject.objects.annotate(
-		student_count=Count('attendance_records__student', distinct=True),
-		attendance_count=Count('attendance_records')
+		student_count=_enrolled_count(),
+		attendance_count=Coalesce(Subquery(attendance_totals), 0),
 	).order_by('-student_count')[:10]
+	return stats, list(subject_stats)
+
 
+@login_required
+def admin_dashboard(request):
+	"""Dashboard for admin showing overall system statistics."""
+	stats, subject_stats = cached_stats(
+		Profile.Roles.ADMIN,
+		'all',
+		lambda: [version_key('admin')],
+		_admin_stats,
+	)
+
+	# The student, faculty and user tables are fetched page by page from admin_table.
+	pending_users = Profile.objects.filter(is_approved=False).select_related('user').order_by('-created_at')[:10]
+	
 	return render(
 		request,
 		"dashboard/admin_dashboard.html",
@@ -221,12 +307,39 @@ def admin_dashboard(request):
 			"role": Profile.Roles.ADMIN,
 			"user": request.user,
 			"stats": stats,
-			"recent_students": recent_students,
-			"recent_faculty": recent_faculty,
-			"all_students": all_students,
-			"all_faculty": all_faculty,
 			"pending_users": pending_users,
-			"all_users": all_users,
 			"subject_stats": subject_stats,
 		},
 	)
+
+
+@login_required
+@user_passes_test(is_admin)
+def admin_table(request, table):
+	"""One page of an admin dashboard table as JSON.
+
+	``q`` searches, ``sort`` picks one of the table's orderings and ``cursor``
+	is the ``next`` or ``previous`` value of the page before.
+	"""
+	definition = TABLES.get(table)
+	if definition is None:
+		raise Http404("No such table.")
+	sort = request.GET.get('sort') or 'joined'
+	if sort not in definition.orderings:
+		return JsonResponse({'errors': {'sort': [f"Sort by one of: {', '.join(definition.orderings)}."]}}, status=400)
+	try:
+		per_page = min(max(int(request.GET.get('per_page') or DEFAULT_PER_PAGE), 1), MAX_PER_PAGE)
+	except ValueError:
+		return JsonResponse({'errors': {'per_page': ['Enter a whole number.']}}, status=400)
+
+	queryset = search(definition, definition.queryset(), request.GET.get('q', ''))
+	paginator = KeysetPaginator(queryset, definition.orderings[sort], per_page=per_page)
+	try:
+		page = paginator.page(request.GET.get('cursor'))
+	except InvalidCursor:
+		return JsonResponse({'errors': {'cursor': ['Start again from the first page.']}}, status=400)
+	return JsonResponse({
+		'results': [definition.row(obj) for obj in page],
+		'next': page.next_cursor,
+		'previous': page.previous_cursor,
+	})
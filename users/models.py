@@ -17,6 +17,13 @@ class Profile(models.Model):
 	is_approved = models.BooleanField(default=False, help_text="Admin approval status")
 	created_at = models.DateTimeField(default=timezone.now)
 
+	class Meta:
+		indexes = [
+			# Newest-first paging of the admin dashboard's user table, overall and by role.
+			models.Index(fields=["created_at"], name="profile_created_idx"),
+			models.Index(fields=["role", "created_at"], name="profile_role_created_idx"),
+		]
+
 	def __str__(self) -> str:
 		return f"{self.user.username} ({self.role})"
 